@@ -1,9 +1,9 @@
 """Direct BoardGameGeek XML API client without external dependencies."""
 
 import os
-import time
 import xml.etree.ElementTree as ET
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import cached_property
 from typing import List, Optional
 from urllib.parse import quote
 
@@ -11,6 +11,18 @@ import requests
 from dotenv import load_dotenv
 from loguru import logger
 
+from my_board_games.resilience import get_deadline
+from my_board_games.response_cache import cached_get
+
+
+# data_dict keys of the link types parsed from thing items
+LINK_TYPES = {
+    "mechanics": "boardgamemechanic",
+    "categories": "boardgamecategory",
+    "designers": "boardgamedesigner",
+    "families": "boardgamefamily",
+}
+
 
 class BGGApiError(Exception):
     """Exception raised for BGG API errors."""
@@ -48,6 +60,106 @@ class GameData:
     rating_average: float
     expansions: List[GameExpansion]
     data_dict: dict  # Store the full data dictionary
+    alternate_names: List[str] = field(default_factory=list)
+
+    def data(self):
+        """Return the full data dictionary."""
+        return self.data_dict
+
+    @property
+    def versions(self):
+        """Return the versions, or None if they were not requested."""
+        return self.data_dict.get("versions")
+
+    @classmethod
+    def from_data(cls, data_dict, alternate_names=()):
+        """Rebuild a GameData object from its data dictionary.
+
+        Alternate names are not part of the data dictionary, so they are
+        passed separately.
+        """
+        return cls(
+            id=data_dict["id"],
+            name=data_dict["name"],
+            thumbnail=data_dict["thumbnail"],
+            min_players=data_dict["minplayers"],
+            max_players=data_dict["maxplayers"],
+            rating_average=data_dict["stats"].get("average", 0.0),
+            expansions=[GameExpansion(**exp) for exp in data_dict["expansions"]],
+            data_dict=data_dict,
+            alternate_names=list(alternate_names),
+        )
+
+
+class LazyGameData:
+    """GameData that keeps its XML item and parses fields on first access.
+
+    Ids, names and player counts are parsed up front. Stats, the player
+    count poll, expansions, links and versions are parsed when first used
+    and then memoized. ``data()`` returns the same dictionary as GameData.
+    """
+
+    def __init__(self, parser, item, include_versions=False):
+        """Initialize the game.
+
+        Args:
+            parser: BGGClient whose ``_parse_*`` methods parse the item
+            item: XML element for the game
+            include_versions: Whether version info was requested
+        """
+        self._parser = parser
+        self._item = item
+        self._include_versions = include_versions
+        summary = parser._parse_summary(item)
+        self.id = summary["id"]
+        self.name = summary["name"]
+        self.thumbnail = summary["thumbnail"]
+        self.min_players = summary["minplayers"]
+        self.max_players = summary["maxplayers"]
+        self.playingtime = summary["playingtime"]
+        self.alternate_names = summary["alternate_names"]
+
+    @cached_property
+    def rating_average(self):
+        return self._parser._parse_rating_average(self._item)
+
+    @cached_property
+    def expansions(self):
+        return self._parser._parse_expansions(self._item)
+
+    @cached_property
+    def stats(self):
+        return self._parser._parse_stats(self._item)
+
+    @cached_property
+    def suggested_players(self):
+        return self._parser._parse_suggested_players(self._item)
+
+    @cached_property
+    def links(self):
+        return self._parser._parse_links(self._item)
+
+    @cached_property
+    def versions(self):
+        return self._parser._parse_versions(self._item) if self._include_versions else None
+
+    @cached_property
+    def data_dict(self):
+        data_dict = {
+            "id": self.id,
+            "name": self.name,
+            "thumbnail": self.thumbnail,
+            "minplayers": self.min_players,
+            "maxplayers": self.max_players,
+            "stats": self.stats,
+            "expansions": [exp.data() for exp in self.expansions],
+            "suggested_players": self.suggested_players,
+            "playingtime": self.playingtime,
+            **self.links,
+        }
+        if self._include_versions:
+            data_dict["versions"] = self.versions
+        return data_dict
 
     def data(self):
         """Return the full data dictionary."""
@@ -67,17 +179,21 @@ class BGGClient:
 
     BASE_URL = "https://boardgamegeek.com/xmlapi2"
 
-    def __init__(self, timeout=15, retries=3, retry_delay=5):
+    def __init__(self, timeout=15, retries=3, retry_delay=5, store=None, parse_pool=None):
         """Initialize the BGG client.
 
         Args:
             timeout: Request timeout in seconds
             retries: Number of retries for failed requests
             retry_delay: Delay between retries in seconds
+            store: Store that fetched collections, games and listings are upserted into
+            parse_pool: ParsePool that parses large collection and thing responses
         """
         self.timeout = timeout
         self.retries = retries
         self.retry_delay = retry_delay
+        self.store = store
+        self.parse_pool = parse_pool
         self.session = requests.Session()
 
         # Load environment variables from .env file
@@ -156,38 +272,44 @@ class BGGClient:
 
         Raises:
             BGGApiError: If the request fails after all retries
+            BGGItemNotFoundError: If BGG answers with an error message
+            BGGUnavailableError: If the endpoint's circuit is open or the
+                run deadline is spent
+        """
+        return parse_xml(self._request_content(endpoint, params))
+
+    def _request_content(self, endpoint, params=None):
+        """Make a request to the BGG API with retries and return the raw body.
+
+        Raises:
+            BGGApiError: If the request fails after all retries
+            BGGUnavailableError: If the endpoint's circuit is open or the
+                run deadline is spent
         """
         url = f"{self.BASE_URL}/{endpoint}"
+        deadline = get_deadline()
 
         for attempt in range(self.retries):
             try:
-                response = self.session.get(url, params=params, timeout=self.timeout)
+                response = cached_get(
+                    endpoint, url, session=self.session, params=params, timeout=self.timeout
+                )
                 response.raise_for_status()
 
-                # Parse XML
-                root = ET.fromstring(response.content)
-
                 # Check for BGG API errors (202 status means data is being generated)
                 if response.status_code == 202:
                     logger.warning("BGG API returned 202, retrying...")
-                    time.sleep(self.retry_delay)
+                    deadline.sleep(self.retry_delay)
                     continue
 
-                # Check for error in XML
-                if root.tag == "error":
-                    error_msg = root.find("message")
-                    if error_msg is not None:
-                        raise BGGItemNotFoundError(error_msg.text)
-                    raise BGGItemNotFoundError("Item not found")
-
-                return root
+                return response.content
 
             except requests.exceptions.RequestException as e:
                 logger.warning(
                     f"BGG API request failed (attempt {attempt + 1}/{self.retries}): {e}"
                 )
                 if attempt < self.retries - 1:
-                    time.sleep(self.retry_delay)
+                    deadline.sleep(self.retry_delay)
                 else:
                     raise BGGApiError(
                         f"Failed to connect to BGG API after {self.retries} attempts"
@@ -195,13 +317,20 @@ class BGGClient:
 
         raise BGGApiError("Failed to get valid response from BGG API")
 
-    def game(self, game_id=None, name=None, versions=False):
+    def _parse(self, parse, content, *args):
+        """Run a module-level parse function, in the parse pool if there is one."""
+        if self.parse_pool is None:
+            return parse(content, *args)
+        return self.parse_pool.submit(parse, content, *args).result()
+
+    def game(self, game_id=None, name=None, versions=False, lazy=False):
         """Get game information by ID or name.
 
         Args:
             game_id: BGG game ID
             name: Game name (used if game_id is not provided)
             versions: Whether to include version information
+            lazy: Return a LazyGameData, see ``_parse_game_data``
 
         Returns:
             GameData object
@@ -230,7 +359,7 @@ class BGGClient:
         if item is None:
             raise BGGItemNotFoundError(f"Game with ID {game_id} not found")
 
-        return self._parse_game_data(item, include_versions=versions)
+        return self._parse_game_data(item, include_versions=versions, lazy=lazy)
 
     def _search_game_by_name(self, name):
         """Search for a game by name and return the best match ID.
@@ -244,37 +373,94 @@ class BGGClient:
         Raises:
             BGGItemNotFoundError: If no games are found
         """
-        params = {
-            "query": name,
-            "type": "boardgame",
-            "exact": 1,  # Try exact match first
-        }
+        # Try exact match first
+        results = self.search(name, exact=True) or self.search(name)
 
-        root = self._make_request("search", params)
-        items = root.findall("item")
-
-        if not items:
-            # Try non-exact match
-            params["exact"] = 0
-            root = self._make_request("search", params)
-            items = root.findall("item")
-
-        if not items:
+        if not results:
             raise BGGItemNotFoundError(f"No games found matching '{name}'")
 
         # Return the first result (best match)
-        return int(items[0].get("id"))
+        return results[0]["id"]
+
+    def search(self, query, exact=False):
+        """Search board games by name.
+
+        Args:
+            query: Name to search for
+            exact: Whether to only return exact name matches
+
+        Returns:
+            List of dicts with id, name and year, in BGG's order
+        """
+        params = {"query": query, "type": "boardgame"}
+        if exact:
+            params["exact"] = 1
+
+        root = self._make_request("search", params)
+        results = []
+        for item in root.findall("item"):
+            name_elem = item.find("name")
+            year_elem = item.find("yearpublished")
+            results.append(
+                {
+                    "id": int(item.get("id")),
+                    "name": name_elem.get("value") if name_elem is not None else None,
+                    "year": year_elem.get("value") if year_elem is not None else None,
+                }
+            )
+        return results
 
-    def _parse_game_data(self, item, include_versions=False):
+    @classmethod
+    def _parse_game_data(cls, item, include_versions=False, lazy=False):
         """Parse game data from XML item element.
 
         Args:
             item: XML element for the game
             include_versions: Whether version info was requested
+            lazy: Return a LazyGameData that parses most fields on first access
 
         Returns:
             GameData object
         """
+        if lazy:
+            return LazyGameData(cls, item, include_versions)
+
+        summary = cls._parse_summary(item)
+        expansions = cls._parse_expansions(item)
+
+        # Build full data dictionary
+        data_dict = {
+            "id": summary["id"],
+            "name": summary["name"],
+            "thumbnail": summary["thumbnail"],
+            "minplayers": summary["minplayers"],
+            "maxplayers": summary["maxplayers"],
+            "stats": cls._parse_stats(item),
+            "expansions": [exp.data() for exp in expansions],
+            "suggested_players": cls._parse_suggested_players(item),
+            "playingtime": summary["playingtime"],
+            **cls._parse_links(item),
+        }
+
+        # Add versions if requested
+        if include_versions:
+            data_dict["versions"] = cls._parse_versions(item)
+
+        return GameData(
+            id=summary["id"],
+            name=summary["name"],
+            thumbnail=summary["thumbnail"],
+            min_players=summary["minplayers"],
+            max_players=summary["maxplayers"],
+            rating_average=cls._parse_rating_average(item),
+            expansions=expansions,
+            data_dict=data_dict,
+            alternate_names=summary["alternate_names"],
+        )
+
+    @staticmethod
+    def _parse_summary(item):
+        """Parse the cheap top-level fields of a game item."""
         game_id = int(item.get("id"))
 
         # Get primary name
@@ -282,6 +468,9 @@ class BGGClient:
         if primary_name is None:
             primary_name = item.find("name")
         name = primary_name.get("value") if primary_name is not None else "Unknown"
+        alternate_names = [
+            elem.get("value") for elem in item.findall("name[@type='alternate']")
+        ]
 
         # Get thumbnail
         thumbnail_elem = item.find("thumbnail")
@@ -297,7 +486,25 @@ class BGGClient:
             int(max_players_elem.get("value", 1)) if max_players_elem is not None else 1
         )
 
-        # Suggested players
+        # Playingtime
+        playingtime_elem = item.find("playingtime")
+        playingtime = (
+            int(playingtime_elem.get("value", 0)) if playingtime_elem is not None else 0
+        )
+
+        return {
+            "id": game_id,
+            "name": name,
+            "thumbnail": thumbnail,
+            "minplayers": min_players,
+            "maxplayers": max_players,
+            "playingtime": playingtime,
+            "alternate_names": alternate_names,
+        }
+
+    @staticmethod
+    def _parse_suggested_players(item):
+        """Parse the suggested number of players poll."""
         suggested_players_elem = item.find(".//poll[@name='suggested_numplayers']")
         suggested_players = {"results": {}, "totalvotes": 0}
         if suggested_players_elem is not None:
@@ -329,20 +536,16 @@ class BGGClient:
                         elif rating_type == "Not Recommended":
                             ratings["not_recommended_rating"] = votes_int
                     suggested_players["results"][player_count] = ratings
+        return suggested_players
 
-        # Get rating
+    @staticmethod
+    def _parse_rating_average(item):
         rating_elem = item.find(".//average")
-        rating_average = (
-            float(rating_elem.get("value", 0)) if rating_elem is not None else 0.0
-        )
-
-        # Playingtime
-        playingtime_elem = item.find("playingtime")
-        playingtime = (
-            int(playingtime_elem.get("value", 0)) if playingtime_elem is not None else 0
-        )
+        return float(rating_elem.get("value", 0)) if rating_elem is not None else 0.0
 
-        # Get expansions
+    @staticmethod
+    def _parse_expansions(item):
+        """Parse this game's expansions, skipping inbound links."""
         expansions = []
         for link in item.findall("link[@type='boardgameexpansion']"):
             if (
@@ -352,36 +555,18 @@ class BGGClient:
                     id=int(link.get("id")), name=link.get("value")
                 )
                 expansions.append(expansion)
-
-        # Build full data dictionary
-        data_dict = {
-            "id": game_id,
-            "name": name,
-            "thumbnail": thumbnail,
-            "minplayers": min_players,
-            "maxplayers": max_players,
-            "stats": self._parse_stats(item),
-            "expansions": [exp.data() for exp in expansions],
-            "suggested_players": suggested_players,
-            "playingtime": playingtime,
+        return expansions
+
+    @staticmethod
+    def _parse_links(item):
+        """Parse the names of mechanics, categories, designers and families."""
+        return {
+            key: [link.get("value") for link in item.findall(f"link[@type='{link_type}']")]
+            for key, link_type in LINK_TYPES.items()
         }
 
-        # Add versions if requested
-        if include_versions:
-            data_dict["versions"] = self._parse_versions(item)
-
-        return GameData(
-            id=game_id,
-            name=name,
-            thumbnail=thumbnail,
-            min_players=min_players,
-            max_players=max_players,
-            rating_average=rating_average,
-            expansions=expansions,
-            data_dict=data_dict,
-        )
-
-    def _parse_stats(self, item):
+    @staticmethod
+    def _parse_stats(item):
         """Parse statistics from game item."""
         stats_elem = item.find(".//statistics/ratings")
         if stats_elem is None:
@@ -428,7 +613,8 @@ class BGGClient:
 
         return stats
 
-    def _parse_versions(self, item):
+    @staticmethod
+    def _parse_versions(item):
         """Parse version information from game item."""
         versions = []
         for version in item.findall(".//version"):
@@ -476,7 +662,7 @@ class BGGClient:
 
         Args:
             user_name: BGG username
-            **kwargs: Collection filters (own, wishlist, exclude_subtype, etc.)
+            **kwargs: Collection filters (own, wishlist, subtype, exclude_subtype, etc.)
 
         Returns:
             List of CollectionItem objects
@@ -493,6 +679,8 @@ class BGGClient:
             params["wishlist"] = 1
         if kwargs.get("preordered"):
             params["preordered"] = 1
+        if kwargs.get("subtype"):
+            params["subtype"] = kwargs["subtype"]
         if kwargs.get("exclude_subtype"):
             params["excludesubtype"] = kwargs["exclude_subtype"]
 
@@ -502,8 +690,12 @@ class BGGClient:
         # Add showprivate=1 to retrieve private info (inventory location, etc.)
         params["showprivate"] = 1
 
-        root = self._make_request("collection", params)
+        content = self._request_content("collection", params)
+        return self._parse(parse_collection, content, bool(kwargs.get("wishlist")))
 
+    @staticmethod
+    def _parse_collection(root, wishlist=False):
+        """Parse collection items from the XML root of a collection response."""
         # Parse collection items
         items = []
         for item_elem in root.findall("item"):
@@ -548,7 +740,7 @@ class BGGClient:
             # Parse wishlist priority
             status = item_elem.find("status")
             wishlist_priority = None
-            if status is not None and kwargs.get("wishlist"):
+            if status is not None and wishlist:
                 priority = status.get("wishlistpriority")
                 if priority:
                     try:
@@ -577,34 +769,44 @@ class BGGClient:
                 "wishlistpriority": wishlist_priority,
                 "numplays": numplays,
                 "invlocation": invlocation,
+                "subtype": item_elem.get("subtype"),
             }
 
             items.append(CollectionItem(id=item_id, _data=item_data))
-
         return items
 
-    def game_list(self, game_ids):
+    def game_list(self, game_ids, lazy=False, item_type="boardgame"):
         """Get information for multiple games.
 
         Args:
             game_ids: List of game IDs
+            lazy: Return LazyGameData objects, see ``_parse_game_data``
+            item_type: Thing type(s) to return, e.g. "boardgameexpansion"
 
         Returns:
             List of GameData objects
         """
-        # BGG API accepts comma-separated IDs
-        ids_str = ",".join(str(gid) for gid in game_ids)
+        content = self.game_list_content(game_ids, item_type)
+        if lazy:
+            # Lazy games keep their XML items, so they are parsed here
+            root = parse_xml(content)
+            games = [self._parse_game_data(item, lazy=True) for item in root.findall("item")]
+        else:
+            games = self._parse(parse_things, content)
 
-        params = {"id": ids_str, "stats": 1, "type": "boardgame"}
+        if self.store is not None:
+            self.store.upsert_games(games)
 
-        root = self._make_request("thing", params)
+        return games
 
-        # Parse all items
-        games = []
-        for item in root.findall("item"):
-            games.append(self._parse_game_data(item))
+    def game_list_content(self, game_ids, item_type="boardgame"):
+        """Get the raw thing response for multiple games, see ``parse_things``."""
+        # BGG API accepts comma-separated IDs
+        ids_str = ",".join(str(gid) for gid in game_ids)
 
-        return games
+        params = {"id": ids_str, "stats": 1, "type": item_type}
+
+        return self._request_content("thing", params)
 
     def get_user_id(self, user_name):
         """Get BGG user ID from username.
@@ -656,8 +858,12 @@ class BGGClient:
         }
 
         try:
-            response = self.session.get(
-                marketplace_url, params=params, timeout=self.timeout
+            response = cached_get(
+                "market",
+                marketplace_url,
+                session=self.session,
+                params=params,
+                timeout=self.timeout,
             )
             response.raise_for_status()
             data = response.json()
@@ -681,9 +887,37 @@ class BGGClient:
                         listings.append(listing_data)
 
             logger.info(f"Found {len(listings)} marketplace listings")
+            if self.store is not None:
+                self.store.replace_listings(user_name, listings)
             return listings
 
         except requests.exceptions.RequestException as e:
             raise BGGApiError(f"Failed to fetch marketplace listings: {e}") from e
         except (KeyError, ValueError) as e:
             raise BGGApiError(f"Failed to parse marketplace data: {e}") from e
+
+
+def parse_xml(content):
+    """Parse a BGG XML response, raising BGGItemNotFoundError for error responses."""
+    root = ET.fromstring(content)
+    if root.tag == "error":
+        error_msg = root.find("message")
+        if error_msg is not None:
+            raise BGGItemNotFoundError(error_msg.text)
+        raise BGGItemNotFoundError("Item not found")
+    return root
+
+
+# Module level parse functions take and return plain picklable data, so that
+# they can run in the worker processes of a ParsePool
+
+
+def parse_things(content):
+    """Parse a thing response into GameData objects."""
+    root = parse_xml(content)
+    return [BGGClient._parse_game_data(item) for item in root.findall("item")]
+
+
+def parse_collection(content, wishlist=False):
+    """Parse a collection response into CollectionItem objects."""
+    return BGGClient._parse_collection(parse_xml(content), wishlist)
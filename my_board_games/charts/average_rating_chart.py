@@ -1,8 +1,15 @@
 import altair as alt
 
+from my_board_games.charts.chart_data import get_chart_data
+
 
 def make_average_rating_chart(suggested_players):
     suggested_players_limited = suggested_players[suggested_players.players <= 8]
+    suggested_players_limited = get_chart_data(
+        suggested_players_limited,
+        ["name", "playingtime", "average_rating", "url", "cool_name"],
+        stack_by="playingtime",
+    )
 
     # https://github.com/altair-viz/altair/issues/963
     selection = alt.selection_single(
@@ -13,14 +20,12 @@ def make_average_rating_chart(suggested_players):
         .mark_bar()
         .encode(
             x=alt.X("players:O", axis=alt.Axis(orient="top", labelAngle=0)),
-            y=alt.Y(
-                "count(id)", stack="zero", scale=alt.Scale(reverse=True), axis=None
-            ),
-            order=alt.Order("playingtime", sort="descending"),
+            y=alt.Y("y0:Q", scale=alt.Scale(reverse=True), axis=None),
+            y2="y1:Q",
             color=alt.condition(
                 selection, "average_rating:Q", alt.value("lightgray"), legend=None
             ),
-            tooltip=["name", "playingtime", "average_rating", "description"],
+            tooltip=["name", "playingtime", "average_rating"],
             href="url",
         )
     )
@@ -29,10 +34,7 @@ def make_average_rating_chart(suggested_players):
         .mark_text(align="center", baseline="middle", dy=-10)
         .encode(
             x=alt.X("players:O", axis=alt.Axis(orient="top", labelAngle=0)),
-            y=alt.Y(
-                "count(id)", stack="zero", scale=alt.Scale(reverse=True), axis=None
-            ),
-            order=alt.Order("playingtime", sort="descending"),
+            y=alt.Y("y1:Q", scale=alt.Scale(reverse=True), axis=None),
             color=alt.condition(
                 alt.datum.average_rating > 7.5, alt.value("white"), alt.value("black")
             ),
@@ -0,0 +1,28 @@
+from my_board_games.get_suggested_players import get_cool_names
+
+
+def get_chart_data(suggested_players, columns, stack_by):
+    """Prune a chart's rows to the columns it encodes and stack its bars.
+
+    Each bar segment is one game, so the browser only has to draw the
+    segments at the precomputed ``y0``/``y1`` offsets instead of counting ids.
+
+    Args:
+        suggested_players: Rows already filtered for the chart
+        columns: Columns the chart encodes
+        stack_by: Column the segments of a player count bar are stacked by,
+            largest value first
+
+    Returns:
+        DataFrame with the given columns plus ``y0`` and ``y1``
+    """
+    chart_data = suggested_players.copy()
+    if "cool_name" not in chart_data.columns:
+        chart_data["cool_name"] = get_cool_names(chart_data)
+    chart_data = chart_data[list(dict.fromkeys(["players", *columns, stack_by]))]
+    chart_data = chart_data.sort_values(
+        ["players", stack_by], ascending=[True, False], kind="mergesort"
+    )
+    chart_data["y0"] = chart_data.groupby("players").cumcount()
+    chart_data["y1"] = chart_data["y0"] + 1
+    return chart_data.reset_index(drop=True)
@@ -1,6 +1,7 @@
 import altair as alt
 import pandas as pd
 
+from my_board_games.charts.chart_data import get_chart_data
 from my_board_games.settings import conf
 
 
@@ -33,8 +34,18 @@ def make_time_since_last_played_chart(suggested_players):
         "days_since_last_played"
     ].fillna(9000)
     labels = time_since_labels + ["Never"]
-    suggested_players_limited.sort_values(
-        by=["time_since_last_played", "playingtime"], inplace=True
+    suggested_players_limited = get_chart_data(
+        suggested_players_limited,
+        [
+            "name",
+            "time_since_last_played",
+            "days_since_last_played",
+            "last_played",
+            "playingtime",
+            "url",
+            "cool_name",
+        ],
+        stack_by="days_since_last_played",
     )
 
     # https://github.com/altair-viz/altair/issues/963
@@ -46,10 +57,8 @@ def make_time_since_last_played_chart(suggested_players):
         .mark_bar()
         .encode(
             x=alt.X("players:O", axis=alt.Axis(orient="top", labelAngle=0)),
-            y=alt.Y(
-                "count(id)", stack="zero", scale=alt.Scale(reverse=True), axis=None
-            ),
-            order=alt.Order("days_since_last_played:Q", sort="descending"),
+            y=alt.Y("y0:Q", scale=alt.Scale(reverse=True), axis=None),
+            y2="y1:Q",
             #  color="days_since_last_played:Q",
             color=alt.condition(
                 selection,
@@ -72,10 +81,7 @@ def make_time_since_last_played_chart(suggested_players):
         .mark_text(align="center", baseline="middle", dy=-10)
         .encode(
             x=alt.X("players:O", axis=alt.Axis(orient="top", labelAngle=0)),
-            y=alt.Y(
-                "count(id)", stack="zero", scale=alt.Scale(reverse=True), axis=None
-            ),
-            order=alt.Order("days_since_last_played:Q", sort="descending"),
+            y=alt.Y("y1:Q", scale=alt.Scale(reverse=True), axis=None),
             color=alt.condition(
                 alt.datum.time_since_last_played == labels[-1],
                 alt.value("white"),
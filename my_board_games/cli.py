@@ -0,0 +1,231 @@
+"""Command line entry point.
+
+Heavy dependencies (pandas, altair, ...) are imported inside the commands
+that need them, so light commands such as ``metrics`` start quickly.
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+
+def fetch(args):
+    from contextlib import nullcontext
+
+    from my_board_games.bgg_api import BGGClient
+    from my_board_games.parse_pool import ParsePool
+    from my_board_games.pipeline import (
+        run_pipeline_with_fallback,
+        run_stale_while_revalidate,
+        run_users,
+        write_freshness,
+    )
+    from my_board_games.prefetch import Prefetcher
+    from my_board_games.resilience import set_deadline, set_rate_limit
+    from my_board_games.response_cache import response_mode
+    from my_board_games.settings import conf
+    from my_board_games.store import get_store
+
+    set_deadline(conf["deadline"])
+    set_rate_limit(conf["request_interval"])
+    prefetcher = Prefetcher() if conf["prefetch"] else nullcontext()
+    with ParsePool(conf["parse_workers"]) as parse_pool, prefetcher:
+        if conf["users"]:
+            run_users(conf["users"], parse_pool=parse_pool)
+            return
+        bgg = BGGClient(store=get_store(), parse_pool=parse_pool)
+        if getattr(args, "swr", False):
+            run_stale_while_revalidate(bgg, output_dir=args.output_dir).join()
+            return
+        with response_mode("store") as freshness:
+            run_pipeline_with_fallback(bgg, output_dir=args.output_dir)
+    write_freshness(freshness, args.output_dir)
+
+
+def build(args):
+    import pandas as pd
+
+    from my_board_games.get_suggested_players import get_site_payload
+    from my_board_games.outputs import write_if_changed
+
+    suggested_players = pd.read_json(Path(args.output_dir) / "suggested_players.json")
+    write_if_changed(
+        Path(args.output_dir) / "site_payload.json",
+        json.dumps(get_site_payload(suggested_players)),
+    )
+
+
+def metrics(args):
+    from my_board_games.get_metrics import get_metrics
+
+    print(json.dumps(get_metrics(args.output_dir), indent=2))
+
+
+def charts(args):
+    import pandas as pd
+
+    from my_board_games.make_charts import make_charts
+
+    suggested_players = pd.read_json(Path(args.output_dir) / "suggested_players.json")
+    make_charts(suggested_players, static=args.static)
+
+
+def sizes(args):
+    from my_board_games.bgg_api import BGGClient
+    from my_board_games.get_games import get_my_games
+    from my_board_games.get_sizes import get_shelf_volume, get_sizes
+    from my_board_games.resilience import set_rate_limit
+    from my_board_games.settings import conf
+
+    set_rate_limit(conf["request_interval"])
+    game_ids = get_my_games(BGGClient()).id.to_list()
+    sizes = get_sizes(game_ids)
+    (Path(args.output_dir) / "sizes.json").write_text(sizes.to_json(orient="records"))
+    print(json.dumps(get_shelf_volume(sizes), indent=2))
+
+
+def expansions(args):
+    from my_board_games.bgg_api import BGGClient
+    from my_board_games.expansions import get_expansion_graph
+    from my_board_games.game_cache import GameMetadataCache
+    from my_board_games.get_games import get_games, get_my_games
+    from my_board_games.resilience import set_rate_limit
+    from my_board_games.settings import conf
+
+    set_rate_limit(conf["request_interval"])
+    bgg = BGGClient()
+    games = get_games(get_my_games(bgg).id.to_list(), bgg, GameMetadataCache())
+    graph = get_expansion_graph(games, bgg)
+    (Path(args.output_dir) / "expansions.json").write_text(json.dumps(graph.to_dict()))
+    names = dict(zip(games["id"], games["name"]))
+    for game_id, expansion_ids in graph.owned_per_base().items():
+        print(f"{names[game_id]}: {len(expansion_ids)} owned expansions")
+    for change in graph.best_player_count_changes():
+        print(
+            f"{change['expansion_name']} moves {change['name']}'s best player count "
+            f"from {change['best_player_count']} to {change['expansion_best_player_count']}"
+        )
+
+
+def history(args):
+    from my_board_games.history import History
+
+    history = History(Path(args.output_dir) / "history.npz")
+    values = history.series(args.game_id, args.field, daily=args.daily)
+    print(values.to_json(date_format="iso", indent=2))
+
+
+def recommend(args):
+    from my_board_games.recommend import Recommender
+
+    recommender = Recommender.from_json(Path(args.output_dir) / "suggested_players.json")
+    games = recommender.recommend(
+        args.players, max_time=args.max_time, weight=args.weight, k=args.k
+    )
+    for game in games:
+        print(f"{game['score']:.3f}  {game['name']} ({game['playingtime']} min)")
+
+
+def plan(args):
+    from my_board_games.planner import Planner
+
+    planner = Planner.from_json(Path(args.output_dir) / "suggested_players.json")
+    game_night = planner.plan(args.players, budget=args.budget, max_per_weight=args.max_per_weight)
+    for game in game_night["games"]:
+        print(f"{game['playingtime']:>4} min  {game['name']}")
+    print(f"{game_night['total_time']:>4} min  score {game_night['total_score']:.3f}")
+
+
+def similar(args):
+    similar_games = json.loads((Path(args.output_dir) / "similar_games.json").read_text())
+    for game_id, name, score in similar_games.get(str(args.game_id), [])[: args.k]:
+        print(f"{score:.3f}  {name} ({game_id})")
+
+
+def watch(args):
+    from my_board_games.resilience import set_rate_limit
+    from my_board_games.settings import conf
+    from my_board_games.watch import Watcher
+
+    set_rate_limit(conf["request_interval"])
+    Watcher(output_dir=args.output_dir, interval=args.interval).run()
+
+
+def serve(args):
+    from loguru import logger
+
+    from my_board_games.query_api import SuggestedPlayersIndex, make_server
+    from my_board_games.recommend import Recommender
+
+    index = SuggestedPlayersIndex.from_json(Path(args.output_dir) / "suggested_players.json")
+    server = make_server(index, port=args.port, recommender=Recommender(index))
+    host, port = server.server_address
+    logger.info(f"Serving suggested players on http://{host}:{port}/games")
+    server.serve_forever()
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(prog="my_board_games")
+    parser.add_argument("--output-dir", default="data", help="Directory of the JSON outputs")
+    subparsers = parser.add_subparsers(dest="command")
+
+    fetch_parser = subparsers.add_parser("fetch", help="Fetch from BGG and refresh the JSON outputs")
+    fetch_parser.add_argument(
+        "--swr",
+        action="store_true",
+        help="Publish from cached responses first, then revalidate",
+    )
+    subparsers.add_parser("build", help="Rebuild the site payload from suggested_players.json")
+    subparsers.add_parser("metrics", help="Recompute metrics.json from suggested_players.json")
+    charts_parser = subparsers.add_parser("charts", help="Render the charts")
+    charts_parser.add_argument("--static", action="store_true", help="Also render SVG and PNG")
+    subparsers.add_parser("sizes", help="Fetch box sizes and shelf volume")
+    subparsers.add_parser("expansions", help="Fetch owned expansions per base game")
+    history_parser = subparsers.add_parser("history", help="Show a field of a game over time")
+    history_parser.add_argument("game_id", type=int)
+    history_parser.add_argument("--field", default="average_rating", help="Tracked field")
+    history_parser.add_argument("--daily", action="store_true", help="One value per day")
+    recommend_parser = subparsers.add_parser("recommend", help="Suggest what to play tonight")
+    recommend_parser.add_argument("players", type=int, help="Number of players")
+    recommend_parser.add_argument("--max-time", type=int, help="Time budget in minutes")
+    recommend_parser.add_argument("--weight", type=float, help="Preferred weight, 1 to 5")
+    recommend_parser.add_argument("-k", type=int, default=5, help="Number of games")
+    plan_parser = subparsers.add_parser("plan", help="Plan a game night within a time budget")
+    plan_parser.add_argument("players", type=int, help="Number of players")
+    plan_parser.add_argument("--budget", type=int, default=240, help="Minutes available")
+    plan_parser.add_argument(
+        "--max-per-weight", type=int, default=2, help="Maximum games per weight bucket"
+    )
+    similar_parser = subparsers.add_parser("similar", help="Show games similar to a game")
+    similar_parser.add_argument("game_id", type=int)
+    similar_parser.add_argument("-k", type=int, default=10, help="Number of games")
+    watch_parser = subparsers.add_parser("watch", help="Keep the JSON outputs up to date")
+    watch_parser.add_argument("--interval", type=int, default=300, help="Seconds between polls")
+    serve_parser = subparsers.add_parser("serve", help="Serve the query API")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    return parser
+
+
+COMMANDS = {
+    "fetch": fetch,
+    "build": build,
+    "metrics": metrics,
+    "charts": charts,
+    "sizes": sizes,
+    "expansions": expansions,
+    "history": history,
+    "recommend": recommend,
+    "plan": plan,
+    "similar": similar,
+    "watch": watch,
+    "serve": serve,
+}
+
+
+def main(argv=None):
+    args = get_parser().parse_args(argv)
+    COMMANDS[args.command or "fetch"](args)
+
+
+if __name__ == "__main__":
+    main()
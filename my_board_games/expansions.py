@@ -0,0 +1,159 @@
+"""Graph of base games and their expansions, owned or not."""
+
+from loguru import logger
+
+from my_board_games.game_cache import GameMetadataCache
+from my_board_games.get_games import get_collection
+from my_board_games.get_suggested_players import get_best_player_count
+from my_board_games.resilience import retry
+from my_board_games.settings import conf
+
+EXPANSIONS_CACHE_PATH = "data/cache/expansions.json"
+EXPANSIONS_MAX_AGE = 7 * 24 * 60 * 60  # expansion polls and names change rarely
+EXPANSION_TYPE = "boardgameexpansion"
+
+
+def get_owned_expansion_ids(bgg, user_name=None):
+    items = get_collection(
+        bgg, user_name=user_name or conf["user_name"], own=True, subtype=EXPANSION_TYPE
+    )
+    return {item.id for item in items}
+
+
+@retry(tries=10, delay=3, backoff=2)
+def get_expansions_batch(batch, bgg):
+    return bgg.game_list(batch, item_type=EXPANSION_TYPE)
+
+
+def fetch_expansions(expansion_ids, bgg, cache, batch_size=20):
+    """Fetch the metadata of expansions missing from the cache, 20 per call.
+
+    Returns:
+        Dict of expansion id to GameData, for the ids BGG knows
+    """
+    missing_ids = cache.missing(expansion_ids)
+    logger.info(f"Fetching {len(missing_ids)} expansions missing from the cache")
+    for i in range(0, len(missing_ids), batch_size):
+        cache.add(get_expansions_batch(missing_ids[i : i + batch_size], bgg))
+    cache.save()
+    return {game.id: game for game in cache.get(expansion_ids)}
+
+
+def has_votes(suggested_players):
+    return bool(suggested_players["results"]) and suggested_players["totalvotes"] > 0
+
+
+class ExpansionGraph:
+    """Adjacency index from base games to their expansions."""
+
+    def __init__(self, games, expansions, owned_ids):
+        """Build the index.
+
+        Args:
+            games: DataFrame of base games with id, name, expansions and
+                suggested_players columns, like ``get_games``
+            expansions: Dict of expansion id to GameData
+            owned_ids: Ids of the owned expansions
+        """
+        self.games = games.set_index("id")
+        self.expansions = expansions
+        self.owned_ids = set(owned_ids)
+        self.expansions_of = {
+            int(game_id): [exp["id"] for exp in game_expansions]
+            for game_id, game_expansions in self.games["expansions"].items()
+        }
+        self.bases_of = {}
+        for game_id, expansion_ids in self.expansions_of.items():
+            for expansion_id in expansion_ids:
+                self.bases_of.setdefault(expansion_id, []).append(game_id)
+
+    def expansion_ids(self):
+        """Return every expansion id linked from a base game, or owned."""
+        linked = [eid for eids in self.expansions_of.values() for eid in eids]
+        return list(dict.fromkeys(linked + sorted(self.owned_ids)))
+
+    def owned(self, game_id):
+        return [eid for eid in self.expansions_of.get(game_id, []) if eid in self.owned_ids]
+
+    def not_owned(self, game_id):
+        return [eid for eid in self.expansions_of.get(game_id, []) if eid not in self.owned_ids]
+
+    def owned_per_base(self):
+        """Return the owned expansion ids per base game that has any."""
+        owned = {game_id: self.owned(game_id) for game_id in self.expansions_of}
+        return {game_id: eids for game_id, eids in owned.items() if eids}
+
+    def unlinked_owned(self):
+        """Return owned expansion ids that no owned base game links to."""
+        return sorted(self.owned_ids - set(self.bases_of))
+
+    def best_player_count_changes(self, owned_only=True):
+        """Return expansions whose poll favours another player count than their base game.
+
+        Returns:
+            List of dicts with base and expansion ids and names and both best counts
+        """
+        changes = []
+        for game_id, expansion_ids in self.expansions_of.items():
+            base = self.games.loc[game_id]
+            if not has_votes(base["suggested_players"]):
+                continue
+            base_best = get_best_player_count(base)
+            for expansion_id in expansion_ids:
+                if owned_only and expansion_id not in self.owned_ids:
+                    continue
+                expansion = self.expansions.get(expansion_id)
+                if expansion is None or not has_votes(expansion.data()["suggested_players"]):
+                    continue
+                expansion_best = get_best_player_count(expansion.data())
+                if expansion_best != base_best:
+                    changes.append(
+                        {
+                            "id": game_id,
+                            "name": base["name"],
+                            "expansion_id": expansion_id,
+                            "expansion_name": expansion.name,
+                            "best_player_count": base_best,
+                            "expansion_best_player_count": expansion_best,
+                        }
+                    )
+        return changes
+
+    def to_dict(self):
+        """Return the graph for data/expansions.json."""
+        return {
+            "owned": {str(game_id): eids for game_id, eids in self.owned_per_base().items()},
+            "not_owned": {
+                str(game_id): self.not_owned(game_id)
+                for game_id in self.expansions_of
+                if self.not_owned(game_id)
+            },
+            "unlinked_owned": self.unlinked_owned(),
+            "best_player_count_changes": self.best_player_count_changes(),
+        }
+
+
+def get_expansions_cache():
+    """Return the persisted cache of expansion metadata."""
+    return GameMetadataCache(path=EXPANSIONS_CACHE_PATH, max_age=EXPANSIONS_MAX_AGE)
+
+
+def get_expansion_graph(games, bgg, user_name=None, cache=None):
+    """Build the expansion graph of a collection with batched metadata fetches.
+
+    Args:
+        games: DataFrame of base games, like ``get_games``
+        bgg: BGGClient used for the collection and thing calls
+        user_name: BGG username, defaults to the configured user
+        cache: GameMetadataCache for expansion metadata, see
+            ``get_expansions_cache``. Share one between concurrent calls.
+
+    Returns:
+        ExpansionGraph
+    """
+    if cache is None:
+        cache = get_expansions_cache()
+    owned_ids = get_owned_expansion_ids(bgg, user_name)
+    graph = ExpansionGraph(games, {}, owned_ids)
+    graph.expansions = fetch_expansions(graph.expansion_ids(), bgg, cache)
+    return graph
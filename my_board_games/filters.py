@@ -0,0 +1,77 @@
+"""Collection exclusions, evaluated before any per-game request."""
+
+from loguru import logger
+
+from my_board_games.settings import conf
+
+EXCLUDED_SUBTYPES = ("boardgameexpansion",)
+
+
+class CollectionFilter:
+    """Exclusions applied to collection items as soon as they are parsed.
+
+    Every excluded game is dropped before its ``thing``, versions or
+    thumbnail requests, so later stages only see the games that are kept.
+    """
+
+    def __init__(
+        self,
+        exclude_ids=(),
+        excluded_names=(),
+        excluded_subtypes=EXCLUDED_SUBTYPES,
+        exclude_inventoried=True,
+    ):
+        """Initialize the filter.
+
+        Args:
+            exclude_ids: Game ids never shown, like ``conf["exclude_list"]``
+            excluded_names: Names of games played as another game, like the
+                keys of ``conf["mapping"]``
+            excluded_subtypes: BGG subtypes to drop, also sent to BGG as
+                ``excludesubtype`` so they are not downloaded
+            exclude_inventoried: Drop games with an inventory location set,
+                which are not available to play
+        """
+        self.exclude_ids = set(exclude_ids)
+        self.excluded_names = set(excluded_names)
+        self.excluded_subtypes = tuple(excluded_subtypes)
+        self.exclude_inventoried = exclude_inventoried
+
+    @classmethod
+    def from_conf(cls):
+        return cls(exclude_ids=conf["exclude_list"], excluded_names=conf["mapping"].keys())
+
+    @property
+    def collection_params(self):
+        """Keyword arguments for ``BGGClient.collection``, filtering on BGG's side."""
+        if not self.excluded_subtypes:
+            return {}
+        return {"exclude_subtype": ",".join(self.excluded_subtypes)}
+
+    def reason(self, item):
+        """Return why a collection item is excluded, or None to keep it."""
+        data = item._data
+        if item.id in self.exclude_ids:
+            return "excluded id"
+        if data.get("name") in self.excluded_names:
+            return "mapped name"
+        if data.get("subtype") in self.excluded_subtypes:
+            return "subtype"
+        # invlocation comes from BGG's privateinfo when authenticated
+        if self.exclude_inventoried and data.get("invlocation"):
+            return "inventory location"
+        return None
+
+    def apply(self, items):
+        """Return the collection items that are kept, logging the excluded counts."""
+        kept = []
+        excluded = {}
+        for item in items:
+            reason = self.reason(item)
+            if reason is None:
+                kept.append(item)
+            else:
+                excluded[reason] = excluded.get(reason, 0) + 1
+        for reason, count in excluded.items():
+            logger.info(f"Excluded {count} games by {reason} before fetching metadata")
+        return kept
@@ -0,0 +1,87 @@
+"""Shared cache of BGG game metadata, deduplicating thing lookups."""
+
+import json
+import threading
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from my_board_games.bgg_api import GameData
+from my_board_games.outputs import write_atomic
+
+GAMES_CACHE_PATH = "data/cache/games.json"
+
+
+class GameMetadataCache:
+    """Thread-safe cache of GameData keyed by game id.
+
+    Entries older than ``max_age`` seconds are treated as missing, so ratings
+    and ranks are still refreshed regularly.
+    """
+
+    def __init__(self, path=GAMES_CACHE_PATH, max_age=24 * 60 * 60):
+        """Initialize the cache.
+
+        Args:
+            path: JSON file the cache is persisted to, or None to keep it in memory
+            max_age: Seconds after which a cached game is fetched again
+        """
+        self.path = Path(path) if path else None
+        self.max_age = max_age
+        self._games = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if self.path is None or not self.path.exists():
+            return
+        entries = json.loads(self.path.read_text())
+        self._games = {
+            int(game_id): (
+                entry["fetched_at"],
+                # Caches written before alternate names were kept have none
+                GameData.from_data(entry["data"], entry.get("alternate_names", [])),
+            )
+            for game_id, entry in entries.items()
+        }
+        logger.info(f"Loaded {len(self._games)} games from {self.path}")
+
+    def save(self):
+        """Persist the cache to disk, safe to call from several threads."""
+        if self.path is None:
+            return
+        with self._lock:
+            entries = {
+                game_id: {
+                    "fetched_at": fetched_at,
+                    "data": game.data(),
+                    "alternate_names": game.alternate_names,
+                }
+                for game_id, (fetched_at, game) in self._games.items()
+            }
+            write_atomic(self.path, json.dumps(entries))
+
+    def missing(self, game_ids):
+        """Return the ids, deduplicated and in order, that need fetching."""
+        now = time.time()
+        with self._lock:
+            missing = [
+                game_id
+                for game_id in dict.fromkeys(game_ids)
+                if game_id not in self._games
+                or now - self._games[game_id][0] > self.max_age
+            ]
+        return missing
+
+    def add(self, games):
+        """Store freshly fetched GameData objects."""
+        now = time.time()
+        with self._lock:
+            for game in games:
+                self._games[game.id] = (now, game)
+
+    def get(self, game_ids):
+        """Return cached GameData objects for the ids that are present."""
+        with self._lock:
+            return [self._games[gid][1] for gid in game_ids if gid in self._games]
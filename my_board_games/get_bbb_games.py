@@ -3,14 +3,15 @@ from functools import lru_cache
 import numpy as np
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
 from requests.utils import quote
-from tqdm import tqdm
 
-tqdm.pandas()
+from my_board_games.name_resolver import NameResolver
+from my_board_games.title_index import TitleIndex
 
 
 def get_bbb_games(bgg):
+    from bs4 import BeautifulSoup
+
     url = "http://bohemiaboardsandbrews.com/games"
     res = requests.get(url)
     res_html = res.text
@@ -18,8 +19,10 @@ def get_bbb_games(bgg):
     bs = BeautifulSoup(res_html, "lxml")
     games_raw = bs.find_all("div", class_="game_rollover")
     games = clean_games(games_raw)
-    games["id"] = games.game.progress_apply(lambda x: get_bgg_id(x, bgg))
-    bbb_games = games[games.id.apply(lambda x: type(x) == str)]
+    resolver = NameResolver(bgg, title_index=TitleIndex())
+    bgg_ids = resolver.resolve_many(games.game)
+    games["id"] = games.game.map(bgg_ids)
+    bbb_games = games[games.id.notna()]
     return bbb_games
 
 
@@ -37,15 +40,6 @@ def clean_games(games_raw):
     return games
 
 
-@lru_cache(1000)
-def get_bgg_id(game, bgg):
-    try:
-        bgg_id = bgg.game(game).id
-    except Exception:
-        bgg_id = None
-    return bgg_id
-
-
 @lru_cache(1000)
 def get_bgg_id2(query):
     try:
@@ -59,6 +53,9 @@ def get_bgg_id2(query):
 
 
 def adhoc():
+    from tqdm import tqdm
+
+    tqdm.pandas()
     bbb_backup = bbb_games.copy()
     bbb_backup_ids = bbb_backup[["id", "name"]]
     bbb_backup_ids.columns = ["id2", "game"]
@@ -0,0 +1,120 @@
+import pandas as pd
+from loguru import logger
+
+from my_board_games.bgg_api import BGGClient, parse_things
+from my_board_games.filters import CollectionFilter
+from my_board_games.resilience import retry
+from my_board_games.settings import conf
+
+
+def get_my_games(bgg, user_name=None, collection_filter=None) -> pd.DataFrame:
+    user_name = user_name or conf["user_name"]
+    # Exclusions are applied to the collection, before any per-game request
+    collection_filter = collection_filter or CollectionFilter.from_conf()
+    games_batch = get_collection(
+        bgg, user_name=user_name, own=True, **collection_filter.collection_params
+    )
+    games_batch = collection_filter.apply(games_batch)
+    # The store holds the games that are shown, not excluded or lent out ones
+    if bgg.store is not None:
+        bgg.store.replace_collection(user_name, games_batch)
+    games_info = {game.id: game._data for game in games_batch if "id" in dir(game)}
+    my_games = pd.DataFrame(games_info).T
+    #  my_games = my_games[my_games.own == "1"]
+    return my_games
+
+
+def add_numplays(games, my_games):
+    games = games.merge(
+        my_games[["id", "numplays"]], on="id", how="left", validate="one_to_one"
+    )
+    return games
+
+
+@retry(tries=10, delay=3, backoff=2)
+def get_collection(bgg: BGGClient, **kwargs):
+    collection = bgg.collection(**kwargs)
+    return collection
+
+
+def get_games(game_ids, bgg, games_cache=None, title_index=None):
+    if games_cache is None:
+        games_batches = get_games_in_batches(game_ids, bgg)
+    else:
+        fetch_missing_games(game_ids, bgg, games_cache)
+        games_batches = games_cache.get(game_ids)
+        if bgg.store is not None:
+            bgg.store.upsert_games(games_batches)
+    if title_index is not None:
+        title_index.add_games(games_batches)
+    games_info = {game.id: game.data() for game in games_batches if "id" in dir(game)}
+    games = pd.DataFrame(games_info).T
+    games["url"] = "https://boardgamegeek.com/boardgame/" + games["id"].astype("str")
+    games["average_rating"] = games["stats"].apply(lambda x: x["average"])
+    games["short_name"] = games["name"].apply(shorten_name)
+    games = filter_quasi_expansions(games)
+    return games
+
+
+def get_games_in_batches(game_ids, bgg, batch_size=20):
+    if bgg.parse_pool is not None:
+        return get_games_in_batches_pooled(game_ids, bgg, batch_size)
+    games_batches = []
+    for i in range(0, len(game_ids), batch_size):
+        batch = game_ids[i : i + batch_size]
+        games_batch = get_games_batch(batch, bgg)
+        games_batches.extend(games_batch)
+    return games_batches
+
+
+def get_games_in_batches_pooled(game_ids, bgg, batch_size=20):
+    # The next batch is fetched while workers parse the previous ones
+    futures = []
+    for i in range(0, len(game_ids), batch_size):
+        batch = game_ids[i : i + batch_size]
+        content = get_games_batch_content(batch, bgg)
+        futures.append(bgg.parse_pool.submit(parse_things, content))
+    games_batches = []
+    for i, future in zip(range(0, len(game_ids), batch_size), futures):
+        try:
+            games_batches.extend(future.result())
+        except Exception as e:
+            # Fetched and parsed again, with retries, as without a pool
+            logger.warning(f"Parsing a games batch failed, fetching it again: {e}")
+            games_batches.extend(get_games_batch(game_ids[i : i + batch_size], bgg))
+    if bgg.store is not None:
+        bgg.store.upsert_games(games_batches)
+    return games_batches
+
+
+def fetch_missing_games(game_ids, bgg, games_cache):
+    missing_ids = games_cache.missing(game_ids)
+    logger.info(f"Fetching {len(missing_ids)} games missing from the metadata cache")
+    games_cache.add(get_games_in_batches(missing_ids, bgg))
+
+
+@retry(tries=10, delay=3, backoff=2)
+def get_games_batch(batch, bgg):
+    games_batch = bgg.game_list(batch)
+    return games_batch
+
+
+@retry(tries=10, delay=3, backoff=2)
+def get_games_batch_content(batch, bgg):
+    return bgg.game_list_content(batch)
+
+
+def shorten_name(name):
+    short_name = name
+    if ":" in short_name:
+        short_name = short_name.split(":")[0]
+    if len(short_name) > 20:
+        short_name = "".join([word[0] for word in short_name.split()])
+    return short_name
+
+
+def filter_quasi_expansions(games):
+    # Mapped names are dropped from the collection already, this catches
+    # games whose collection name differs from their primary name
+    games = games[~games.name.isin(conf["mapping"].keys())]
+    return games
@@ -2,21 +2,25 @@
 
 import pandas as pd
 from loguru import logger
-from retry import retry
 
 from my_board_games.bgg_api import BGGClient
+from my_board_games.resilience import retry
 from my_board_games.settings import conf
 
 
 @retry(tries=10, delay=3, backoff=2, logger=logger)
-def get_marketplace_listings():
+def get_marketplace_listings(user_name=None, bgg=None):
     """Fetch marketplace listings from BGG GeekMarket.
 
+    Args:
+        user_name: BGG username, defaults to the configured user
+        bgg: BGGClient to reuse, a new one is created if not given
+
     Returns:
         DataFrame with columns: id, name, price, currency, condition, product_id, link
     """
-    bgg = BGGClient()
-    user_name = conf["user_name"]
+    bgg = bgg or BGGClient()
+    user_name = user_name or conf["user_name"]
 
     logger.info(f"Fetching marketplace listings for user: {user_name}")
     try:
@@ -1,8 +1,12 @@
 import json
+from pathlib import Path
 
+from my_board_games.outputs import write_if_changed
 
-def get_metrics():
-    suggested_players = json.load(open("data/suggested_players.json"))
+
+def get_metrics(output_dir="data", stale_reason=None):
+    output_dir = Path(output_dir)
+    suggested_players = json.load(open(output_dir / "suggested_players.json"))
     owned_games = [g for g in suggested_players if g["is_best_player"]]
     num_games = len(owned_games)
     played_games = [g for g in owned_games if g["last_played"]]
@@ -19,7 +23,8 @@ def get_metrics():
     )
     gain_from_max_played = max_days_since_last_played / len(played_games)
 
-    # Marketplace statistics
+    # Marketplace statistics, from the built games only, so that the stale
+    # fallback publishes the same numbers
     games_for_sale = [g for g in owned_games if g.get("marketplace_price")]
     num_games_for_sale = len(games_for_sale)
     total_marketplace_value = (
@@ -51,6 +56,9 @@ def get_metrics():
         average_marketplace_price=average_marketplace_price,
         most_expensive_game=most_expensive_game,
         most_expensive_price=most_expensive_price,
+        # Set when BGG was unavailable and the last good outputs were kept
+        stale=stale_reason is not None,
+        stale_reason=stale_reason,
     )
-    json.dump(metrics, open("data/metrics.json", "w"))
+    write_if_changed(output_dir / "metrics.json", json.dumps(metrics))
     return metrics
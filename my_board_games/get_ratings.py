@@ -1,23 +1,23 @@
 import os
 
 import pandas as pd
-import requests
 import xmltodict
 from loguru import logger
-from retry import retry
 
+from my_board_games.resilience import retry
+from my_board_games.response_cache import cached_get
 from my_board_games.settings import conf
 
 
 @retry(tries=10, delay=3, backoff=2)
-def get_personal_ratings():
-    username = conf["user_name"]
+def get_personal_ratings(user_name=None):
+    username = user_name or conf["user_name"]
     ratings = []
     #  url = f"https://boardgamegeek.com/xmlapi2/collection?username={username}&rated=1&stats=1"
     url = f"https://boardgamegeek.com/xmlapi2/collection?username={username}&own=1&stats=1"
     BGG_API_KEY = os.environ["BGG_API_KEY"]
     headers = {"Authorization": "Bearer " + BGG_API_KEY}
-    response = requests.get(url, headers=headers)
+    response = cached_get("collection", url, headers=headers)
     if response.status_code == 200:
         data = xmltodict.parse(response.content)
         items = data["items"]["item"]
@@ -1,10 +1,12 @@
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import pandas as pd
-from retry import retry
 from tqdm import tqdm
 
 from my_board_games.bgg_api import BGGClient
+from my_board_games.resilience import retry
+
+VERSION_COLUMNS = ["game_id", "game", "item_id", "language", "width", "length", "depth"]
 
 
 def get_sizes(game_ids):
@@ -28,36 +30,74 @@ def get_sizes(game_ids):
             except Exception as exc:
                 print(f"Game ID {game_id} generated an exception: {exc}")
 
-    sizes = pd.concat([get_size(g) for g in games_sizes])
-    sizes = sizes.reset_index()
+    versions = get_versions_table(games_sizes)
+    sizes = select_sizes(versions)
     return sizes
 
 
 @retry(tries=10, delay=3, backoff=2)
 def get_game_size_data(bgg: BGGClient, game_id):
-    g = bgg.game(game_id=game_id, versions=True)
+    # Only ids, names and versions are used, the rest is never parsed
+    g = bgg.game(game_id=game_id, versions=True, lazy=True)
     return g
 
 
-def get_size(g):
-    versions = g.data()["versions"]
-    games_df = pd.DataFrame(versions)
-    games_df["game"] = g.name
-    games_df["game_id"] = g.id
-    games_df["size"] = games_df["width"] + games_df["length"] + games_df["depth"]
-    games_df["size"] = games_df["width"] * games_df["length"] * games_df["depth"]
-    games_df["size"] = games_df["size"].astype(int)
+def get_versions_table(games_data):
+    """Build one long-format versions table for a whole collection.
+
+    Args:
+        games_data: GameData objects fetched with versions
+
+    Returns:
+        DataFrame with one row per (game, version) and a ``size`` volume column
+    """
+    rows = [
+        {"game_id": g.id, "game": g.name, **version}
+        for g in games_data
+        for version in g.versions or []
+    ]
+    versions = pd.DataFrame(rows, columns=VERSION_COLUMNS)
+    versions["size"] = (
+        versions["width"] * versions["length"] * versions["depth"]
+    ).astype(int)
+    return versions
+
+
+def select_sizes(versions):
+    """Pick one version per game: sized first, then English, then largest.
+
+    Ties keep the first version in BGG order, same as the per-game selection.
+    """
+    versions = versions.assign(
+        has_size=versions["size"] > 0,
+        is_english=versions["language"] == "English",
+    )
+    sizes = versions.sort_values(
+        ["game_id", "has_size", "is_english", "size"],
+        ascending=[True, False, False, False],
+        kind="mergesort",
+    ).drop_duplicates("game_id")
+    sizes = sizes.drop(columns=["has_size", "is_english"])
+    sizes = sizes.reset_index(drop=True)
+    return sizes
+
 
-    games_with_size = games_df[games_df["size"] > 0]
-    if len(games_with_size):
-        games_df = games_with_size
+def get_shelf_volume(sizes):
+    """Summarize the shelf volume taken by a collection.
 
-    english_games_df = games_df[games_df.language == "English"]
-    if len(english_games_df):
-        games_df = english_games_df
+    Args:
+        sizes: Output of ``select_sizes``
 
-    game_df = games_df[games_df["size"] == games_df["size"].max()].iloc[:1]
-    return game_df
+    Returns:
+        Dict with total volume and counts of sized and unsized games
+    """
+    sized = sizes["size"] > 0
+    shelf_volume = {
+        "total_volume": int(sizes.loc[sized, "size"].sum()),
+        "num_sized_games": int(sized.sum()),
+        "num_unsized_games": int((~sized).sum()),
+    }
+    return shelf_volume
 
 
 def add_sizes(games, sizes):
@@ -1,27 +1,43 @@
+import base64
 import json
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
+from my_board_games.outputs import write_if_changed
 
-def get_suggested_players(games):
-    game_players = games[["id", "name", "suggested_players"]]
-    suggested_players = []
-    for _, game in game_players.iterrows():
-        best_player_count = get_best_player_count(game)
-        for player_num, ratings in game["suggested_players"]["results"].items():
-            is_best_player = player_num == best_player_count
-            is_ok = check_is_recommended_player_number(player_num, ratings)
-            if is_ok:
-                game_player = {
-                    "id": game["id"],
-                    "name": game["name"],
-                    "players": int(player_num),
-                    "best_player_count": best_player_count,
-                    "is_best_player": is_best_player,
-                }
-                suggested_players += [game_player]
-    suggested_players = pd.DataFrame(suggested_players)
+# Filter thresholds shared with the site (11ty_site/index.liquid)
+SHORT_PLAYINGTIME = 21  # short games take less than this many minutes
+LONG_PLAYINGTIME = 90  # long games take at least this many minutes
+LIGHT_WEIGHT = 1.5  # light games weigh less than this
+HEAVY_WEIGHT = 2.1  # heavy games weigh at least this
+
+SITE_GAME_COLUMNS = [
+    "id",
+    "name",
+    "short_name",
+    "thumbnail",
+    "url",
+    "best_player_count",
+    "playingtime",
+    "averageweight",
+    "average_rating",
+    "rating",
+    "numplays",
+    "days_since_last_played",
+    "size",
+    "marketplace_price",
+    "marketplace_link",
+]
+
+
+def get_suggested_players(games, output_dir="data", player_rows=None, store=None):
+    if player_rows is None and store is not None:
+        player_rows = store.get_player_rows(games["id"])
+    if player_rows is None:
+        player_rows = get_player_rows(games)
+    suggested_players = pd.DataFrame(player_rows)
     suggested_players = suggested_players.merge(
         games, on=["id", "name"], validate="m:1"
     )
@@ -30,12 +46,100 @@ def get_suggested_players(games):
     #  suggested_players = pd.concat([suggested_players, extra_rows])
     suggested_players["playingtime"] = suggested_players["playingtime"].astype("int")
     #  suggested_players["cool_name"] = get_cool_names(suggested_players)
-    Path("data/suggested_players.json").write_text(
-        suggested_players.to_json(orient="records")
+    write_if_changed(
+        Path(output_dir) / "suggested_players.json",
+        suggested_players.to_json(orient="records"),
+    )
+    write_if_changed(
+        Path(output_dir) / "site_payload.json",
+        json.dumps(get_site_payload(suggested_players)),
     )
     return suggested_players
 
 
+def get_site_payload(suggested_players):
+    """Build the compact payload the site renders and filters from.
+
+    Games appear once in a column-oriented table. Each player count lists
+    positions into that table, in the order of the suggested players table.
+    Filters are bitsets (base64, little-endian bit order): game-level ones
+    over the game table, bestPlayer over each player count's list.
+    """
+    suggested_players = suggested_players.reset_index(drop=True)
+    suggested_players["averageweight"] = get_averageweight(suggested_players)
+    games = suggested_players.drop_duplicates("id").reset_index(drop=True)
+    columns = [c for c in SITE_GAME_COLUMNS if c in games.columns]
+    position = pd.Series(games.index, index=games["id"])
+
+    playingtime = games["playingtime"]
+    weight = games["averageweight"]
+    price = pd.to_numeric(
+        games.get("marketplace_price", pd.Series(index=games.index)), errors="coerce"
+    )
+    filters = {
+        "short": playingtime < SHORT_PLAYINGTIME,
+        "long": playingtime >= LONG_PLAYINGTIME,
+        "light": weight < LIGHT_WEIGHT,
+        "heavy": weight >= HEAVY_WEIGHT,
+        "forSale": price.notna(),
+    }
+
+    players = {}
+    best_player = {}
+    for player_count, rows in suggested_players.groupby("players", sort=True):
+        players[str(player_count)] = position[rows["id"]].tolist()
+        best_player[str(player_count)] = to_bitset(rows["is_best_player"])
+
+    site_payload = {
+        "columns": columns,
+        "games": json.loads(games[columns].to_json(orient="values")),
+        "players": players,
+        "filters": {name: to_bitset(mask) for name, mask in filters.items()},
+        "bestPlayer": best_player,
+    }
+    return site_payload
+
+
+def to_bitset(mask):
+    bits = np.packbits(np.asarray(mask, dtype=bool), bitorder="little")
+    return base64.b64encode(bits.tobytes()).decode()
+
+
+def get_averageweight(suggested_players):
+    return pd.to_numeric(
+        suggested_players["stats"].apply(
+            lambda x: x.get("averageweight") if isinstance(x, dict) else None
+        ),
+        errors="coerce",
+    )
+
+
+def get_player_rows(games):
+    game_players = games[["id", "name", "suggested_players"]]
+    suggested_players = []
+    for _, game in game_players.iterrows():
+        suggested_players += get_game_player_rows(game)
+    return suggested_players
+
+
+def get_game_player_rows(game):
+    best_player_count = get_best_player_count(game)
+    game_player_rows = []
+    for player_num, ratings in game["suggested_players"]["results"].items():
+        is_best_player = player_num == best_player_count
+        is_ok = check_is_recommended_player_number(player_num, ratings)
+        if is_ok:
+            game_player = {
+                "id": game["id"],
+                "name": game["name"],
+                "players": int(player_num),
+                "best_player_count": best_player_count,
+                "is_best_player": is_best_player,
+            }
+            game_player_rows += [game_player]
+    return game_player_rows
+
+
 def check_is_recommended_player_number(player_num, ratings):
     is_ok = False
     is_player_num = player_num.isdigit()
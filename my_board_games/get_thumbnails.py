@@ -0,0 +1,139 @@
+"""Mirror game thumbnails locally as content-addressed WebP variants."""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+from loguru import logger
+from PIL import Image
+
+from my_board_games.outputs import write_if_changed
+from my_board_games.resilience import retry
+
+THUMBNAILS_DIR = "data/thumbnails"
+THUMBNAIL_SIZES = (64, 128)
+
+
+def get_thumbnails(items, thumbnails_dir=THUMBNAILS_DIR, max_workers=8, session=None):
+    """Download thumbnails that are not mirrored yet and resize them.
+
+    Args:
+        items: GameData or CollectionItem objects
+        thumbnails_dir: Directory holding the images and manifest.json
+        max_workers: Maximum number of concurrent downloads
+        session: requests.Session to download with
+
+    Returns:
+        Manifest dict mapping game ids to image urls and urls to local files
+    """
+    thumbnails_dir = Path(thumbnails_dir)
+    manifest_path = thumbnails_dir / "manifest.json"
+    manifest = {"games": {}, "images": {}}
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text())
+
+    urls = get_thumbnail_urls(items)
+    manifest["games"] = {str(game_id): url for game_id, url in urls.items()}
+    missing_urls = [
+        url
+        for url in dict.fromkeys(urls.values())
+        if not is_mirrored(manifest["images"].get(url), thumbnails_dir)
+    ]
+    logger.info(f"Downloading {len(missing_urls)} of {len(urls)} thumbnails")
+
+    session = session or requests.Session()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            url: executor.submit(mirror_thumbnail, session, url, thumbnails_dir)
+            for url in missing_urls
+        }
+        for url, future in futures.items():
+            try:
+                manifest["images"][url] = future.result()
+            except Exception as e:
+                logger.warning(f"Failed to mirror thumbnail {url}: {e}")
+
+    thumbnails_dir.mkdir(parents=True, exist_ok=True)
+    write_if_changed(manifest_path, json.dumps(manifest, indent=1))
+    return manifest
+
+
+def get_thumbnail_urls(items):
+    urls = {}
+    for item in items:
+        thumbnail = getattr(item, "thumbnail", None)
+        if thumbnail is None and hasattr(item, "_data"):
+            thumbnail = item._data.get("thumbnail")
+        if thumbnail:
+            urls[item.id] = thumbnail
+    return urls
+
+
+def is_mirrored(image, thumbnails_dir):
+    if image is None:
+        return False
+    paths = [image["original"], *image["variants"].values()]
+    return all((thumbnails_dir / path).exists() for path in paths)
+
+
+def mirror_thumbnail(session, url, thumbnails_dir):
+    content = download(session, url)
+    digest = hashlib.sha256(content).hexdigest()
+    suffix = Path(urlparse(url).path).suffix or ".img"
+    image = {"original": f"originals/{digest}{suffix}", "variants": {}}
+    save(thumbnails_dir / image["original"], content)
+
+    for size in THUMBNAIL_SIZES:
+        variant = f"{size}/{digest}.webp"
+        variant_path = thumbnails_dir / variant
+        if not variant_path.exists():
+            save(variant_path, resize(content, size))
+        image["variants"][str(size)] = variant
+    return image
+
+
+@retry(tries=3, delay=1, backoff=2)
+def download(session, url):
+    response = session.get(url, timeout=15)
+    response.raise_for_status()
+    return response.content
+
+
+def resize(content, size):
+    with Image.open(BytesIO(content)) as img:
+        img = img.convert("RGBA") if img.mode in ("P", "LA") else img.convert("RGB")
+        img.thumbnail((size, size))
+        output = BytesIO()
+        img.save(output, format="WEBP", quality=80)
+    return output.getvalue()
+
+
+def save(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+
+
+def add_thumbnails(
+    games, manifest, output_dir="data", thumbnails_dir=THUMBNAILS_DIR, size=THUMBNAIL_SIZES[-1]
+):
+    """Add a local_thumbnail column with the path of the mirrored variant.
+
+    Paths are relative to ``output_dir``, like "thumbnails/128/<digest>.webp",
+    so the site resolves them next to the JSON outputs.
+    """
+    relative_dir = Path(os.path.relpath(thumbnails_dir, output_dir)).as_posix()
+
+    def get_local_thumbnail(game_id):
+        url = manifest["games"].get(str(game_id))
+        image = manifest["images"].get(url)
+        if image is None:
+            return None
+        return f"{relative_dir}/{image['variants'][str(size)]}"
+
+    games["local_thumbnail"] = games["id"].apply(get_local_thumbnail)
+    return games
@@ -0,0 +1,151 @@
+"""Daily snapshots of ratings, ranks, plays and prices as a compact time series.
+
+Only changes are stored: a row (day, game_id, field, value) is appended when
+a field of a game differs from its last recorded value. The rows are kept as
+columns in a compressed ``.npz`` file.
+"""
+
+import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+HISTORY_PATH = "data/history.npz"
+
+FIELDS = ["average_rating", "rank", "numplays", "rating", "marketplace_price"]
+
+EPOCH = datetime.date(1970, 1, 1)
+
+
+def get_snapshot_values(games):
+    """Return the tracked fields of a games DataFrame, indexed by game id.
+
+    Fields missing from the frame, or unparseable values such as a personal
+    rating of "N/A", are NaN.
+    """
+    games = games.drop_duplicates("id").set_index("id")
+    values = pd.DataFrame(index=games.index.astype("int64"))
+    for field in FIELDS:
+        if field == "rank" and "stats" in games.columns:
+            column = games["stats"].apply(get_boardgame_rank)
+        else:
+            column = games.get(field, pd.Series(np.nan, index=games.index))
+        values[field] = pd.to_numeric(column, errors="coerce").to_numpy(dtype="float64")
+    return values
+
+
+def get_boardgame_rank(stats):
+    if not isinstance(stats, dict):
+        return None
+    for rank in stats.get("ranks", []):
+        if rank["name"] == "boardgame":
+            return rank["value"]
+    return None
+
+
+def to_day(date):
+    return (date - EPOCH).days
+
+
+class History:
+    """Delta-encoded columnar history of the tracked fields per game."""
+
+    def __init__(self, path=HISTORY_PATH):
+        """Initialize the history.
+
+        Args:
+            path: ``.npz`` file the history is persisted to, or None to keep it in memory
+        """
+        self.path = Path(path) if path else None
+        self.day = np.empty(0, dtype="int32")
+        self.game_id = np.empty(0, dtype="int32")
+        self.field = np.empty(0, dtype="uint8")
+        self.value = np.empty(0, dtype="float64")
+        self.latest_day = None
+        if self.path is not None and self.path.exists():
+            with np.load(self.path) as columns:
+                self.day = columns["day"]
+                self.game_id = columns["game_id"]
+                self.field = columns["field"]
+                self.value = columns["value"]
+                self.latest_day = int(columns["latest_day"]) if len(self.day) else None
+
+    def __len__(self):
+        return len(self.day)
+
+    def save(self):
+        """Persist the history to disk."""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            self.path,
+            day=self.day,
+            game_id=self.game_id,
+            field=self.field,
+            value=self.value,
+            latest_day=np.int32(self.latest_day or 0),
+        )
+
+    def last_values(self):
+        """Return the last recorded value per (game_id, field) as a Series."""
+        rows = pd.DataFrame({"game_id": self.game_id, "field": self.field, "value": self.value})
+        # Not groupby().last(), which skips NaN: a field gone missing is missing now
+        last = rows.drop_duplicates(["game_id", "field"], keep="last")
+        return last.set_index(["game_id", "field"])["value"]
+
+    def record(self, games, date=None):
+        """Append the fields of games that changed since their last snapshot.
+
+        Args:
+            games: DataFrame with an id column and the tracked fields
+            date: Day of the snapshot, defaults to today
+
+        Returns:
+            Number of rows appended
+        """
+        day = to_day(date or datetime.date.today())
+        snapshot = get_snapshot_values(games)
+        game_ids = np.repeat(snapshot.index.to_numpy("int32"), len(FIELDS))
+        fields = np.tile(np.arange(len(FIELDS), dtype="uint8"), len(snapshot))
+        values = snapshot.to_numpy("float64").ravel()
+
+        last = self.last_values()
+        keys = pd.MultiIndex.from_arrays([game_ids, fields])
+        seen = keys.isin(last.index)
+        previous = last.reindex(keys).to_numpy("float64")
+        # NaN is a value too: a field going missing is a change, staying missing is not
+        unchanged = (values == previous) | (np.isnan(values) & np.isnan(previous))
+        # Fields never recorded before are only recorded once they have a value
+        changed = np.where(seen, ~unchanged, ~np.isnan(values))
+
+        self.day = np.concatenate([self.day, np.full(changed.sum(), day, dtype="int32")])
+        self.game_id = np.concatenate([self.game_id, game_ids[changed]])
+        self.field = np.concatenate([self.field, fields[changed]])
+        self.value = np.concatenate([self.value, values[changed]])
+        self.latest_day = max(day, self.latest_day or day)
+        return int(changed.sum())
+
+    def series(self, game_id, field, daily=False):
+        """Return a field of a game over time.
+
+        Args:
+            game_id: BGG id of the game
+            field: One of FIELDS
+            daily: Forward fill to one value per day up to the latest snapshot
+
+        Returns:
+            Series of values indexed by date, only the change points unless daily
+        """
+        mask = (self.game_id == game_id) & (self.field == FIELDS.index(field))
+        dates = pd.to_datetime(self.day[mask], unit="D")
+        values = pd.Series(self.value[mask], index=dates, name=field)
+        values = values[~values.index.duplicated(keep="last")]
+        if daily and len(values):
+            end = pd.to_datetime(self.latest_day, unit="D")
+            # Fill the days between change points, keeping recorded NaNs
+            values = values.reindex(
+                pd.date_range(values.index[0], end, freq="D"), method="ffill"
+            )
+        return values
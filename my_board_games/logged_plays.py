@@ -1,58 +1,268 @@
+import copy
+import json
 import os
 import xml.etree.ElementTree as ET
+from datetime import date, timedelta
+from pathlib import Path
 
 import pandas as pd
-import requests
 
+from my_board_games.bgg_api import BGGApiError
+from my_board_games.resilience import retry
+from my_board_games.response_cache import CacheMissError, cached_get
 from my_board_games.settings import conf
 
+PLAYS_INDEX_PATH = "data/plays_index.json"
+PLAY_COLUMNS = ["play_id", "date", "quantity", "game_id", "game_name"]
+# Plays held in memory at once while folding them into the index
+PLAYS_CHUNK_SIZE = 5000
+# Plays logged late but dated up to this many days before the latest play
+# are still counted, their ids are kept to avoid counting plays twice
+PLAYS_OVERLAP_DAYS = 30
+
+
+def get_logged_plays(user_name=None, mindate=None):
+    chunks = list(iter_logged_plays(user_name=user_name, mindate=mindate))
+    if not chunks:
+        return pd.DataFrame(columns=PLAY_COLUMNS)
+    return pd.concat(chunks, ignore_index=True)
 
-def get_logged_plays():
-    username = conf["user_name"]
-    # API endpoint for retrieving plays data
-    url = f"https://boardgamegeek.com/xmlapi2/plays?username={username}&page="
-    BGG_API_KEY = os.environ["BGG_API_KEY"]
-    headers = {"Authorization": "Bearer " + BGG_API_KEY}
 
+def iter_logged_plays(user_name=None, mindate=None, chunk_size=PLAYS_CHUNK_SIZE):
+    """Fetch logged plays page by page.
+
+    Args:
+        user_name: BGG username, defaults to the configured user
+        mindate: Only fetch plays on or after this date
+        chunk_size: Maximum number of plays per chunk
+
+    Yields:
+        DataFrames of at most ``chunk_size`` plays, newest first like BGG
+        returns them
+
+    Raises:
+        BGGApiError: If a page cannot be retrieved
+    """
     # Retrieve all pages of plays data
     page_num = 1
     plays_list = []
     while True:
-        response = requests.get(url + str(page_num), headers=headers)
-        if response.status_code == 200:
-            root = ET.fromstring(response.content)
-            plays = root.findall(".//play")
-            if len(plays) == 0:
-                break
-            for play in plays:
-                play_data = {
-                    "date": play.get("date"),
-                    "quantity": play.get("quantity"),
-                    "game_id": play.get("id"),
-                    "game_name": play.find(".//item").get("name"),
-                }
-                plays_list.append(play_data)
-            page_num += 1
-        else:
-            print(
-                "Failed to retrieve plays data. Please check your username and try again."
+        response = get_plays_page(user_name, mindate, page_num)
+        if response.status_code != 200:
+            # A partial history must not be folded into the index
+            raise BGGApiError(
+                f"Failed to retrieve plays page {page_num}: HTTP {response.status_code}"
             )
+        root = ET.fromstring(response.content)
+        plays = root.findall(".//play")
+        if len(plays) == 0:
             break
+        for play in plays:
+            plays_list.append(parse_play(play))
+            if len(plays_list) == chunk_size:
+                yield pd.DataFrame(plays_list, columns=PLAY_COLUMNS)
+                plays_list = []
+        page_num += 1
+
+    if plays_list:
+        yield pd.DataFrame(plays_list, columns=PLAY_COLUMNS)
+
+
+@retry(tries=10, delay=3, backoff=2)
+def get_plays_page(user_name=None, mindate=None, page_num=1):
+    return request_plays_page(user_name, mindate, page_num)
+
+
+def request_plays_page(user_name=None, mindate=None, page_num=1):
+    username = user_name or conf["user_name"]
+    # API endpoint for retrieving plays data
+    url = f"https://boardgamegeek.com/xmlapi2/plays?username={username}&page="
+    if mindate:
+        url = f"https://boardgamegeek.com/xmlapi2/plays?username={username}&mindate={mindate}&page="
+    BGG_API_KEY = os.environ["BGG_API_KEY"]
+    headers = {"Authorization": "Bearer " + BGG_API_KEY}
+    return cached_get("plays", url + str(page_num), headers=headers)
+
+
+def parse_play(play):
+    item = play.find(".//item")
+    play_data = {
+        "play_id": play.get("id"),
+        "date": play.get("date"),
+        "quantity": int(play.get("quantity") or 1),
+        "game_id": int(item.get("objectid")),
+        "game_name": item.get("name"),
+    }
+    return play_data
+
+
+def get_plays_index(path=PLAYS_INDEX_PATH, user_name=None, store=None):
+    """Fetch plays logged since the last run and fold them into the index.
 
-    # Create a Pandas DataFrame from the plays data
-    logged_plays = pd.DataFrame(plays_list)
-    logged_plays["game_name"] = logged_plays["game_name"].apply(map_duplicates)
-    return logged_plays
+    Args:
+        path: Location of the persisted plays index
+        user_name: BGG username, defaults to the configured user
+        store: Store the fetched plays are upserted into
 
+    Returns:
+        Plays index dict with per-game aggregates keyed by game id
+    """
+    plays_index = load_plays_index(path)
+    try:
+        updated_index = refresh_plays_index(plays_index, user_name, store)
+    except CacheMissError:
+        # Serving from cache: plays since the last run were never fetched
+        return plays_index
+    save_plays_index(updated_index, path)
+    return updated_index
 
-def add_logged_plays(games, logged_plays):
-    last_played = logged_plays.groupby("game_name").date.max().reset_index()
-    last_played.columns = ["name", "last_played"]
-    games = games.merge(last_played, on="name", how="left")
+
+def refresh_plays_index(plays_index, user_name=None, store=None):
+    """Return a copy of the index with the plays logged since it was updated.
+
+    Args:
+        plays_index: Index as returned by ``load_plays_index``, left unchanged
+        user_name: BGG username, defaults to the configured user
+        store: Store the fetched plays are upserted into
+    """
+    chunks = iter_logged_plays(user_name=user_name, mindate=get_plays_mindate(plays_index))
+    if store is not None:
+        chunks = upsert_plays_chunks(store, user_name or conf["user_name"], chunks)
+    # Chunks are folded as they arrive, so a failing page must not leave
+    # a half-updated index behind
+    return update_plays_index(copy.deepcopy(plays_index), chunks)
+
+
+def upsert_plays_chunks(store, user_name, chunks):
+    for chunk in chunks:
+        store.upsert_plays(user_name, chunk.to_dict("records"))
+        yield chunk
+
+
+def load_plays_index(path=PLAYS_INDEX_PATH):
+    path = Path(path)
+    if not path.exists():
+        return {"games": {}, "latest_date": None, "play_ids": {}, "play_ids_since": None}
+    plays_index = json.loads(path.read_text())
+    if "play_ids" not in plays_index:
+        # Indexes written before the overlap window only know the ids of
+        # the plays on their latest date
+        latest_date = plays_index["latest_date"]
+        play_ids = plays_index.pop("latest_play_ids", [])
+        plays_index["play_ids"] = {play_id: latest_date for play_id in play_ids}
+        plays_index["play_ids_since"] = latest_date
+    return plays_index
+
+
+def save_plays_index(plays_index, path=PLAYS_INDEX_PATH):
+    Path(path).write_text(json.dumps(plays_index))
+
+
+def get_plays_mindate(plays_index):
+    """Return the date plays are fetched from, None to fetch them all."""
+    return plays_index["play_ids_since"]
+
+
+def update_plays_index(plays_index, logged_plays):
+    """Fold new plays into the per-game index.
+
+    Plays dated from ``play_ids_since`` on are refetched on every update,
+    so their ids are remembered to avoid counting them twice. The window
+    then moves to ``PLAYS_OVERLAP_DAYS`` before the latest play.
+
+    Args:
+        plays_index: Index as returned by ``load_plays_index``
+        logged_plays: DataFrame from ``get_logged_plays``, or an iterable of
+            DataFrame chunks from ``iter_logged_plays``. Only one chunk is
+            held in memory at a time.
+
+    Returns:
+        The updated index
+    """
+    if isinstance(logged_plays, pd.DataFrame):
+        logged_plays = [logged_plays]
+    play_ids = plays_index["play_ids"]
+    play_ids_since = plays_index["play_ids_since"]
+    # Games whose name was set from an earlier, newer chunk of this update
+    named = set()
+    for chunk in logged_plays:
+        is_seen = chunk.play_id.isin(list(play_ids))
+        if play_ids_since:
+            is_seen |= chunk.date < play_ids_since
+        chunk = chunk[~is_seen].drop_duplicates("play_id")
+        if chunk.empty:
+            continue
+        fold_plays(plays_index["games"], chunk, named)
+        play_ids.update(zip(chunk.play_id, chunk.date))
+        latest_date = chunk.date.max()
+        if plays_index["latest_date"] is None or latest_date > plays_index["latest_date"]:
+            plays_index["latest_date"] = latest_date
+
+    if plays_index["latest_date"] is None:
+        return plays_index
+    window_start = (
+        date.fromisoformat(plays_index["latest_date"]) - timedelta(days=PLAYS_OVERLAP_DAYS)
+    ).isoformat()
+    if play_ids_since is None or window_start > play_ids_since:
+        plays_index["play_ids_since"] = window_start
+        plays_index["play_ids"] = {
+            play_id: play_date
+            for play_id, play_date in play_ids.items()
+            if play_date >= window_start
+        }
+    return plays_index
+
+
+def fold_plays(games_index, logged_plays, named):
+    """Add the per-game aggregates of a chunk of plays to the index."""
+    new_games = logged_plays.groupby("game_id").agg(
+        name=("game_name", "first"),
+        last_played=("date", "max"),
+        play_count=("play_id", "size"),
+        quantity=("quantity", "sum"),
+    )
+    for game_id, game in new_games.iterrows():
+        key = str(game_id)
+        entry = games_index.get(key)
+        if entry is None:
+            games_index[key] = {
+                "name": game["name"],
+                "last_played": game["last_played"],
+                "play_count": int(game["play_count"]),
+                "quantity": int(game["quantity"]),
+            }
+        else:
+            if key not in named:
+                entry["name"] = game["name"]
+            entry["last_played"] = max(entry["last_played"], game["last_played"])
+            entry["play_count"] += int(game["play_count"])
+            entry["quantity"] += int(game["quantity"])
+        named.add(key)
+
+
+def add_logged_plays(games, plays_index):
+    last_played = pd.DataFrame(
+        [
+            {"id": int(game_id), "name": game["name"], "last_played": game["last_played"]}
+            for game_id, game in plays_index["games"].items()
+        ],
+        columns=["id", "name", "last_played"],
+    )
+    last_played["id"] = map_duplicate_ids(last_played, games)
+    last_played = last_played.groupby("id").last_played.max().reset_index()
+    games = games.merge(last_played, on="id", how="left")
     games = get_days_since_last_played(games)
     return games
 
 
+def map_duplicate_ids(last_played, games):
+    """Credit plays of mapped games to the game they are mapped to."""
+    name_to_id = dict(zip(games["name"], games["id"]))
+    mapped_ids = last_played["name"].map(map_duplicates).map(name_to_id)
+    is_mapped = last_played["name"].isin(conf["mapping"].keys()) & mapped_ids.notna()
+    return last_played["id"].where(~is_mapped, mapped_ids).astype(int)
+
+
 def get_days_since_last_played(games):
     games["last_played"] = pd.to_datetime(games["last_played"])
     games["days_since_last_played"] = (
@@ -1,19 +1,46 @@
-import altair as alt
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
-from my_board_games.charts.average_rating_chart import \
-    make_average_rating_chart
-from my_board_games.charts.time_since_last_played_chart import \
-    make_time_since_last_played_chart
+from loguru import logger
 
+STATIC_CHARTS_CACHE_DIR = "data/cache/charts"
+STATIC_CHART_FORMATS = ("svg", "png")
+STATIC_CHART_SIZE = (1800, 1000)
 
-def make_charts(suggested_players):
-    fig = make_average_rating_chart(suggested_players)
-    filename = "average_chart.html"
-    save_chart(fig, filename)
-    fig2 = make_time_since_last_played_chart(suggested_players)
-    filename = "last_played_chart.html"
-    save_chart(fig2, filename)
 
+def make_charts(suggested_players, static=False):
+    charts = get_charts()
+    with ThreadPoolExecutor(max_workers=len(charts)) as executor:
+        futures = [
+            executor.submit(make_chart, make_fig, suggested_players, filename, static)
+            for filename, make_fig in charts.items()
+        ]
+        figs = [future.result() for future in futures]
+
+    return figs[0]
+
+
+def get_charts():
+    # Imported here because altair is slow to import
+    from my_board_games.charts.average_rating_chart import \
+        make_average_rating_chart
+    from my_board_games.charts.time_since_last_played_chart import \
+        make_time_since_last_played_chart
+
+    charts = {
+        "average_chart.html": make_average_rating_chart,
+        "last_played_chart.html": make_time_since_last_played_chart,
+    }
+    return charts
+
+
+def make_chart(make_fig, suggested_players, filename, static=False):
+    fig = make_fig(suggested_players)
+    save_chart(fig, filename)
+    if static:
+        save_static_chart(fig, Path(filename).stem)
     return fig
 
 
@@ -22,3 +49,56 @@ def save_chart(fig, filename):
         strokeWidth=0
     )
     fig.save(filename, embed_options={"actions": False})
+
+
+def save_static_chart(fig, name, cache_dir=STATIC_CHARTS_CACHE_DIR):
+    """Render a chart to static SVG and PNG images next to its HTML page.
+
+    Renders are cached by a hash of the spec, which includes the data, so
+    an unchanged chart is only copied from the cache. Needs the optional
+    vl-convert-python package, see requirements.txt.
+
+    Returns:
+        Paths of the written images
+    """
+    try:
+        import vl_convert as vlc
+    except ImportError:
+        logger.warning(
+            "vl-convert-python is not installed, skipping static charts. "
+            "Install it with: pip install 'vl-convert-python<1.2'"
+        )
+        return []
+
+    import altair as alt
+
+    # Render with the Vega-Lite version altair writes its specs for
+    vl_version = get_vl_version(alt.SCHEMA_VERSION)
+    width, height = STATIC_CHART_SIZE
+    fig = fig.properties(width=width, height=height).configure_view(strokeWidth=0)
+    spec = fig.to_dict()
+    digest = hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()
+    renderers = {
+        "svg": lambda: vlc.vegalite_to_svg(spec, vl_version=vl_version).encode(),
+        "png": lambda: vlc.vegalite_to_png(spec, vl_version=vl_version),
+    }
+
+    paths = []
+    for fmt in STATIC_CHART_FORMATS:
+        cached = Path(cache_dir) / f"{digest}.{fmt}"
+        if not cached.exists():
+            logger.info(f"Rendering {name}.{fmt}")
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            cached.write_bytes(renderers[fmt]())
+        path = Path(f"{name}.{fmt}")
+        content = cached.read_bytes()
+        if not path.exists() or path.read_bytes() != content:
+            path.write_bytes(content)
+        paths.append(path)
+    return paths
+
+
+def get_vl_version(schema_version):
+    """Return the vl-convert version of an altair schema version, "v4.17.0" -> "4.17"."""
+    major, minor, _ = schema_version.lstrip("v").split(".")
+    return f"{major}.{minor}"
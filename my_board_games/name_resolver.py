@@ -0,0 +1,113 @@
+"""Resolve game names to BGG ids with a persistent cache."""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from loguru import logger
+
+from my_board_games.bgg_api import BGGApiError, BGGItemNotFoundError
+
+BGG_IDS_CACHE_PATH = "data/cache/bgg_ids.json"
+
+
+class NameResolver:
+    """Resolve names through the BGG search endpoint, concurrently and cached.
+
+    Names that were not found are cached too, and searched again once they
+    are older than ``negative_max_age`` seconds. With a title index, names
+    are matched locally first and BGG is only searched on a miss.
+    """
+
+    def __init__(
+        self,
+        bgg,
+        path=BGG_IDS_CACHE_PATH,
+        max_workers=8,
+        negative_max_age=7 * 24 * 60 * 60,
+        title_index=None,
+    ):
+        """Initialize the resolver.
+
+        Args:
+            bgg: BGGClient used for searches
+            path: JSON file the cache is persisted to, or None to keep it in memory
+            max_workers: Maximum number of concurrent searches
+            negative_max_age: Seconds after which a name that was not found is retried
+            title_index: TitleIndex matched before searching, and fed search results
+        """
+        self.bgg = bgg
+        self.title_index = title_index
+        self.path = Path(path) if path else None
+        self.max_workers = max_workers
+        self.negative_max_age = negative_max_age
+        self._lock = threading.Lock()
+        self._ids = {}
+        if self.path is not None and self.path.exists():
+            self._ids = json.loads(self.path.read_text())
+
+    def save(self):
+        """Persist the cache to disk."""
+        if self.path is None:
+            return
+        with self._lock:
+            text = json.dumps(self._ids)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(text)
+
+    def cached(self, name):
+        """Return (is_cached, id) for a name without searching."""
+        with self._lock:
+            entry = self._ids.get(name)
+        if entry is None:
+            return False, None
+        if entry["id"] is None and time.time() - entry["resolved_at"] > self.negative_max_age:
+            return False, None
+        return True, entry["id"]
+
+    def remember(self, name, bgg_id):
+        with self._lock:
+            self._ids[name] = {"id": bgg_id, "resolved_at": time.time()}
+
+    def resolve(self, name):
+        """Return the BGG id of the best match for a name, or None."""
+        is_cached, bgg_id = self.cached(name)
+        if is_cached:
+            return bgg_id
+        if self.title_index is not None:
+            bgg_id = self.title_index.match(name)
+            if bgg_id is not None:
+                return bgg_id
+        try:
+            bgg_id = self.search(name)
+        except BGGApiError as e:
+            # Not cached, the name is searched again next time
+            logger.warning(f"Failed to search for '{name}': {e}")
+            return None
+        self.remember(name, bgg_id)
+        return bgg_id
+
+    def search(self, name):
+        try:
+            results = self.bgg.search(name, exact=True) or self.bgg.search(name)
+        except BGGItemNotFoundError:
+            results = []
+        if self.title_index is not None:
+            self.title_index.add_search_results(results)
+        return results[0]["id"] if results else None
+
+    def resolve_many(self, names):
+        """Resolve names concurrently and persist the cache.
+
+        Returns:
+            Dict mapping each distinct name to its BGG id or None
+        """
+        names = list(dict.fromkeys(names))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            ids = dict(zip(names, executor.map(self.resolve, names)))
+        self.save()
+        if self.title_index is not None:
+            self.title_index.save()
+        return ids
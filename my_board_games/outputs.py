@@ -0,0 +1,32 @@
+"""Helpers for writing pipeline outputs to data/."""
+
+import os
+import tempfile
+from pathlib import Path
+
+
+def write_if_changed(path, text):
+    """Write text to path unless the file already has exactly that content.
+
+    Returns:
+        True if the file was written
+    """
+    path = Path(path)
+    if path.exists() and path.read_text() == text:
+        return False
+    path.write_text(text)
+    return True
+
+
+def write_atomic(path, text):
+    """Write text through a temporary file, so readers never see a partial file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
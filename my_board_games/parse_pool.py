@@ -0,0 +1,80 @@
+"""Parse large BGG responses in worker processes."""
+
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+
+MIN_POOL_SIZE = 64 * 1024  # smaller payloads parse faster than they pickle
+# Workers start after the prefetch and pipeline threads, and forking a
+# multi-threaded process can deadlock
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+class ParsePool:
+    """Process pool for CPU-bound XML parsing, with backpressure.
+
+    Payloads under ``min_size`` bytes are parsed in the calling thread.
+    At most ``max_pending`` payloads wait in or for the workers, further
+    submits block, so fetchers cannot run far ahead of the parsers.
+    """
+
+    def __init__(self, max_workers=None, max_pending=None, min_size=MIN_POOL_SIZE):
+        """Initialize the pool. Worker processes start on the first large payload.
+
+        Args:
+            max_workers: Number of worker processes, None for one per core,
+                0 to always parse in the calling thread
+            max_pending: Maximum number of payloads submitted and not parsed,
+                defaults to twice the number of workers
+            min_size: Payloads smaller than this many bytes are parsed inline
+        """
+        self.max_workers = max_workers
+        self.min_size = min_size
+        self._executor = None
+        self._lock = threading.Lock()
+        if max_pending is None:
+            max_pending = 2 * (max_workers or 8)
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    self.max_workers, mp_context=multiprocessing.get_context(START_METHOD)
+                )
+            return self._executor
+
+    def submit(self, parse, content, *args):
+        """Parse content with a module-level function.
+
+        Returns:
+            Future of the parsed records
+        """
+        if self.max_workers == 0 or len(content) < self.min_size:
+            future = Future()
+            try:
+                future.set_result(parse(content, *args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        self._slots.acquire()
+        try:
+            future = self._get_executor().submit(parse, content, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
@@ -0,0 +1,232 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from loguru import logger
+
+from my_board_games.bgg_api import BGGApiError, BGGClient
+from my_board_games.expansions import get_expansion_graph, get_expansions_cache
+from my_board_games.game_cache import GameMetadataCache
+from my_board_games.get_games import (
+    add_numplays,
+    fetch_missing_games,
+    get_games,
+    get_my_games,
+)
+from my_board_games.get_metrics import get_metrics
+#  from my_board_games.get_bbb_games import get_bbb_games
+from my_board_games.get_ratings import add_ratings, get_personal_ratings
+#  from my_board_games.get_sizes import add_sizes, get_sizes
+from my_board_games.get_suggested_players import get_suggested_players
+from my_board_games.get_thumbnails import add_thumbnails, get_thumbnails
+from my_board_games.history import History
+from my_board_games.logged_plays import add_logged_plays, get_plays_index
+#  from my_board_games.make_charts import make_charts
+from my_board_games.get_marketplace import add_marketplace_prices, get_marketplace_listings
+from my_board_games.outputs import write_if_changed
+from my_board_games.prefetch import prefetch_after_collection
+from my_board_games.resilience import BGGUnavailableError
+from my_board_games.response_cache import CacheMissError, format_freshness, response_mode
+from my_board_games.settings import conf
+from my_board_games.similarity import SimilarityIndex
+from my_board_games.store import get_store
+from my_board_games.title_index import TitleIndex
+
+
+def run_pipeline(
+    bgg,
+    user_name=None,
+    output_dir="data",
+    games_cache=None,
+    my_games=None,
+    title_index=None,
+    expansions_cache=None,
+):
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    if my_games is None:
+        logger.info("Getting games")
+        my_games = get_my_games(bgg, user_name)
+    #  bbb_games = get_bbb_games()
+    logger.info(f"Got {len(my_games)} games.")
+    game_ids = my_games.id.to_list()
+    prefetch_after_collection(
+        bgg, game_ids, user_name, games_cache, Path(output_dir) / "plays_index.json"
+    )
+    logger.info("Getting games metadata")
+    if title_index is None:
+        title_index = TitleIndex()
+    games = get_games(game_ids, bgg, games_cache, title_index)
+    title_index.save()
+    logger.info("Got games metadata")
+    games = add_collection_outputs(games, bgg, user_name, output_dir, expansions_cache)
+    logger.info("Add numplays")
+    games = add_numplays(games, my_games)
+    logger.info("Added numplays")
+    logger.info("Getting logged plays")
+    plays_index = get_plays_index(
+        Path(output_dir) / "plays_index.json", user_name, store=bgg.store
+    )
+    games = add_logged_plays(games, plays_index)
+    logger.info("Added logged plays to metadata")
+    logger.info("Getting ratings")
+    ratings = get_personal_ratings(user_name)
+    games = add_ratings(games, ratings)
+    logger.info("Added ratings to metadata")
+    logger.info("Getting marketplace listings")
+    marketplace_listings = get_marketplace_listings(user_name, bgg)
+    games = add_marketplace_prices(games, marketplace_listings)
+    logger.info("Added marketplace prices to metadata")
+    #  logger.info("Getting sizes")
+    #  sizes = get_sizes(game_ids)
+    #  games = add_sizes(games, sizes)
+    #  logger.info("Added sizes to metadata")
+    suggested_players = write_outputs(games, output_dir, store=bgg.store)
+
+    #  logger.info("Charting")
+    #  make_charts(suggested_players)
+    #  logger.info("Charted")
+    return suggested_players
+
+
+def add_collection_outputs(games, bgg, user_name=None, output_dir="data", expansions_cache=None):
+    """Mirror thumbnails and write expansions.json, when enabled in ``conf``.
+
+    Returns:
+        The games, with a local_thumbnail column if thumbnails are mirrored
+    """
+    if conf["mirror_thumbnails"]:
+        logger.info("Mirroring thumbnails")
+        manifest = get_thumbnails(games.itertuples())
+        games = add_thumbnails(games, manifest, output_dir)
+        logger.info("Mirrored thumbnails")
+    if conf["expansion_graph"]:
+        logger.info("Building expansion graph")
+        expansion_graph = get_expansion_graph(games, bgg, user_name, expansions_cache)
+        write_if_changed(
+            Path(output_dir) / "expansions.json", json.dumps(expansion_graph.to_dict())
+        )
+        logger.info(f"Found expansions for {len(expansion_graph.owned_per_base())} games")
+    return games
+
+
+def write_outputs(games, output_dir="data", store=None, player_rows=None):
+    """Record the history and write the outputs built from the complete games.
+
+    Args:
+        games: Games with plays, ratings and marketplace prices added
+        output_dir: Directory the JSON outputs are written to
+        store: Store the suggested player rows are read from
+        player_rows: Suggested player rows, computed from ``games`` if not given
+
+    Returns:
+        Suggested players table
+    """
+    history = History(Path(output_dir) / "history.npz")
+    logger.info(f"Recorded {history.record(games)} changes to the history")
+    history.save()
+    logger.info("Getting suggested players table")
+    suggested_players = get_suggested_players(
+        games, output_dir, player_rows=player_rows, store=store
+    )
+    logger.info("Got suggested players table")
+    logger.info("Finding similar games")
+    similar_games = SimilarityIndex(games)
+    write_if_changed(
+        Path(output_dir) / "similar_games.json", json.dumps(similar_games.to_dict())
+    )
+    logger.info(f"Found {len(similar_games.duplicates())} near duplicate pairs")
+    logger.info("Create metrics")
+    get_metrics(output_dir)
+    logger.info("Obtained metrics")
+    return suggested_players
+
+
+def run_pipeline_with_fallback(bgg, output_dir="data", **kwargs):
+    """Run the pipeline, keeping the last good outputs if BGG is unavailable.
+
+    BGG counts as unavailable when a breaker is open, the deadline is spent,
+    or a request still fails after its retries. The fallback marks
+    data/metrics.json as stale. Without previous outputs the error is raised.
+    """
+    try:
+        return run_pipeline(bgg, output_dir=output_dir, **kwargs)
+    except (BGGUnavailableError, BGGApiError, requests.exceptions.RequestException) as e:
+        if not (Path(output_dir) / "suggested_players.json").exists():
+            raise
+        logger.error(f"BGG is unavailable, keeping the last good outputs: {e}")
+        get_metrics(output_dir, stale_reason=str(e))
+
+
+def run_stale_while_revalidate(bgg, output_dir="data"):
+    """Publish outputs from cached BGG responses, then revalidate in the background.
+
+    Outputs are only rewritten when their content changes. The age of the
+    responses behind them is recorded per source in data/freshness.json.
+
+    Returns:
+        The started revalidation thread
+    """
+    try:
+        with response_mode("cached") as freshness:
+            run_pipeline(bgg, output_dir=output_dir)
+        write_freshness(freshness, output_dir)
+        logger.info("Published outputs from cached responses")
+    except CacheMissError as e:
+        logger.info(f"Not enough cached responses to publish early: {e}")
+
+    def revalidate():
+        with response_mode("store") as freshness:
+            run_pipeline_with_fallback(bgg, output_dir=output_dir)
+        write_freshness(freshness, output_dir)
+        logger.info("Revalidated outputs")
+
+    thread = threading.Thread(target=revalidate, name="revalidate")
+    thread.start()
+    return thread
+
+
+def write_freshness(freshness, output_dir="data"):
+    path = Path(output_dir) / "freshness.json"
+    previous = json.loads(path.read_text()) if path.exists() else {}
+    # Sources not used in this run keep their previous freshness
+    write_if_changed(path, json.dumps({**previous, **format_freshness(freshness)}, indent=2))
+
+
+def run_users(user_names, max_workers=4, parse_pool=None):
+    """Run the pipeline for several users, writing to data/<user_name>.
+
+    Collections are fetched first so that game metadata shared between users
+    is requested once through the shared cache. The pipelines also share
+    one title index and one expansions cache, so they do not overwrite each
+    other's files. With a parse pool, the collections are parsed on several
+    cores.
+    """
+    bgg = BGGClient(store=get_store(), parse_pool=parse_pool)
+    games_cache = GameMetadataCache()
+    title_index = TitleIndex()
+    expansions_cache = get_expansions_cache() if conf["expansion_graph"] else None
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        logger.info(f"Getting collections of {len(user_names)} users")
+        collections = list(
+            executor.map(lambda user_name: get_my_games(bgg, user_name), user_names)
+        )
+        game_ids = [gid for my_games in collections for gid in my_games.id.to_list()]
+        fetch_missing_games(game_ids, bgg, games_cache)
+        games_cache.save()
+        futures = [
+            executor.submit(
+                run_pipeline_with_fallback,
+                bgg,
+                user_name=user_name,
+                output_dir=f"data/{user_name}",
+                games_cache=games_cache,
+                my_games=my_games,
+                title_index=title_index,
+                expansions_cache=expansions_cache,
+            )
+            for user_name, my_games in zip(user_names, collections)
+        ]
+        for future in futures:
+            future.result()
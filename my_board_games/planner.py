@@ -0,0 +1,120 @@
+"""Plan a game night: the best set of games that fits a time budget."""
+
+import threading
+
+import numpy as np
+
+from my_board_games.query_api import get_weight_bucket
+from my_board_games.recommend import Recommender
+
+WEIGHT_BUCKETS = ["light", "medium", "heavy"]
+
+
+class Planner:
+    """Exact 0/1 knapsack over playing time, scored by a Recommender.
+
+    Diversity is a cap on the number of games per weight bucket. The
+    dynamic program runs over (minutes used, games per bucket) states.
+    Candidate sets are cached per player count and cap.
+    """
+
+    def __init__(self, recommender):
+        """Initialize the planner.
+
+        Args:
+            recommender: Recommender whose scores the plan maximizes
+        """
+        self.recommender = recommender
+        index = recommender.index
+        self.playingtime = np.nan_to_num(index.playingtime).astype(int)
+        buckets = get_weight_bucket(recommender.averageweight)
+        self.bucket = np.array([WEIGHT_BUCKETS.index(b) for b in buckets], dtype=int)
+        self._candidates = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_json(cls, path="data/suggested_players.json", weights=None):
+        return cls(Recommender.from_json(path, weights))
+
+    def get_candidates(self, players, max_per_weight):
+        """Return row positions worth considering for a player count.
+
+        A plan holds at most ``max_per_weight`` games of a bucket, so of the
+        games sharing a bucket and playing time only that many best scored
+        ones can be part of an optimal plan.
+        """
+        key = (players, max_per_weight)
+        with self._lock:
+            if key in self._candidates:
+                return self._candidates[key]
+        positions = self.recommender.positions.get(players, np.empty(0, dtype=int))
+        scores = self.recommender.base_scores[positions]
+        positions = positions[(scores > 0) & (self.playingtime[positions] > 0)]
+        order = np.lexsort(
+            (
+                -self.recommender.base_scores[positions],
+                self.playingtime[positions],
+                self.bucket[positions],
+            )
+        )
+        positions = positions[order]
+        bucket = self.bucket[positions]
+        playingtime = self.playingtime[positions]
+        row = np.arange(len(positions))
+        is_first = np.r_[True, (bucket[1:] != bucket[:-1]) | (playingtime[1:] != playingtime[:-1])]
+        rank = row - np.maximum.accumulate(np.where(is_first, row, 0))
+        candidates = positions[rank < max_per_weight]
+        with self._lock:
+            self._candidates[key] = candidates
+        return candidates
+
+    def plan(self, players, budget=240, max_per_weight=2):
+        """Return the set of games with the highest total score within the budget.
+
+        Args:
+            players: Number of players
+            budget: Minutes available
+            max_per_weight: Maximum number of games per weight bucket
+
+        Returns:
+            Dict with the planned games (longest first), total time and score
+        """
+        candidates = self.get_candidates(players, max_per_weight)
+        candidates = candidates[self.playingtime[candidates] <= budget]
+        scores = self.recommender.base_scores
+        cap = max_per_weight + 1
+
+        # best[minutes, light, medium, heavy] is the best score of a plan
+        # taking exactly those minutes and numbers of games per bucket
+        best = np.full((budget + 1, cap, cap, cap), -np.inf)
+        best[0, 0, 0, 0] = 0
+        taken = np.zeros((len(candidates),) + best.shape, dtype=bool)
+        for i, position in enumerate(candidates):
+            minutes = self.playingtime[position]
+            bucket = self.bucket[position]
+            source = [slice(None, budget + 1 - minutes), slice(None), slice(None), slice(None)]
+            target = [slice(minutes, None), slice(None), slice(None), slice(None)]
+            source[bucket + 1] = slice(None, max_per_weight)
+            target[bucket + 1] = slice(1, None)
+            with_game = np.full(best.shape, -np.inf)
+            with_game[tuple(target)] = best[tuple(source)] + scores[position]
+            taken[i] = with_game > best
+            best = np.maximum(best, with_game)
+
+        state = list(np.unravel_index(np.argmax(best), best.shape))
+        total_score = float(best[tuple(state)])
+        planned = []
+        for i in reversed(range(len(candidates))):
+            if taken[(i, *state)]:
+                position = candidates[i]
+                planned.append(position)
+                state[0] -= self.playingtime[position]
+                state[self.bucket[position] + 1] -= 1
+
+        planned = sorted(planned, key=lambda p: -self.playingtime[p])
+        records = self.recommender.index.records
+        return {
+            "games": [{**records[p], "score": round(float(scores[p]), 4)} for p in planned],
+            "total_time": int(self.playingtime[planned].sum()) if planned else 0,
+            "total_score": round(total_score, 4),
+        }
@@ -0,0 +1,206 @@
+"""Speculative, low-priority requests for data later stages will need."""
+
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import requests
+from loguru import logger
+
+from my_board_games.logged_plays import (
+    PLAYS_INDEX_PATH,
+    get_plays_mindate,
+    load_plays_index,
+    request_plays_page,
+)
+from my_board_games.resilience import speculative
+from my_board_games.response_cache import get_mode, get_prefetcher, set_prefetcher
+from my_board_games.settings import conf
+
+# Lower values are prefetched first, in the order the pipeline needs them
+THING_PRIORITY = 0
+PLAYS_PRIORITY = 1
+USER_PRIORITY = 2
+
+_CLAIMED = object()  # requested on demand, not to be prefetched any more
+
+
+class PrefetchSkipped(Exception):
+    """Exception raised in the prefetch thread for a request not to be made."""
+
+    pass
+
+
+class Prefetcher:
+    """Background thread making requests before their stage asks for them.
+
+    While running, ``cached_get`` hands requests to ``get``. A response the
+    thread requested, or is requesting, is used by the stage instead of a
+    new request, once. The thread makes one request at a time, at most one
+    per ``min_interval`` seconds, and only while fewer than
+    ``max_in_flight`` on-demand requests are running. All requests share
+    the rate limit of ``guarded_get``, prefetched failures never count
+    towards a circuit breaker, and prefetching stops at the first 429.
+    """
+
+    def __init__(self, max_in_flight=2, min_interval=0.5):
+        """Initialize the prefetcher. Requests start once it is entered.
+
+        Args:
+            max_in_flight: Prefetching pauses while this many on-demand
+                requests are in flight
+            min_interval: Minimum seconds between two prefetched requests
+        """
+        self.max_in_flight = max_in_flight
+        self.min_interval = min_interval
+        self.hits = 0
+        self._tasks = queue.PriorityQueue()
+        self._order = itertools.count()
+        self._responses = {}
+        self._on_demand = 0
+        self._closed = False
+        self._throttled = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="prefetch", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        set_prefetcher(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Stop prefetching. A request in flight is not waited for."""
+        set_prefetcher(None)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._tasks.put((float("inf"), 0, None, (), {}))
+        logger.info(f"Used {self.hits} prefetched responses")
+
+    def schedule(self, priority, func, *args, **kwargs):
+        """Call ``func`` in the prefetch thread, lower priorities first.
+
+        Exceptions of ``func`` are logged and ignored: the stage makes the
+        request again when it needs it.
+        """
+        self._tasks.put((priority, next(self._order), func, args, kwargs))
+
+    def get(self, key, fetch):
+        """Return the response of a request, calling ``fetch`` to make it.
+
+        Args:
+            key: Request key, see ``response_cache.request_key``
+            fetch: Makes the request and returns the response
+
+        Raises:
+            PrefetchSkipped: In the prefetch thread, if the request was made
+                before or BGG throttled a prefetched request
+        """
+        if threading.current_thread() is self._thread:
+            return self._prefetch(key, fetch)
+
+        with self._condition:
+            future = self._responses.pop(key, None)
+        if future is not None and future is not _CLAIMED:
+            try:
+                response = future.result()
+            except Exception:
+                pass
+            else:
+                with self._condition:
+                    self.hits += 1
+                return response
+
+        with self._condition:
+            self._responses[key] = _CLAIMED
+            self._on_demand += 1
+        try:
+            return fetch()
+        finally:
+            with self._condition:
+                self._on_demand -= 1
+                self._condition.notify_all()
+
+    def _prefetch(self, key, fetch):
+        with self._condition:
+            if self._throttled or key in self._responses:
+                raise PrefetchSkipped(key)
+            future = self._responses[key] = Future()
+        try:
+            response = fetch()
+        except BaseException as e:
+            future.set_exception(e)
+            if isinstance(e, requests.exceptions.HTTPError) and e.response is not None:
+                if e.response.status_code == 429:
+                    logger.warning("BGG throttled a prefetched request, prefetching stops")
+                    self._throttled = True
+                    # Not retried by the caller, unlike the HTTPError
+                    raise PrefetchSkipped(key) from e
+            raise
+        future.set_result(response)
+        return response
+
+    def _run(self):
+        last_request = float("-inf")
+        while True:
+            _, _, func, args, kwargs = self._tasks.get()
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._closed or self._on_demand < self.max_in_flight
+                )
+                if self._closed or self._throttled:
+                    return
+            time.sleep(max(last_request + self.min_interval - time.monotonic(), 0))
+            try:
+                with speculative():
+                    func(*args, **kwargs)
+            except PrefetchSkipped:
+                continue
+            except Exception as e:
+                logger.debug(f"Prefetch of {func.__name__} failed: {e}")
+            last_request = time.monotonic()
+
+
+def prefetch_after_collection(
+    bgg,
+    game_ids,
+    user_name=None,
+    games_cache=None,
+    plays_index_path=PLAYS_INDEX_PATH,
+):
+    """Schedule the requests of the stages after the collection.
+
+    Does nothing unless a Prefetcher runs, or when serving from cache.
+
+    Args:
+        bgg: BGGClient the stages use
+        game_ids: Ids of the collection, as passed to ``get_games``
+        user_name: BGG username, defaults to the configured user
+        games_cache: GameMetadataCache passed to ``get_games``
+        plays_index_path: Plays index the plays stage updates
+
+    Returns:
+        Number of scheduled requests
+    """
+    prefetcher = get_prefetcher()
+    if prefetcher is None or get_mode() == "cached":
+        return 0
+    user_name = user_name or conf["user_name"]
+
+    # Same batches as get_games, so the requests match
+    missing_ids = game_ids if games_cache is None else games_cache.missing(game_ids)
+    batches = [missing_ids[i : i + 20] for i in range(0, len(missing_ids), 20)]
+    for batch in batches:
+        prefetcher.schedule(THING_PRIORITY, bgg.game_list_content, batch)
+    mindate = get_plays_mindate(load_plays_index(plays_index_path))
+    # Not retried here, the plays stage retries failed requests itself
+    prefetcher.schedule(PLAYS_PRIORITY, request_plays_page, user_name, mindate, 1)
+    prefetcher.schedule(USER_PRIORITY, bgg.get_user_id, user_name)
+    scheduled = len(batches) + 2
+    logger.info(f"Scheduled {scheduled} prefetch requests")
+    return scheduled
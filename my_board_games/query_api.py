@@ -0,0 +1,260 @@
+"""Local HTTP/JSON query service over the suggested players table."""
+
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from my_board_games.get_suggested_players import (
+    HEAVY_WEIGHT,
+    LIGHT_WEIGHT,
+    LONG_PLAYINGTIME,
+    SHORT_PLAYINGTIME,
+    get_averageweight,
+)
+
+RECORD_COLUMNS = [
+    "id",
+    "name",
+    "players",
+    "best_player_count",
+    "is_best_player",
+    "playingtime",
+    "averageweight",
+    "average_rating",
+    "rating",
+    "numplays",
+    "days_since_last_played",
+    "marketplace_price",
+    "thumbnail",
+    "url",
+]
+SORT_KEYS = [
+    "average_rating",
+    "rating",
+    "playingtime",
+    "averageweight",
+    "days_since_last_played",
+    "numplays",
+    "name",
+]
+
+
+class QueryError(ValueError):
+    """Exception raised for invalid query parameters."""
+
+    pass
+
+
+def get_time_bucket(playingtime):
+    return np.where(
+        playingtime < SHORT_PLAYINGTIME,
+        "short",
+        np.where(playingtime >= LONG_PLAYINGTIME, "long", "medium"),
+    )
+
+
+def get_weight_bucket(weight):
+    return np.where(
+        weight < LIGHT_WEIGHT,
+        "light",
+        np.where(weight >= HEAVY_WEIGHT, "heavy", "medium"),
+    )
+
+
+class SuggestedPlayersIndex:
+    """Suggested players rows with precomputed filter masks and sort orders."""
+
+    def __init__(self, suggested_players):
+        """Build the indexes.
+
+        Args:
+            suggested_players: Output of ``get_suggested_players``, as a DataFrame
+                or as the records loaded from data/suggested_players.json
+        """
+        frame = pd.DataFrame(suggested_players).reset_index(drop=True)
+        frame["averageweight"] = get_averageweight(frame)
+        for column in RECORD_COLUMNS:
+            if column not in frame.columns:
+                frame[column] = None
+        frame = frame[RECORD_COLUMNS]
+        self.records = json.loads(frame.to_json(orient="records"))
+
+        self.players = frame["players"].to_numpy(dtype=int)
+        self.playingtime = frame["playingtime"].to_numpy(dtype=float)
+        self.masks = {
+            "best": frame["is_best_player"].fillna(False).to_numpy(dtype=bool),
+            "for_sale": pd.to_numeric(frame["marketplace_price"], errors="coerce")
+            .notna()
+            .to_numpy(),
+        }
+        time_bucket = get_time_bucket(self.playingtime)
+        weight_bucket = get_weight_bucket(frame["averageweight"].to_numpy(dtype=float))
+        self.buckets = {
+            "time": {b: time_bucket == b for b in ["short", "medium", "long"]},
+            "weight": {b: weight_bucket == b for b in ["light", "medium", "heavy"]},
+        }
+        self.by_players = {
+            int(players): self.players == players for players in np.unique(self.players)
+        }
+        self.orders = {}
+        for key in SORT_KEYS:
+            values = frame[key]
+            if key != "name":
+                values = pd.to_numeric(values, errors="coerce")
+            # NaN sort last in both directions
+            self.orders[key] = (
+                values.sort_values(kind="mergesort", na_position="last").index.to_numpy(),
+                values.sort_values(
+                    ascending=False, kind="mergesort", na_position="last"
+                ).index.to_numpy(),
+            )
+
+    @classmethod
+    def from_json(cls, path="data/suggested_players.json"):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def query(
+        self,
+        players=None,
+        max_time=None,
+        min_time=None,
+        time=None,
+        weight=None,
+        best=None,
+        for_sale=None,
+        sort="average_rating",
+        descending=True,
+        limit=None,
+    ):
+        """Return the rows matching all given filters.
+
+        Args:
+            players: Player count the game must support
+            max_time: Maximum playing time in minutes
+            min_time: Minimum playing time in minutes
+            time: Playing time bucket, one of short, medium, long
+            weight: Weight bucket, one of light, medium, heavy
+            best: Whether the player count must (or must not) be the best one
+            for_sale: Whether the game must (or must not) be listed for sale
+            sort: Column to sort by, one of SORT_KEYS
+            descending: Sort direction
+            limit: Maximum number of rows returned
+
+        Returns:
+            List of row dicts
+
+        Raises:
+            QueryError: If a bucket or sort key is unknown
+        """
+        mask = np.ones(len(self.records), dtype=bool)
+        if players is not None:
+            if players not in self.by_players:
+                return []
+            mask &= self.by_players[players]
+        if max_time is not None:
+            mask &= self.playingtime <= max_time
+        if min_time is not None:
+            mask &= self.playingtime >= min_time
+        for kind, bucket in [("time", time), ("weight", weight)]:
+            if bucket is not None:
+                if bucket not in self.buckets[kind]:
+                    raise QueryError(f"Unknown {kind} bucket '{bucket}'")
+                mask &= self.buckets[kind][bucket]
+        for name, flag in [("best", best), ("for_sale", for_sale)]:
+            if flag is not None:
+                mask &= self.masks[name] if flag else ~self.masks[name]
+        if sort not in self.orders:
+            raise QueryError(f"Unknown sort key '{sort}'")
+
+        order = self.orders[sort][1 if descending else 0]
+        positions = order[mask[order]][:limit]
+        return [self.records[i] for i in positions]
+
+
+def parse_query(query_string):
+    """Convert URL query parameters into ``SuggestedPlayersIndex.query`` kwargs."""
+    params = {k: v[-1] for k, v in parse_qs(query_string).items()}
+    kwargs = {}
+    try:
+        for key in ["players", "max_time", "min_time", "limit"]:
+            if key in params:
+                kwargs[key] = int(params.pop(key))
+    except ValueError as e:
+        raise QueryError(str(e)) from e
+    for key in ["best", "for_sale", "descending"]:
+        if key in params:
+            kwargs[key] = params.pop(key).lower() in ("1", "true", "yes")
+    for key in ["time", "weight", "sort"]:
+        if key in params:
+            kwargs[key] = params.pop(key)
+    if params:
+        raise QueryError(f"Unknown parameters: {sorted(params)}")
+    return kwargs
+
+
+def parse_recommend_query(query_string):
+    """Convert URL query parameters into ``Recommender.recommend`` kwargs."""
+    params = {k: v[-1] for k, v in parse_qs(query_string).items()}
+    kwargs = {}
+    try:
+        for key, convert in [("players", int), ("max_time", int), ("weight", float), ("k", int)]:
+            if key in params:
+                kwargs[key] = convert(params.pop(key))
+    except ValueError as e:
+        raise QueryError(str(e)) from e
+    if "players" not in kwargs:
+        raise QueryError("Missing parameter: players")
+    if params:
+        raise QueryError(f"Unknown parameters: {sorted(params)}")
+    return kwargs
+
+
+def make_server(index, host="127.0.0.1", port=8765, recommender=None):
+    """Create an HTTP server answering ``GET /games?...`` from the index.
+
+    With a recommender, ``GET /recommend?players=...`` is answered too.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/games":
+                query = index.query
+                parse = parse_query
+            elif url.path == "/recommend" and recommender is not None:
+                query = recommender.recommend
+                parse = parse_recommend_query
+            else:
+                self._send(404, {"error": "Not found"})
+                return
+            try:
+                games = query(**parse(url.query))
+            except QueryError as e:
+                self._send(400, {"error": str(e)})
+                return
+            self._send(200, {"count": len(games), "games": games})
+
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+if __name__ == "__main__":
+    server = make_server(SuggestedPlayersIndex.from_json())
+    host, port = server.server_address
+    logger.info(f"Serving suggested players on http://{host}:{port}/games")
+    server.serve_forever()
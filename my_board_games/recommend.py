@@ -0,0 +1,104 @@
+"""Rank what to play tonight from the suggested players table."""
+
+import numpy as np
+import pandas as pd
+
+from my_board_games.query_api import QueryError, SuggestedPlayersIndex
+from my_board_games.settings import conf
+
+UNPLAYED_HORIZON = 365  # days after which a game counts as fully unplayed
+MAX_WEIGHT_DISTANCE = 4  # BGG weights range from 1 to 5
+
+# Features are scaled to [0, 1], the score is their weighted sum
+FEATURES = ["best", "average_rating", "rating", "unplayed", "weight_match"]
+
+
+class Recommender:
+    """Vectorized top-k scoring over a SuggestedPlayersIndex.
+
+    Feature arrays are computed once, so a query only gathers the rows of a
+    player count, masks them by time and runs a partial sort.
+    """
+
+    def __init__(self, index, weights=None):
+        """Precompute the feature arrays.
+
+        Args:
+            index: SuggestedPlayersIndex to recommend from
+            weights: Dict of feature weights, defaults to conf["recommend_weights"]
+        """
+        self.index = index
+        self.weights = {**conf["recommend_weights"], **(weights or {})}
+        frame = pd.DataFrame(index.records)
+        average_rating = pd.to_numeric(frame["average_rating"], errors="coerce")
+        # Without a personal rating, assume the BGG average
+        rating = pd.to_numeric(frame["rating"], errors="coerce").fillna(average_rating)
+        days = pd.to_numeric(frame["days_since_last_played"], errors="coerce")
+        self.averageweight = pd.to_numeric(frame["averageweight"], errors="coerce").to_numpy(
+            dtype=float
+        )
+        self.features = {
+            "best": index.masks["best"].astype(float),
+            "average_rating": (average_rating.fillna(0) / 10).to_numpy(dtype=float),
+            "rating": (rating.fillna(0) / 10).to_numpy(dtype=float),
+            # Never played games count as unplayed for the whole horizon
+            "unplayed": (days / UNPLAYED_HORIZON).clip(0, 1).fillna(1).to_numpy(dtype=float),
+        }
+        self.base_scores = self.get_base_scores(self.weights)
+        self.positions = {
+            players: np.flatnonzero(mask) for players, mask in index.by_players.items()
+        }
+
+    @classmethod
+    def from_json(cls, path="data/suggested_players.json", weights=None):
+        return cls(SuggestedPlayersIndex.from_json(path), weights)
+
+    def get_base_scores(self, weights):
+        unknown = set(weights) - set(FEATURES)
+        if unknown:
+            raise QueryError(f"Unknown features: {sorted(unknown)}")
+        scores = np.zeros(len(self.index.records))
+        for feature, values in self.features.items():
+            scores += weights.get(feature, 0) * values
+        return scores
+
+    def recommend(self, players, max_time=None, weight=None, k=5, weights=None):
+        """Return the k best scored games for a player count.
+
+        Args:
+            players: Number of players
+            max_time: Maximum playing time in minutes
+            weight: Preferred BGG weight (1-5), games closer to it score higher
+            k: Number of games returned
+            weights: Feature weights overriding the recommender's for this query
+
+        Returns:
+            List of row dicts with a score, best first
+
+        Raises:
+            QueryError: If a feature is unknown
+        """
+        positions = self.positions.get(players)
+        if positions is None:
+            return []
+        weights = {**self.weights, **weights} if weights else self.weights
+        base_scores = self.base_scores if weights is self.weights else self.get_base_scores(weights)
+
+        if max_time is not None:
+            positions = positions[self.index.playingtime[positions] <= max_time]
+        scores = base_scores[positions]
+        if weight is not None:
+            distance = np.abs(self.averageweight[positions] - weight) / MAX_WEIGHT_DISTANCE
+            # Unknown weights match neither well nor badly
+            match = np.nan_to_num(1 - distance, nan=0.5)
+            scores = scores + weights.get("weight_match", 0) * match
+
+        if k < len(scores):
+            top = np.argpartition(-scores, k)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            {**self.index.records[p], "score": round(float(s), 4)}
+            for p, s in zip(positions[top], scores[top])
+        ]
@@ -0,0 +1,237 @@
+"""Circuit breakers and a run-wide deadline for calls to BGG."""
+
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+from loguru import logger as default_logger
+
+FAILURE_THRESHOLD = 5  # consecutive failures that open a breaker
+RESET_TIMEOUT = 300  # seconds an open breaker rejects calls before a trial call
+
+
+class BGGUnavailableError(Exception):
+    """Exception raised when BGG is treated as unavailable and calls fail fast."""
+
+    pass
+
+
+class CircuitOpenError(BGGUnavailableError):
+    """Exception raised when the breaker of an endpoint family is open."""
+
+    pass
+
+
+class DeadlineExceededError(BGGUnavailableError):
+    """Exception raised when the run-wide time budget is spent."""
+
+    pass
+
+
+class CircuitBreaker:
+    """Open after consecutive failures, then let one trial call through."""
+
+    def __init__(self, name, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may be made now."""
+        with self._lock:
+            if self.opened_at is None:
+                return
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                raise CircuitOpenError(f"Circuit for BGG {self.name} is open")
+            # Half open: let this call through, and reopen for the others
+            self.opened_at = time.monotonic()
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    default_logger.warning(f"Opening circuit for BGG {self.name}")
+                self.opened_at = time.monotonic()
+
+
+class Deadline:
+    """Time budget shared by every call in a run."""
+
+    def __init__(self, budget=None):
+        """Initialize the deadline.
+
+        Args:
+            budget: Seconds from now, or None for no deadline
+        """
+        self.expires_at = None if budget is None else time.monotonic() + budget
+
+    def remaining(self):
+        if self.expires_at is None:
+            return None
+        return max(self.expires_at - time.monotonic(), 0)
+
+    def check(self):
+        if self.remaining() == 0:
+            raise DeadlineExceededError("Run deadline for BGG requests exceeded")
+
+    def timeout(self, timeout):
+        """Cap a request timeout by the remaining budget."""
+        self.check()
+        remaining = self.remaining()
+        return timeout if remaining is None else min(timeout, remaining)
+
+    def sleep(self, seconds):
+        """Sleep, failing fast if the budget runs out first."""
+        remaining = self.remaining()
+        if remaining is not None and remaining <= seconds:
+            raise DeadlineExceededError("Run deadline for BGG requests exceeded")
+        time.sleep(seconds)
+
+
+class RateLimiter:
+    """Space out the calls of every thread by a minimum interval."""
+
+    def __init__(self, interval=None):
+        """Initialize the rate limiter.
+
+        Args:
+            interval: Minimum seconds between two calls, or None for no limit
+        """
+        self.interval = interval
+        self._next_call = float("-inf")
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Sleep until this call's turn, failing fast if the deadline runs out first."""
+        if self.interval is None:
+            return
+        with self._lock:
+            now = time.monotonic()
+            call_at = max(now, self._next_call)
+            self._next_call = call_at + self.interval
+        if call_at > now:
+            get_deadline().sleep(call_at - now)
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+_deadline = Deadline()
+_rate_limiter = RateLimiter()
+_state = threading.local()
+
+
+def get_breaker(family):
+    """Return the circuit breaker of an endpoint family (thing, plays, ...)."""
+    with _breakers_lock:
+        if family not in _breakers:
+            _breakers[family] = CircuitBreaker(family)
+        return _breakers[family]
+
+
+def get_deadline():
+    return _deadline
+
+
+def set_deadline(budget):
+    """Start the run-wide deadline, budget in seconds or None to disable it."""
+    global _deadline
+    _deadline = Deadline(budget)
+    return _deadline
+
+
+def get_rate_limiter():
+    return _rate_limiter
+
+
+def set_rate_limit(interval):
+    """Space out all BGG requests by ``interval`` seconds, or None to disable it."""
+    global _rate_limiter
+    _rate_limiter = RateLimiter(interval)
+    return _rate_limiter
+
+
+def reset():
+    """Close all breakers and remove the deadline and the rate limit."""
+    global _deadline, _rate_limiter
+    with _breakers_lock:
+        _breakers.clear()
+    _deadline = Deadline()
+    _rate_limiter = RateLimiter()
+
+
+@contextmanager
+def speculative():
+    """Keep the results of calls made in this thread out of the breakers.
+
+    Used for prefetched requests, so their failures never open a circuit
+    for the stages.
+    """
+    previous = getattr(_state, "speculative", False)
+    _state.speculative = True
+    try:
+        yield
+    finally:
+        _state.speculative = previous
+
+
+def guarded_get(family, url, session=requests, timeout=15, **kwargs):
+    """GET a url through the family's breaker, the rate limit and the run deadline.
+
+    Connection errors, 429 and 5xx responses count as failures of the family,
+    except for speculative calls.
+    """
+    breaker = get_breaker(family)
+    breaker.before_call()
+    record = not getattr(_state, "speculative", False)
+    get_rate_limiter().wait()
+    try:
+        response = session.get(url, timeout=get_deadline().timeout(timeout), **kwargs)
+        if response.status_code == 429 or response.status_code >= 500:
+            response.raise_for_status()
+    except requests.exceptions.RequestException:
+        if record:
+            breaker.record_failure()
+        raise
+    if record:
+        breaker.record_success()
+    return response
+
+
+def retry(tries=10, delay=3, backoff=2, logger=default_logger):
+    """Retry a function like ``retry.retry``, but fail fast when BGG is unavailable.
+
+    Open circuits and the run deadline are not retried, and backoff sleeps
+    never outlast the deadline.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            current_delay = delay
+            for attempt in range(1, tries + 1):
+                try:
+                    return func(*args, **kwargs)
+                except BGGUnavailableError:
+                    raise
+                except Exception as e:
+                    if attempt == tries:
+                        raise
+                    if logger is not None:
+                        logger.warning(f"{e}, retrying in {current_delay} seconds...")
+                    get_deadline().sleep(current_delay)
+                    current_delay *= backoff
+
+        return wrapper
+
+    return decorator
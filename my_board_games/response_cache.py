@@ -0,0 +1,220 @@
+"""On-disk cache of raw BGG responses, for stale-while-revalidate runs."""
+
+import hashlib
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+from my_board_games.outputs import write_atomic
+from my_board_games.resilience import BGGUnavailableError, guarded_get
+
+RESPONSES_DIR = "data/cache/responses"
+RESPONSES_MAX_AGE = 30 * 24 * 60 * 60  # seconds before an unused response is removed
+# Query parameters that move between runs, a response for newer values
+# supersedes the stored ones
+MOVING_PARAMS = ("mindate",)
+
+
+class CacheMissError(BGGUnavailableError):
+    """Exception raised when a response is only allowed from cache and is missing."""
+
+    pass
+
+
+class CachedResponse:
+    """Stand-in for requests.Response built from a cached body."""
+
+    status_code = 200
+
+    def __init__(self, content):
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        pass
+
+
+def request_key(url, params=None):
+    """Return the key of a request, the same for equal query parameters in any order."""
+    return json.dumps([url, sorted((params or {}).items())], default=str)
+
+
+def slot_key(url, params=None):
+    """Return the key shared by requests differing only in ``MOVING_PARAMS``."""
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query), **(params or {}))
+    for param in MOVING_PARAMS:
+        query.pop(param, None)
+    return request_key(parts._replace(query="").geturl(), query)
+
+
+def digest(key):
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+class ResponseCache:
+    """Raw response bodies keyed by url and query parameters.
+
+    Only the latest response per endpoint, user and other fixed query
+    parameters is kept, see ``MOVING_PARAMS``, and ``prune`` removes
+    responses older than ``max_age``.
+    """
+
+    def __init__(self, path=RESPONSES_DIR, max_age=RESPONSES_MAX_AGE):
+        self.path = Path(path)
+        self.max_age = max_age
+
+    def _file(self, url, params):
+        slot = digest(slot_key(url, params))[:16]
+        return self.path / f"{slot}-{digest(request_key(url, params))}.json"
+
+    def load(self, url, params=None):
+        """Return (fetched_at, content) or None."""
+        cache_file = self._file(url, params)
+        if not cache_file.exists():
+            return None
+        entry = json.loads(cache_file.read_text())
+        return entry["fetched_at"], entry["content"].encode("utf-8")
+
+    def store(self, url, params, content):
+        """Store a response, removing the ones it supersedes."""
+        cache_file = self._file(url, params)
+        entry = {
+            "url": url,
+            "params": params,
+            "fetched_at": time.time(),
+            "content": content.decode("utf-8"),
+        }
+        write_atomic(cache_file, json.dumps(entry))
+        slot = cache_file.name.split("-")[0]
+        for superseded in self.path.glob(f"{slot}-*.json"):
+            if superseded != cache_file:
+                superseded.unlink(missing_ok=True)
+
+    def prune(self):
+        """Remove responses stored more than ``max_age`` seconds ago.
+
+        Returns:
+            Number of removed responses
+        """
+        if not self.path.exists():
+            return 0
+        expired_before = time.time() - self.max_age
+        removed = 0
+        for cache_file in self.path.glob("*.json"):
+            if cache_file.stat().st_mtime < expired_before:
+                cache_file.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+
+_state = threading.local()
+_prefetcher = None
+
+
+def get_prefetcher():
+    """Return the running Prefetcher, see ``my_board_games.prefetch``."""
+    return _prefetcher
+
+
+def set_prefetcher(prefetcher):
+    global _prefetcher
+    _prefetcher = prefetcher
+
+
+def get_mode():
+    """Return the current thread's mode: "direct" (default), "store" or "cached"."""
+    return getattr(_state, "mode", "direct")
+
+
+def get_response_cache():
+    return getattr(_state, "cache", None) or ResponseCache()
+
+
+@contextmanager
+def response_mode(mode, cache=None):
+    """Use cached responses only ("cached") or fetch and store them ("store").
+
+    Outside of this context manager responses are neither read nor stored.
+
+    The mode applies to the current thread. Yields the freshness record of
+    the responses used, see ``record_freshness``. Entering "store" mode
+    prunes expired responses.
+    """
+    if mode == "store":
+        (cache or ResponseCache()).prune()
+    previous = (get_mode(), getattr(_state, "cache", None), getattr(_state, "freshness", None))
+    _state.mode, _state.cache, _state.freshness = mode, cache, {}
+    try:
+        yield _state.freshness
+    finally:
+        _state.mode, _state.cache, _state.freshness = previous
+
+
+def record_freshness(source, fetched_at, from_cache):
+    """Remember the oldest response used per source in the current mode."""
+    freshness = getattr(_state, "freshness", None)
+    if freshness is None:
+        return
+    entry = freshness.setdefault(source, {"fetched_at": fetched_at, "from_cache": from_cache})
+    entry["fetched_at"] = min(entry["fetched_at"], fetched_at)
+    entry["from_cache"] = entry["from_cache"] or from_cache
+
+
+def format_freshness(freshness):
+    """Return the freshness record with ISO timestamps, for data/freshness.json."""
+    return {
+        source: {
+            "fetched_at": datetime.fromtimestamp(entry["fetched_at"], timezone.utc).isoformat(),
+            "from_cache": entry["from_cache"],
+        }
+        for source, entry in sorted(freshness.items())
+    }
+
+
+def cached_get(family, url, session=None, timeout=15, params=None, **kwargs):
+    """GET a url through ``guarded_get``, reading or filling the response cache.
+
+    In "cached" mode the response comes from the cache only. In "store"
+    mode successful responses are fetched and stored. In "direct" mode the
+    cache is not used. While a Prefetcher runs, a response it already
+    requested is used instead of a new request.
+
+    Raises:
+        CacheMissError: In "cached" mode, if the response was never stored
+    """
+    mode = get_mode()
+    cache = get_response_cache()
+    if mode == "cached":
+        cached = cache.load(url, params)
+        if cached is None:
+            raise CacheMissError(f"No cached BGG {family} response for {url}")
+        fetched_at, content = cached
+        record_freshness(family, fetched_at, from_cache=True)
+        return CachedResponse(content)
+
+    if session is not None:
+        kwargs["session"] = session
+
+    def fetch():
+        return guarded_get(family, url, timeout=timeout, params=params, **kwargs)
+
+    prefetcher = get_prefetcher()
+    if prefetcher is None:
+        response = fetch()
+    else:
+        response = prefetcher.get(request_key(url, params), fetch)
+    if mode == "store" and response.status_code == 200:
+        cache.store(url, params, response.content)
+        record_freshness(family, time.time(), from_cache=False)
+    return response
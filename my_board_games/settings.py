@@ -1,5 +1,29 @@
 conf = {
     "user_name": "nraw",
+    # Run the pipeline for every user listed here instead of only user_name
+    "users": [],
+    # Download thumbnails into data/thumbnails instead of linking BGG's CDN
+    "mirror_thumbnails": False,
+    # SQLite store the fetch stages upsert into, None to disable it
+    "store_path": "data/store.sqlite",
+    # Feature weights of the "what to play tonight" score, see recommend.py
+    "recommend_weights": {
+        "best": 1.0,
+        "average_rating": 0.5,
+        "rating": 1.0,
+        "unplayed": 1.0,
+        "weight_match": 1.0,
+    },
+    # Also fetch owned expansions and write data/expansions.json
+    "expansion_graph": False,
+    # Processes parsing large BGG responses, None for one per core, 0 for none
+    "parse_workers": None,
+    # Request data for later stages in the background once the collection is known
+    "prefetch": True,
+    # Minimum seconds between two BGG requests, prefetched or not
+    "request_interval": 0.2,
+    # Seconds a fetch run may spend on BGG before failing fast
+    "deadline": 60 * 60,
     "exclude_list": [
         161936,  # Pandemic Legacy S1
         221107,  # Pandemic Legacy S2
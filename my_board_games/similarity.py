@@ -0,0 +1,122 @@
+"""Similar games from mechanics, categories, designers and families."""
+
+import numpy as np
+import scipy.sparse as sp
+
+from my_board_games.bgg_api import LINK_TYPES
+
+
+def get_feature_matrix(games):
+    """Build L2-normalized TF-IDF rows of the link features of games.
+
+    Args:
+        games: DataFrame with id and the LINK_TYPES columns, like ``get_games``
+
+    Returns:
+        Tuple of (game ids, feature names, CSR matrix of games by features)
+    """
+    vocabulary = {}
+    rows = []
+    columns = []
+    for key in LINK_TYPES:
+        # Games cached before links were parsed have none
+        values = games[key] if key in games.columns else [None] * len(games)
+        for row, game_values in enumerate(values):
+            for value in game_values if isinstance(game_values, list) else []:
+                columns.append(vocabulary.setdefault(f"{key}:{value}", len(vocabulary)))
+                rows.append(row)
+    shape = (len(games), len(vocabulary))
+    features = sp.csr_matrix((np.ones(len(rows)), (rows, columns)), shape=shape)
+    features.data[:] = 1  # a feature listed twice still counts once
+
+    # Rare features say more about a game than ones most games share
+    document_frequency = np.bincount(features.indices, minlength=shape[1])
+    features = features @ sp.diags(np.log((1 + shape[0]) / (1 + document_frequency)) + 1)
+    norms = np.sqrt(features.multiply(features).sum(axis=1)).A1
+    features = sp.diags(1 / np.where(norms > 0, norms, 1)) @ features
+    return games["id"].to_numpy(dtype=int), list(vocabulary), features.tocsr()
+
+
+class SimilarityIndex:
+    """Cosine similarity between games with the top-k neighbors precomputed."""
+
+    def __init__(self, games, k=10, chunk_size=512):
+        """Compute the neighbors of every game.
+
+        Similarities are computed one chunk of rows at a time, so memory
+        stays at ``chunk_size`` times the number of games.
+
+        Args:
+            games: DataFrame with id, name and the LINK_TYPES columns
+            k: Number of neighbors kept per game
+            chunk_size: Number of rows multiplied at once
+        """
+        self.ids, self.feature_names, self.features = get_feature_matrix(games)
+        self.names = dict(zip(self.ids, games["name"]))
+        self.positions = {game_id: i for i, game_id in enumerate(self.ids)}
+        n = len(self.ids)
+        k = min(k, n - 1) if n else 0
+        self.neighbors = np.zeros((n, k), dtype=np.int32)
+        self.scores = np.zeros((n, k), dtype=np.float32)
+        transposed = self.features.T.tocsc()
+        for start in range(0, n, chunk_size):
+            stop = min(start + chunk_size, n)
+            similarity = (self.features[start:stop] @ transposed).toarray()
+            similarity[np.arange(stop - start), np.arange(start, stop)] = -1  # not itself
+            if k:
+                top = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+            else:
+                top = np.zeros((stop - start, 0), dtype=np.intp)
+            top_scores = np.take_along_axis(similarity, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind="stable")
+            self.neighbors[start:stop] = np.take_along_axis(top, order, axis=1)
+            self.scores[start:stop] = np.take_along_axis(top_scores, order, axis=1)
+
+    def similar(self, game_id, k=None, within=None):
+        """Return the games most similar to a game.
+
+        Args:
+            game_id: BGG id of the game
+            k: Number of games returned, defaults to all cached neighbors
+            within: Only consider these game ids, e.g. the games on the shelf
+
+        Returns:
+            List of (game_id, name, score), most similar first
+        """
+        position = self.positions[game_id]
+        if within is None:
+            neighbors = self.neighbors[position]
+            scores = self.scores[position]
+        else:
+            neighbors = np.array(
+                [self.positions[i] for i in within if i in self.positions and i != game_id],
+                dtype=int,
+            )
+            scores = (self.features[neighbors] @ self.features[position].T).toarray().ravel()
+            order = np.argsort(-scores, kind="stable")
+            neighbors, scores = neighbors[order], scores[order]
+        return [
+            (int(self.ids[p]), self.names[self.ids[p]], round(float(s), 4))
+            for p, s in zip(neighbors[:k], scores[:k])
+            if s > 0
+        ]
+
+    def duplicates(self, threshold=0.95):
+        """Return pairs of game ids whose features are near identical."""
+        pairs = set()
+        rows, columns = np.nonzero(self.scores >= threshold)
+        for row, column in zip(rows, columns):
+            pair = sorted((int(self.ids[row]), int(self.ids[self.neighbors[row, column]])))
+            pairs.add(tuple(pair))
+        return sorted(pairs)
+
+    def to_dict(self):
+        """Return the cached neighbors per game id, for data/similar_games.json."""
+        return {
+            str(game_id): [
+                [int(self.ids[p]), self.names[self.ids[p]], round(float(s), 4)]
+                for p, s in zip(self.neighbors[i], self.scores[i])
+                if s > 0
+            ]
+            for i, game_id in enumerate(self.ids)
+        }
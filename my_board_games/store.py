@@ -0,0 +1,259 @@
+"""Embedded SQLite store of collections, games, polls, plays and listings."""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from my_board_games.settings import conf
+
+STORE_PATH = "data/store.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS collection_items (
+    user_name TEXT NOT NULL,
+    game_id INTEGER NOT NULL,
+    name TEXT,
+    thumbnail TEXT,
+    minplayers INTEGER,
+    maxplayers INTEGER,
+    rating REAL,
+    numplays INTEGER,
+    invlocation TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (user_name, game_id)
+);
+CREATE INDEX IF NOT EXISTS collection_items_game_id ON collection_items (game_id);
+
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    thumbnail TEXT,
+    min_players INTEGER,
+    max_players INTEGER,
+    rating_average REAL,
+    averageweight REAL,
+    playingtime INTEGER,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS poll_results (
+    game_id INTEGER NOT NULL,
+    players TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    best INTEGER NOT NULL,
+    recommended INTEGER NOT NULL,
+    not_recommended INTEGER NOT NULL,
+    PRIMARY KEY (game_id, players)
+);
+
+CREATE TABLE IF NOT EXISTS plays (
+    play_id INTEGER PRIMARY KEY,
+    user_name TEXT NOT NULL,
+    game_id INTEGER NOT NULL,
+    game_name TEXT,
+    date TEXT,
+    quantity INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS plays_user_game_date ON plays (user_name, game_id, date);
+
+CREATE TABLE IF NOT EXISTS listings (
+    product_id INTEGER PRIMARY KEY,
+    user_name TEXT NOT NULL,
+    game_id INTEGER NOT NULL,
+    price REAL,
+    currency TEXT,
+    condition TEXT,
+    link TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS listings_user_game_price ON listings (user_name, game_id, price);
+"""
+
+# Player counts of each game that the poll does not advise against, with
+# the most voted "Best" count (first in poll order on ties). Mirrors
+# get_suggested_players.get_game_player_rows.
+PLAYER_ROWS_QUERY = """
+WITH ranked AS (
+    SELECT
+        game_id,
+        players,
+        ROW_NUMBER() OVER (PARTITION BY game_id ORDER BY best DESC, position) AS rank
+    FROM poll_results
+)
+SELECT
+    g.id,
+    g.name,
+    CAST(p.players AS INTEGER) AS players,
+    r.players AS best_player_count,
+    p.players = r.players AS is_best_player
+FROM json_each(?) AS ids
+JOIN games AS g ON g.id = ids.value
+JOIN poll_results AS p ON p.game_id = g.id
+JOIN ranked AS r ON r.game_id = g.id AND r.rank = 1
+WHERE p.players != ''
+    AND p.players NOT GLOB '*[^0-9]*'
+    AND p.best + p.recommended - p.not_recommended > 0
+ORDER BY ids.key, p.position
+"""
+
+class Store:
+    """Thread-safe SQLite store, upserted into by the fetch stages.
+
+    The database runs in WAL mode, so readers (the query API, ad-hoc
+    queries) are not blocked while a run writes.
+    """
+
+    def __init__(self, path=STORE_PATH):
+        """Initialize the store.
+
+        Args:
+            path: SQLite database file, or ":memory:"
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def execute(self, sql, parameters=()):
+        """Run a query and return all rows as sqlite3.Row objects."""
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    def _write(self, statements):
+        with self._lock, self._connection:
+            for sql, rows in statements:
+                self._connection.executemany(sql, rows)
+
+    def replace_collection(self, user_name, items):
+        """Replace a user's collection with CollectionItem objects."""
+        now = time.time()
+        rows = [
+            (
+                user_name,
+                item.id,
+                item._data["name"],
+                item._data["thumbnail"],
+                item._data["minplayers"],
+                item._data["maxplayers"],
+                item._data["rating"],
+                item._data["numplays"],
+                item._data["invlocation"],
+                now,
+            )
+            for item in items
+        ]
+        self._write(
+            [
+                ("DELETE FROM collection_items WHERE user_name = ?", [(user_name,)]),
+                (
+                    "INSERT INTO collection_items VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                ),
+            ]
+        )
+
+    def upsert_games(self, games):
+        """Insert or update GameData objects and their player count polls."""
+        now = time.time()
+        game_rows = []
+        poll_rows = []
+        for game in games:
+            data = game.data()
+            game_rows.append(
+                (
+                    game.id,
+                    game.name,
+                    game.thumbnail,
+                    game.min_players,
+                    game.max_players,
+                    game.rating_average,
+                    data["stats"].get("averageweight"),
+                    data.get("playingtime"),
+                    json.dumps(data),
+                    now,
+                )
+            )
+            results = data["suggested_players"]["results"]
+            for position, (players, ratings) in enumerate(results.items()):
+                poll_rows.append(
+                    (
+                        game.id,
+                        players,
+                        position,
+                        ratings["best_rating"],
+                        ratings["recommended_rating"],
+                        ratings["not_recommended_rating"],
+                    )
+                )
+        game_ids = [(row[0],) for row in game_rows]
+        self._write(
+            [
+                ("INSERT OR REPLACE INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", game_rows),
+                ("DELETE FROM poll_results WHERE game_id = ?", game_ids),
+                ("INSERT INTO poll_results VALUES (?, ?, ?, ?, ?, ?)", poll_rows),
+            ]
+        )
+
+    def upsert_plays(self, user_name, plays):
+        """Insert or update plays parsed by ``logged_plays.parse_play``."""
+        rows = [
+            (
+                play["play_id"],
+                user_name,
+                play["game_id"],
+                play["game_name"],
+                play["date"],
+                play["quantity"],
+            )
+            for play in plays
+        ]
+        self._write([("INSERT OR REPLACE INTO plays VALUES (?, ?, ?, ?, ?, ?)", rows)])
+
+    def replace_listings(self, user_name, listings):
+        """Replace a user's marketplace listings with ``BGGClient.marketplace_listings``."""
+        now = time.time()
+        rows = [
+            (
+                listing["product_id"],
+                user_name,
+                int(listing["id"]),
+                float(listing["price"]),
+                listing["currency"],
+                listing["condition"],
+                listing["link"],
+                now,
+            )
+            for listing in listings
+        ]
+        self._write(
+            [
+                ("DELETE FROM listings WHERE user_name = ?", [(user_name,)]),
+                ("INSERT OR REPLACE INTO listings VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows),
+            ]
+        )
+
+    def get_player_rows(self, game_ids):
+        """Return the suggested player rows of games, like ``get_player_rows``."""
+        game_ids = json.dumps([int(game_id) for game_id in game_ids])
+        return [
+            {**dict(row), "is_best_player": bool(row["is_best_player"])}
+            for row in self.execute(PLAYER_ROWS_QUERY, (game_ids,))
+        ]
+
+
+def get_store():
+    """Return the configured store, or None if it is disabled."""
+    if not conf["store_path"]:
+        return None
+    return Store(conf["store_path"])
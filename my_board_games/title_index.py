@@ -0,0 +1,125 @@
+"""Local fuzzy index of game titles for offline name matching."""
+
+import json
+import re
+import threading
+import unicodedata
+from collections import Counter
+from pathlib import Path
+
+from my_board_games.outputs import write_atomic
+
+TITLE_INDEX_PATH = "data/cache/titles.json"
+
+
+def normalize(name):
+    """Lowercase, strip accents and punctuation, and collapse whitespace."""
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(c for c in name if not unicodedata.combining(c))
+    name = name.lower().replace("&", " and ")
+    name = re.sub(r"[^\w\s]", " ", name)
+    return " ".join(name.split())
+
+
+def get_trigrams(normalized_name):
+    padded = f"  {normalized_name} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class TitleIndex:
+    """Trigram index from game titles, including alternate names, to BGG ids."""
+
+    def __init__(self, path=TITLE_INDEX_PATH):
+        """Initialize the index.
+
+        Args:
+            path: JSON file the titles are persisted to, or None to keep them in memory
+        """
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._titles = []
+        self._exact = {}
+        self._trigrams = []
+        self._postings = {}
+        if self.path is not None and self.path.exists():
+            for name, game_id in json.loads(self.path.read_text()):
+                self.add(name, game_id)
+
+    def __len__(self):
+        return len(self._titles)
+
+    def save(self):
+        """Persist the titles to disk."""
+        if self.path is None:
+            return
+        with self._lock:
+            write_atomic(self.path, json.dumps(self._titles))
+
+    def add(self, name, game_id):
+        """Index a title for a game id, ignoring titles already indexed."""
+        normalized_name = normalize(name)
+        if not normalized_name:
+            return
+        with self._lock:
+            if normalized_name in self._exact:
+                return
+            position = len(self._titles)
+            self._titles.append((name, game_id))
+            self._exact[normalized_name] = position
+            trigrams = get_trigrams(normalized_name)
+            self._trigrams.append(len(trigrams))
+            for trigram in trigrams:
+                self._postings.setdefault(trigram, []).append(position)
+
+    def add_collection(self, items):
+        """Index the names of CollectionItem objects."""
+        for item in items:
+            self.add(item._data["name"], item.id)
+
+    def add_games(self, games):
+        """Index primary and alternate names of GameData objects."""
+        for game in games:
+            self.add(game.name, game.id)
+            for name in game.alternate_names:
+                self.add(name, game.id)
+
+    def add_search_results(self, results):
+        """Index the results of ``BGGClient.search``."""
+        for result in results:
+            if result["name"]:
+                self.add(result["name"], result["id"])
+
+    def query(self, name, min_score=0.8, limit=1):
+        """Return the best matching titles.
+
+        Scores are the Dice coefficient of the title trigrams, 1.0 for an
+        exact match after normalization.
+
+        Returns:
+            List of (game_id, title, score), best first
+        """
+        normalized_name = normalize(name)
+        with self._lock:
+            position = self._exact.get(normalized_name)
+            if position is not None:
+                title, game_id = self._titles[position]
+                return [(game_id, title, 1.0)]
+
+            trigrams = get_trigrams(normalized_name)
+            overlaps = Counter()
+            for trigram in trigrams:
+                overlaps.update(self._postings.get(trigram, ()))
+            scored = [
+                (2 * overlap / (len(trigrams) + self._trigrams[position]), position)
+                for position, overlap in overlaps.items()
+            ]
+            titles = self._titles
+
+        scored = [s for s in scored if s[0] >= min_score]
+        scored = sorted(scored, key=lambda s: (-s[0], s[1]))[:limit]
+        return [(titles[p][1], titles[p][0], score) for score, p in scored]
+
+    def match(self, name, min_score=0.8):
+        """Return the game id of the best match, or None."""
+        matches = self.query(name, min_score=min_score)
+        return matches[0][0] if matches else None
@@ -0,0 +1,175 @@
+"""Long-running watch mode that keeps data/*.json up to date."""
+
+import json
+import time
+from datetime import date
+from pathlib import Path
+
+from loguru import logger
+
+from my_board_games.bgg_api import BGGClient
+from my_board_games.expansions import get_expansions_cache
+from my_board_games.game_cache import GameMetadataCache
+from my_board_games.get_games import add_numplays, get_games, get_my_games
+from my_board_games.get_marketplace import (
+    add_marketplace_prices,
+    get_marketplace_listings,
+)
+from my_board_games.get_ratings import add_ratings, get_personal_ratings
+from my_board_games.get_suggested_players import get_game_player_rows
+from my_board_games.logged_plays import (
+    add_logged_plays,
+    load_plays_index,
+    refresh_plays_index,
+    save_plays_index,
+)
+from my_board_games.pipeline import add_collection_outputs, write_outputs
+from my_board_games.settings import conf
+from my_board_games.store import get_store
+from my_board_games.title_index import TitleIndex
+
+
+class Watcher:
+    """Poll BGG on a schedule and rebuild outputs only when inputs change.
+
+    One client, the game metadata cache, the plays index and the per-game
+    suggested player rows are kept in memory between polls. Builds run the
+    same stages as ``pipeline.run_pipeline``, so both write the same outputs.
+    """
+
+    def __init__(
+        self,
+        bgg=None,
+        user_name=None,
+        output_dir="data",
+        interval=300,
+        slow_every=12,
+        games_cache=None,
+        title_index=None,
+    ):
+        """Initialize the watcher.
+
+        Args:
+            bgg: BGGClient to reuse, one writing to the configured store is
+                created if not given
+            user_name: BGG username, defaults to the configured user
+            output_dir: Directory the JSON outputs are written to
+            interval: Seconds between polls of the collection and plays
+            slow_every: Ratings and marketplace are polled every this many polls
+            games_cache: GameMetadataCache, a persisted one is used if not given
+            title_index: TitleIndex, a persisted one is used if not given
+        """
+        self.bgg = bgg or BGGClient(store=get_store())
+        self.user_name = user_name
+        self.output_dir = Path(output_dir)
+        self.interval = interval
+        self.slow_every = slow_every
+        self.games_cache = games_cache or GameMetadataCache()
+        self.title_index = TitleIndex() if title_index is None else title_index
+        self.expansions_cache = get_expansions_cache() if conf["expansion_graph"] else None
+        self.plays_index_path = self.output_dir / "plays_index.json"
+        self.plays_index = load_plays_index(self.plays_index_path)
+        self.my_games = None
+        self.ratings = None
+        self.marketplace_listings = None
+        self.player_rows = {}
+        self.built_on = None
+        self.dirty = False
+        self.polls = 0
+
+    def run(self, max_polls=None):
+        """Poll until interrupted, or for max_polls polls."""
+        while max_polls is None or self.polls < max_polls:
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"Poll failed: {e}")
+            time.sleep(self.interval)
+
+    def poll(self):
+        """Fetch what may have changed and rebuild outputs if anything did.
+
+        Returns:
+            True if outputs were rebuilt
+        """
+        is_slow_poll = self.polls % self.slow_every == 0
+        self.polls += 1
+        stages = [self._poll_collection, self._poll_plays]
+        # Slow stages are retried on every poll until they succeeded once
+        if is_slow_poll or self.ratings is None:
+            stages.append(self._poll_ratings)
+        if is_slow_poll or self.marketplace_listings is None:
+            stages.append(self._poll_marketplace)
+        for stage in stages:
+            # A change stays pending until a build succeeds, even if a later
+            # stage or the build fails
+            if stage():
+                self.dirty = True
+        if not (self.dirty or self._is_stale()):
+            logger.info("No changes since last poll")
+            return False
+        self._build()
+        self.dirty = False
+        return True
+
+    def _poll_collection(self):
+        my_games = get_my_games(self.bgg, self.user_name)
+        changed = self.my_games is None or not my_games.equals(self.my_games)
+        self.my_games = my_games
+        return changed
+
+    def _poll_plays(self):
+        before = json.dumps(self.plays_index)
+        self.plays_index = refresh_plays_index(self.plays_index, self.user_name, self.bgg.store)
+        changed = json.dumps(self.plays_index) != before
+        if changed:
+            save_plays_index(self.plays_index, self.plays_index_path)
+        return changed
+
+    def _poll_ratings(self):
+        ratings = get_personal_ratings(self.user_name)
+        changed = ratings != self.ratings
+        self.ratings = ratings
+        return changed
+
+    def _poll_marketplace(self):
+        marketplace_listings = get_marketplace_listings(self.user_name, self.bgg)
+        changed = self.marketplace_listings is None or not marketplace_listings.equals(
+            self.marketplace_listings
+        )
+        self.marketplace_listings = marketplace_listings
+        return changed
+
+    def _is_stale(self):
+        # Days since last played move with the calendar, and cached game
+        # metadata expires, even when nothing was logged on BGG.
+        game_ids = self.my_games.id.to_list()
+        return self.built_on != date.today() or bool(self.games_cache.missing(game_ids))
+
+    def _build(self):
+        game_ids = self.my_games.id.to_list()
+        for game_id in self.games_cache.missing(game_ids):
+            self.player_rows.pop(game_id, None)
+        games = get_games(game_ids, self.bgg, self.games_cache, self.title_index)
+        self.games_cache.save()
+        self.title_index.save()
+        games = add_collection_outputs(
+            games, self.bgg, self.user_name, self.output_dir, self.expansions_cache
+        )
+        games = add_numplays(games, self.my_games)
+        games = add_logged_plays(games, self.plays_index)
+        games = add_ratings(games, self.ratings)
+        games = add_marketplace_prices(games, self.marketplace_listings.copy())
+
+        player_rows = []
+        for _, game in games.iterrows():
+            if game["id"] not in self.player_rows:
+                self.player_rows[game["id"]] = get_game_player_rows(game)
+            player_rows += self.player_rows[game["id"]]
+        write_outputs(games, self.output_dir, player_rows=player_rows)
+        self.built_on = date.today()
+        logger.info("Rebuilt outputs")
+
+
+if __name__ == "__main__":
+    Watcher().run()
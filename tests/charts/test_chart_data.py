@@ -0,0 +1,72 @@
+"""Offline tests for the pre-aggregated chart data."""
+
+import altair as alt
+import pandas as pd
+import pytest
+
+from my_board_games.charts.average_rating_chart import make_average_rating_chart
+from my_board_games.charts.chart_data import get_chart_data
+from my_board_games.make_charts import get_vl_version, make_charts, save_static_chart
+
+
+def make_suggested_players():
+    suggested_players = pd.DataFrame(
+        {
+            "id": [1, 2, 3, 1],
+            "name": ["Azul", "Brass", "Codenames", "Azul"],
+            "short_name": ["Azul", "Brass", "Codenames", "Azul"],
+            "players": [2, 2, 2, 3],
+            "is_best_player": [True, False, True, False],
+            "playingtime": [45, 120, 15, 45],
+            "average_rating": [7.7, 8.6, 7.6, 7.7],
+            "days_since_last_played": [10.0, None, 400.0, 10.0],
+            "last_played": pd.to_datetime(["2024-01-01", None, "2023-01-01", "2024-01-01"]),
+            "url": ["u1", "u2", "u3", "u1"],
+            "stats": [{"ranks": []}] * 4,
+            "suggested_players": [{"results": {}}] * 4,
+        }
+    )
+    return suggested_players
+
+
+def test_get_chart_data_stacks_and_prunes():
+    chart_data = get_chart_data(
+        make_suggested_players(), ["name", "url", "cool_name"], stack_by="playingtime"
+    )
+    assert list(chart_data.columns) == [
+        "players", "name", "url", "cool_name", "playingtime", "y0", "y1"
+    ]
+    assert chart_data.name.tolist() == ["Brass", "Azul", "Codenames", "Azul"]
+    assert chart_data.y0.tolist() == [0, 1, 2, 0]
+    assert chart_data.y1.tolist() == [1, 2, 3, 1]
+    assert chart_data.cool_name.tolist()[:2] == ["Brass", "🔸 Azul"]
+
+
+def test_make_charts(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    make_charts(make_suggested_players())
+    average_chart = (tmp_path / "average_chart.html").read_text()
+    assert "count(id)" not in average_chart
+    assert "suggested_players" not in average_chart
+    assert (tmp_path / "last_played_chart.html").exists()
+
+
+def test_save_static_chart_is_cached(tmp_path, monkeypatch):
+    pytest.importorskip("vl_convert")
+    monkeypatch.chdir(tmp_path)
+    fig = make_average_rating_chart(make_suggested_players())
+
+    paths = save_static_chart(fig, "average_chart", cache_dir=tmp_path / "cache")
+    assert [p.name for p in paths] == ["average_chart.svg", "average_chart.png"]
+    assert (tmp_path / "average_chart.svg").read_text().startswith("<svg")
+    cached = sorted((tmp_path / "cache").iterdir())
+    assert len(cached) == 2
+
+    mtimes = [p.stat().st_mtime_ns for p in cached]
+    save_static_chart(fig, "average_chart", cache_dir=tmp_path / "cache")
+    assert [p.stat().st_mtime_ns for p in cached] == mtimes
+
+
+def test_vl_version():
+    assert get_vl_version("v4.17.0") == "4.17"
+    assert get_vl_version(alt.SCHEMA_VERSION) == "4.17"
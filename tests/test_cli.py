@@ -0,0 +1,59 @@
+"""Tests for the command line entry point and its import cost."""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from my_board_games.cli import main
+
+HEAVY_MODULES = ["pandas", "numpy", "altair", "bs4", "tqdm", "requests"]
+
+
+def import_time(statement):
+    """Best of three cold import times, in seconds, in a fresh interpreter."""
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "print(time.perf_counter() - start)\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    runs = []
+    for _ in range(3):
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout.splitlines()
+        runs.append((float(output[0]), output[1] if len(output) > 1 else ""))
+    return min(runs)
+
+
+def test_cli_import_is_light():
+    _, cli_modules = import_time("import my_board_games.cli")
+    assert cli_modules == ""
+
+
+@pytest.mark.benchmark
+def test_cli_import_time():
+    cli_time, _ = import_time("import my_board_games.cli")
+    pipeline_time, _ = import_time("import my_board_games.pipeline")
+    assert cli_time < pipeline_time / 5
+
+
+def test_metrics_command(tmp_path, capsys):
+    suggested_players = [
+        {
+            "name": "Azul",
+            "is_best_player": True,
+            "last_played": 1700000000000,
+            "days_since_last_played": 10,
+            "marketplace_price": None,
+        }
+    ]
+    (tmp_path / "suggested_players.json").write_text(json.dumps(suggested_players))
+    main(["--output-dir", str(tmp_path), "metrics"])
+
+    metrics = json.loads((tmp_path / "metrics.json").read_text())
+    assert metrics["num_games"] == 1
+    assert json.loads(capsys.readouterr().out) == metrics
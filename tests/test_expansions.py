@@ -0,0 +1,84 @@
+"""Offline tests for the expansion graph."""
+
+import pandas as pd
+
+from my_board_games.bgg_api import CollectionItem, GameData
+from my_board_games.expansions import get_expansion_graph
+from my_board_games.game_cache import GameMetadataCache
+
+
+def make_game(game_id, best_by_players, expansion_ids=()):
+    results = {
+        players: {"best_rating": best, "recommended_rating": 1, "not_recommended_rating": 0}
+        for players, best in best_by_players.items()
+    }
+    data_dict = {
+        "id": game_id,
+        "name": f"Game {game_id}",
+        "thumbnail": None,
+        "minplayers": 1,
+        "maxplayers": 6,
+        "stats": {"average": 7.0},
+        "expansions": [{"id": eid, "name": f"Game {eid}"} for eid in expansion_ids],
+        "suggested_players": {"results": results, "totalvotes": sum(best_by_players.values())},
+        "playingtime": 60,
+    }
+    return GameData.from_data(data_dict)
+
+
+class FakeBGG:
+    def __init__(self, owned_ids, expansions):
+        self.owned_ids = owned_ids
+        self.expansions = {game.id: game for game in expansions}
+        self.thing_calls = []
+
+    def collection(self, user_name, **kwargs):
+        assert kwargs["subtype"] == "boardgameexpansion"
+        return [CollectionItem(id=eid, _data={}) for eid in self.owned_ids]
+
+    def game_list(self, game_ids, item_type):
+        assert item_type == "boardgameexpansion"
+        self.thing_calls.append(list(game_ids))
+        return [self.expansions[gid] for gid in game_ids if gid in self.expansions]
+
+
+def test_expansion_graph():
+    games = pd.DataFrame(
+        [
+            make_game(1, {"2": 10, "3": 4}, expansion_ids=range(100, 130)).data(),
+            make_game(2, {"4": 8}, expansion_ids=[200, 201]).data(),
+            make_game(3, {}).data(),
+        ]
+    )
+    expansions = [make_game(eid, {"2": 1}) for eid in range(100, 130)]
+    expansions += [make_game(200, {"5": 6, "4": 2}), make_game(201, {}), make_game(300, {"1": 1})]
+    bgg = FakeBGG(owned_ids=[101, 200, 201, 300], expansions=expansions)
+    cache = GameMetadataCache(path=None)
+
+    graph = get_expansion_graph(games, bgg, "nraw", cache=cache)
+    # 33 distinct expansions in batches of 20
+    assert [len(batch) for batch in bgg.thing_calls] == [20, 13]
+    assert graph.owned_per_base() == {1: [101], 2: [200, 201]}
+    assert len(graph.not_owned(1)) == 29 and graph.not_owned(2) == []
+    assert graph.unlinked_owned() == [300]
+    assert graph.best_player_count_changes() == [
+        {
+            "id": 2,
+            "name": "Game 2",
+            "expansion_id": 200,
+            "expansion_name": "Game 200",
+            "best_player_count": "4",
+            "expansion_best_player_count": "5",
+        }
+    ]
+    assert len(graph.best_player_count_changes(owned_only=False)) == 1
+
+    # Cached expansions are not fetched again
+    get_expansion_graph(games, bgg, "nraw", cache=cache)
+    assert len(bgg.thing_calls) == 2
+    assert set(graph.to_dict()) == {
+        "owned",
+        "not_owned",
+        "unlinked_owned",
+        "best_player_count_changes",
+    }
@@ -0,0 +1,134 @@
+"""Offline tests for collection exclusions applied before metadata requests."""
+
+import pytest
+
+from my_board_games.bgg_api import parse_collection, parse_things
+from my_board_games.filters import CollectionFilter
+from my_board_games.get_games import get_games, get_my_games
+from my_board_games.settings import conf
+from my_board_games.store import Store
+
+COLLECTION_ITEM = """
+<item objecttype="thing" objectid="{id}" subtype="{subtype}">
+    <name sortindex="1">{name}</name>
+    <stats minplayers="2" maxplayers="4"><rating value="8"><average value="7.5"/></rating></stats>
+    <status own="1"/>
+    <numplays>{id}</numplays>
+    <privateinfo inventorylocation="{location}"/>
+</item>
+"""
+
+THING = """
+<item type="boardgame" id="{id}">
+    <name type="primary" value="{name}"/>
+    <minplayers value="2"/>
+    <maxplayers value="4"/>
+    <statistics><ratings><average value="7.5"/></ratings></statistics>
+</item>
+"""
+
+# id, name, subtype, inventory location
+GAMES = [
+    (1, "Kept Game", "boardgame", ""),
+    (2, "Excluded Game", "boardgame", ""),
+    (3, "Mapped Game", "boardgame", ""),
+    (4, "Lent Game", "boardgame", "Friend's place"),
+    (5, "Expansion", "boardgameexpansion", ""),
+    (6, "Another Kept Game", "boardgame", ""),
+]
+
+
+class FakeBGG:
+    store = None
+    parse_pool = None
+
+    def __init__(self):
+        self.collection_kwargs = None
+        self.thing_ids = []
+
+    def collection(self, **kwargs):
+        self.collection_kwargs = kwargs
+        # BGG drops excluded subtypes on its side
+        excluded = kwargs.get("exclude_subtype", "").split(",")
+        items = [
+            COLLECTION_ITEM.format(id=gid, name=name, subtype=subtype, location=location)
+            for gid, name, subtype, location in GAMES
+            if subtype not in excluded
+        ]
+        return parse_collection(("<items>" + "".join(items) + "</items>").encode())
+
+    def game_list(self, game_ids):
+        self.thing_ids.extend(game_ids)
+        names = {gid: name for gid, name, _, _ in GAMES}
+        things = "".join(THING.format(id=gid, name=names[gid]) for gid in game_ids)
+        return parse_things(("<items>" + things + "</items>").encode())
+
+
+@pytest.fixture(autouse=True)
+def exclusions(monkeypatch):
+    monkeypatch.setitem(conf, "exclude_list", [2])
+    monkeypatch.setitem(conf, "mapping", {"Mapped Game": "Kept Game"})
+
+
+def old_games(bgg):
+    """Collection and metadata as filtered before exclusions were pushed down."""
+    my_games = get_my_games(bgg, "nraw", collection_filter=CollectionFilter(excluded_subtypes=()))
+    my_games = my_games[my_games.subtype != "boardgameexpansion"]
+    my_games = my_games[~my_games.id.isin(conf["exclude_list"])]
+    my_games = my_games[my_games.invlocation.isna() | (my_games.invlocation == "")]
+    games = get_games(my_games.id.to_list(), bgg)
+    return my_games, games
+
+
+def test_same_games_as_filtering_after_fetch():
+    old_bgg = FakeBGG()
+    old_my_games, old_games_frame = old_games(old_bgg)
+
+    bgg = FakeBGG()
+    my_games = get_my_games(bgg, "nraw")
+    games = get_games(my_games.id.to_list(), bgg)
+
+    assert bgg.collection_kwargs["exclude_subtype"] == "boardgameexpansion"
+    assert games.id.to_list() == old_games_frame.id.to_list() == [1, 6]
+    assert games.equals(old_games_frame)
+    assert my_games.drop(columns="subtype").equals(
+        old_my_games[old_my_games.id.isin([1, 6])].drop(columns="subtype")
+    )
+    # No metadata is requested for excluded games
+    assert bgg.thing_ids == [1, 6]
+    assert old_bgg.thing_ids == [1, 3, 6]
+
+
+def test_reasons():
+    items = parse_collection(
+        (
+            "<items>"
+            + "".join(
+                COLLECTION_ITEM.format(id=gid, name=name, subtype=subtype, location=location)
+                for gid, name, subtype, location in GAMES
+            )
+            + "</items>"
+        ).encode()
+    )
+    collection_filter = CollectionFilter.from_conf()
+    assert [collection_filter.reason(item) for item in items] == [
+        None,
+        "excluded id",
+        "mapped name",
+        "inventory location",
+        "subtype",
+        None,
+    ]
+    assert [item.id for item in collection_filter.apply(items)] == [1, 6]
+
+    keep_all = CollectionFilter(excluded_subtypes=(), exclude_inventoried=False)
+    assert keep_all.collection_params == {}
+    assert len(keep_all.apply(items)) == len(items)
+
+
+def test_store_holds_kept_games():
+    bgg = FakeBGG()
+    bgg.store = Store(":memory:")
+    get_my_games(bgg, "nraw")
+    rows = bgg.store.execute("SELECT game_id FROM collection_items ORDER BY game_id")
+    assert [row[0] for row in rows] == [1, 6]
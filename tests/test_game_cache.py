@@ -0,0 +1,68 @@
+"""Offline tests for the shared game metadata cache."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from my_board_games.bgg_api import GameData
+from my_board_games.game_cache import GameMetadataCache
+from my_board_games.title_index import TitleIndex
+
+
+def make_game(game_id, alternate_names=()):
+    data_dict = {
+        "id": game_id,
+        "name": f"Game {game_id}",
+        "thumbnail": None,
+        "minplayers": 1,
+        "maxplayers": 4,
+        "stats": {"average": 7.5},
+        "expansions": [{"id": 1000 + game_id, "name": "Expansion"}],
+        "suggested_players": {"results": {}, "totalvotes": 0},
+        "playingtime": 30,
+    }
+    return GameData.from_data(data_dict, alternate_names)
+
+
+def test_missing_deduplicates_and_skips_cached(tmp_path):
+    games_cache = GameMetadataCache(tmp_path / "games.json")
+    games_cache.add([make_game(1), make_game(2)])
+
+    assert games_cache.missing([1, 3, 2, 3, 4]) == [3, 4]
+    assert [g.id for g in games_cache.get([2, 3, 1])] == [2, 1]
+
+
+def test_expired_games_are_missing(tmp_path):
+    games_cache = GameMetadataCache(tmp_path / "games.json", max_age=-1)
+    games_cache.add([make_game(1)])
+
+    assert games_cache.missing([1]) == [1]
+
+
+def test_cache_persists(tmp_path):
+    games_cache = GameMetadataCache(tmp_path / "games.json")
+    games_cache.add([make_game(1, ["Spiel 1"])])
+    games_cache.save()
+
+    reloaded = GameMetadataCache(tmp_path / "games.json")
+    assert reloaded.missing([1, 2]) == [2]
+    game = reloaded.get([1])[0]
+    assert game == make_game(1, ["Spiel 1"])
+    assert game.rating_average == 7.5
+    # Reloaded games are indexed under their alternate names too
+    title_index = TitleIndex(path=None)
+    title_index.add_games([game])
+    assert title_index.match("Spiel 1") == 1
+
+
+def test_concurrent_saves(tmp_path):
+    path = tmp_path / "expansions.json"
+    games_cache = GameMetadataCache(path)
+
+    def add_and_save(user):
+        for i in range(20):
+            games_cache.add([make_game(user * 100 + i)])
+            games_cache.save()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(add_and_save, range(4)))
+    assert len(GameMetadataCache(path).get(range(400))) == 80
+    assert [p.name for p in tmp_path.iterdir()] == ["expansions.json"]
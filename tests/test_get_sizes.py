@@ -0,0 +1,77 @@
+"""Offline tests for box-size selection."""
+
+from my_board_games.bgg_api import GameData
+from my_board_games.get_sizes import get_shelf_volume, get_versions_table, select_sizes
+
+
+def make_game(game_id, versions):
+    data_dict = {"id": game_id, "name": f"Game {game_id}", "versions": versions}
+    return GameData(
+        id=game_id,
+        name=f"Game {game_id}",
+        thumbnail=None,
+        min_players=1,
+        max_players=4,
+        rating_average=7.0,
+        expansions=[],
+        data_dict=data_dict,
+    )
+
+
+def make_version(item_id, language, width, length, depth):
+    return {
+        "item_id": item_id,
+        "language": language,
+        "width": width,
+        "length": length,
+        "depth": depth,
+    }
+
+
+def test_select_sizes():
+    games = [
+        # English preferred over a larger German version
+        make_game(
+            1,
+            [
+                make_version("a", "German", 12, 12, 4),
+                make_version("b", "English", 10, 10, 3),
+                make_version("c", "English", 11, 10, 3),
+            ],
+        ),
+        # Sized version preferred over unsized English one
+        make_game(
+            2,
+            [
+                make_version("d", "English", 0, 0, 0),
+                make_version("e", "French", 5, 5, 2),
+            ],
+        ),
+        # No sized versions at all
+        make_game(3, [make_version("f", "English", 0, 0, 0)]),
+        # Ties keep the first version
+        make_game(
+            4,
+            [
+                make_version("g", "English", 2, 2, 2),
+                make_version("h", "English", 2, 2, 2),
+            ],
+        ),
+    ]
+    sizes = select_sizes(get_versions_table(games))
+
+    assert sizes.game_id.tolist() == [1, 2, 3, 4]
+    assert sizes.item_id.tolist() == ["c", "e", "f", "g"]
+    assert sizes["size"].tolist() == [330, 50, 0, 8]
+
+    shelf_volume = get_shelf_volume(sizes)
+    assert shelf_volume == {
+        "total_volume": 388,
+        "num_sized_games": 3,
+        "num_unsized_games": 1,
+    }
+
+
+def test_select_sizes_empty():
+    sizes = select_sizes(get_versions_table([make_game(1, [])]))
+    assert sizes.empty
@@ -0,0 +1,57 @@
+"""Offline tests for the suggested players table and site payload."""
+
+import base64
+
+import numpy as np
+import pandas as pd
+
+from my_board_games.get_suggested_players import get_site_payload, get_suggested_players
+
+
+def from_bitset(bitset, length):
+    bits = np.frombuffer(base64.b64decode(bitset), dtype=np.uint8)
+    return np.unpackbits(bits, bitorder="little")[:length].astype(bool).tolist()
+
+
+def make_poll(best_counts):
+    results = {
+        str(n): {"best_rating": votes, "recommended_rating": 1, "not_recommended_rating": 0}
+        for n, votes in best_counts.items()
+    }
+    return {"results": results, "totalvotes": sum(best_counts.values())}
+
+
+def test_get_suggested_players_writes_site_payload(tmp_path):
+    games = pd.DataFrame(
+        {
+            "id": [1, 2, 3],
+            "name": ["Quick", "Heavy", "For sale"],
+            "suggested_players": [
+                make_poll({2: 1, 3: 9}),
+                make_poll({3: 2, 4: 8}),
+                make_poll({2: 5}),
+            ],
+            "stats": [{"averageweight": 1.2}, {"averageweight": 3.1}, {"averageweight": 1.8}],
+            "average_rating": [6.0, 8.0, 7.0],
+            "playingtime": [15, 120, 45],
+            "marketplace_price": [None, None, 20.0],
+        }
+    )
+    suggested_players = get_suggested_players(games, tmp_path)
+    assert (tmp_path / "site_payload.json").exists()
+
+    site_payload = get_site_payload(suggested_players)
+    table = [dict(zip(site_payload["columns"], g)) for g in site_payload["games"]]
+    assert [g["name"] for g in table] == ["Heavy", "For sale", "Quick"]
+    assert site_payload["players"] == {"2": [1, 2], "3": [0, 2], "4": [0]}
+
+    filters = {k: from_bitset(v, 3) for k, v in site_payload["filters"].items()}
+    assert filters == {
+        "short": [False, False, True],
+        "long": [True, False, False],
+        "light": [False, False, True],
+        "heavy": [True, False, False],
+        "forSale": [False, True, False],
+    }
+    assert from_bitset(site_payload["bestPlayer"]["3"], 2) == [False, True]
+    assert from_bitset(site_payload["bestPlayer"]["4"], 1) == [True]
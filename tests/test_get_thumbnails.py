@@ -0,0 +1,66 @@
+"""Offline tests for the thumbnail mirror."""
+
+from io import BytesIO
+
+import pandas as pd
+from PIL import Image
+
+from my_board_games.bgg_api import CollectionItem
+from my_board_games.get_thumbnails import add_thumbnails, get_thumbnails
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self):
+        self.requested = []
+
+    def get(self, url, timeout):
+        self.requested.append(url)
+        output = BytesIO()
+        color = "red" if "red" in url else "blue"
+        Image.new("RGB", (300, 200), color).save(output, format="PNG")
+        return FakeResponse(output.getvalue())
+
+
+def make_item(game_id, url):
+    return CollectionItem(id=game_id, _data={"id": game_id, "thumbnail": url})
+
+
+def test_get_thumbnails_skips_mirrored(tmp_path):
+    items = [
+        make_item(1, "https://cf.geekdo-images.com/red.png"),
+        make_item(2, "https://cf.geekdo-images.com/blue.png"),
+        make_item(3, None),
+    ]
+    session = FakeSession()
+    manifest = get_thumbnails(items, tmp_path, session=session)
+
+    assert sorted(session.requested) == [
+        "https://cf.geekdo-images.com/blue.png",
+        "https://cf.geekdo-images.com/red.png",
+    ]
+    image = manifest["images"]["https://cf.geekdo-images.com/red.png"]
+    with Image.open(tmp_path / image["variants"]["128"]) as img:
+        assert img.format == "WEBP"
+        assert max(img.size) == 128
+
+    items.append(make_item(4, "https://cf.geekdo-images.com/red-copy.png"))
+    session = FakeSession()
+    manifest = get_thumbnails(items, tmp_path, session=session)
+    assert session.requested == ["https://cf.geekdo-images.com/red-copy.png"]
+    # Same content is stored once
+    assert manifest["images"]["https://cf.geekdo-images.com/red-copy.png"] == image
+
+    games = add_thumbnails(pd.DataFrame({"id": [1, 3]}), manifest)
+    assert games.local_thumbnail[0] == "thumbnails/" + image["variants"]["128"]
+    assert pd.isna(games.local_thumbnail[1])
+    # Outputs of one user of several are written to data/<user_name>
+    games = add_thumbnails(pd.DataFrame({"id": [1]}), manifest, output_dir="data/nraw")
+    assert games.local_thumbnail[0] == "../thumbnails/" + image["variants"]["128"]
@@ -0,0 +1,58 @@
+"""Offline tests for the snapshot history."""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from my_board_games.history import History
+
+
+def make_games(average_rating, numplays, rating="N/A", rank=100):
+    stats = {"ranks": [{"name": "boardgame", "value": rank}, {"name": "familygames", "value": 3}]}
+    return pd.DataFrame(
+        {
+            "id": [1, 2],
+            "average_rating": [average_rating, 6.5],
+            "numplays": [numplays, 0],
+            "rating": [rating, None],
+            "stats": [stats, {}],
+        }
+    )
+
+
+def test_records_only_changes(tmp_path):
+    path = tmp_path / "history.npz"
+    history = History(path)
+    day = datetime.date(2024, 3, 1)
+    # Game 1: average_rating, rank and numplays. Game 2: average_rating and numplays
+    assert history.record(make_games(7.5, 3), day) == 5
+    assert history.record(make_games(7.5, 3), day + datetime.timedelta(days=1)) == 0
+    history.save()
+
+    history = History(path)
+    assert history.record(make_games(7.6, 3, rating="8"), day + datetime.timedelta(days=3)) == 2
+    assert history.record(make_games(7.6, 3), day + datetime.timedelta(days=4)) == 1
+    assert len(history) == 8
+
+    ratings = history.series(1, "average_rating")
+    assert ratings.tolist() == [7.5, 7.6]
+    assert ratings.index[0] == pd.Timestamp("2024-03-01")
+    assert history.series(1, "rank").tolist() == [100]
+
+    daily = history.series(1, "rating", daily=True)
+    assert daily.index[-1] == pd.Timestamp("2024-03-05")
+    assert np.isnan(daily.iloc[-1]) and daily.iloc[0] == 8
+    assert history.series(3, "rating").empty
+
+
+def test_missing_value_is_recorded_once(tmp_path):
+    history = History(tmp_path / "history.npz")
+    day = datetime.date(2024, 3, 1)
+    ratings = ["8", "N/A", "N/A", "N/A"]
+    recorded = [
+        history.record(make_games(7.5, 3, rating=rating), day + datetime.timedelta(days=i))
+        for i, rating in enumerate(ratings)
+    ]
+    assert recorded == [6, 1, 0, 0]
+    assert np.isnan(history.series(1, "rating").tolist()[-1])
@@ -0,0 +1,88 @@
+"""Offline tests for lazily parsed game data."""
+
+import time
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from my_board_games.bgg_api import BGGClient, LazyGameData
+
+THING = """
+<item type="boardgame" id="{id}">
+    <thumbnail>https://cf.geekdo-images.com/{id}.jpg</thumbnail>
+    <name type="primary" sortindex="1" value="Game {id}"/>
+    <name type="alternate" sortindex="1" value="Spiel {id}"/>
+    <minplayers value="2"/>
+    <maxplayers value="4"/>
+    <poll name="suggested_numplayers" title="User Suggested Number of Players" totalvotes="12">
+        <results numplayers="2">
+            <result value="Best" numvotes="3"/>
+            <result value="Recommended" numvotes="5"/>
+            <result value="Not Recommended" numvotes="1"/>
+        </results>
+        <results numplayers="4+">
+            <result value="Best" numvotes="0"/>
+            <result value="Recommended" numvotes="0"/>
+            <result value="Not Recommended" numvotes="3"/>
+        </results>
+    </poll>
+    <playingtime value="45"/>
+    <link type="boardgamemechanic" id="2008" value="Trading"/>
+    <link type="boardgameexpansion" id="926" value="Expansion"/>
+    <link type="boardgameexpansion" id="13" value="Base" inbound="true"/>
+    <statistics page="1">
+        <ratings>
+            <usersrated value="100"/>
+            <average value="7.25"/>
+            <bayesaverage value="6.9"/>
+            <stddev value="1.2"/>
+            <median value="0"/>
+            <ranks>
+                <rank type="subtype" id="1" name="boardgame" friendlyname="Board Game Rank" value="42"/>
+            </ranks>
+            <averageweight value="2.3"/>
+        </ratings>
+    </statistics>
+</item>
+"""
+
+
+def parse(item, **kwargs):
+    # Parsing does not need a session
+    bgg = BGGClient.__new__(BGGClient)
+    return bgg._parse_game_data(item, **kwargs)
+
+
+def test_lazy_matches_eager():
+    item = ET.fromstring(THING.format(id=1))
+    eager = parse(item, include_versions=True)
+    lazy = parse(item, include_versions=True, lazy=True)
+    assert isinstance(lazy, LazyGameData)
+    assert (lazy.id, lazy.name, lazy.alternate_names) == (1, "Game 1", ["Spiel 1"])
+    assert "stats" not in vars(lazy)
+
+    assert lazy.data() == eager.data()
+    assert lazy.data() is lazy.data()
+    assert lazy.rating_average == eager.rating_average == 7.25
+    assert lazy.expansions == eager.expansions
+    assert lazy.versions == eager.versions
+    assert parse(item, lazy=True).versions is None
+    assert "versions" not in parse(item, lazy=True).data()
+
+
+@pytest.mark.benchmark
+def test_names_only_is_cheaper():
+    items = ET.fromstring(
+        "<items>" + "".join(THING.format(id=i) for i in range(500)) + "</items>"
+    ).findall("item")
+
+    def best_of_three(**kwargs):
+        runs = []
+        for _ in range(3):
+            start = time.perf_counter()
+            names = [parse(item, **kwargs).name for item in items]
+            runs.append(time.perf_counter() - start)
+        assert len(names) == 500
+        return min(runs)
+
+    assert best_of_three(lazy=True) < best_of_three(include_versions=True) / 2
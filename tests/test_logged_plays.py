@@ -0,0 +1,219 @@
+"""Offline tests for the logged plays index."""
+
+import random
+import xml.etree.ElementTree as ET
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+import requests
+
+from my_board_games import logged_plays, resilience
+from my_board_games.bgg_api import BGGApiError
+from my_board_games.logged_plays import (
+    add_logged_plays,
+    get_plays_index,
+    iter_logged_plays,
+    load_plays_index,
+    parse_play,
+    update_plays_index,
+)
+from my_board_games.response_cache import CacheMissError
+
+
+def make_plays(rows):
+    return pd.DataFrame(
+        rows, columns=["play_id", "date", "quantity", "game_id", "game_name"]
+    )
+
+
+def test_parse_play():
+    play = ET.fromstring(
+        '<play id="99" date="2024-05-01" quantity="2">'
+        '<item name="Azul" objecttype="thing" objectid="230802"/></play>'
+    )
+    assert parse_play(play) == {
+        "play_id": "99",
+        "date": "2024-05-01",
+        "quantity": 2,
+        "game_id": 230802,
+        "game_name": "Azul",
+    }
+
+
+def test_update_plays_index_is_incremental(tmp_path):
+    plays_index = load_plays_index(tmp_path / "missing.json")
+    plays_index = update_plays_index(
+        plays_index,
+        make_plays(
+            [
+                ["1", "2024-01-01", 1, 10, "Azul"],
+                ["2", "2024-01-03", 2, 10, "Azul"],
+                ["3", "2024-01-03", 1, 20, "Welcome Back to the Dungeon"],
+            ]
+        ),
+    )
+    assert plays_index["play_ids_since"] == "2023-12-04"
+    # The overlap window is fetched again, already seen plays must not count twice
+    plays_index = update_plays_index(
+        plays_index,
+        make_plays(
+            [
+                ["2", "2024-01-03", 2, 10, "Azul"],
+                ["3", "2024-01-03", 1, 20, "Welcome Back to the Dungeon"],
+                ["4", "2024-01-03", 1, 10, "Azul"],
+                ["5", "2024-02-01", 1, 30, "Welcome to the Dungeon"],
+            ]
+        ),
+    )
+
+    assert plays_index["games"]["10"] == {
+        "name": "Azul",
+        "last_played": "2024-01-03",
+        "play_count": 3,
+        "quantity": 4,
+    }
+    assert plays_index["latest_date"] == "2024-02-01"
+    assert plays_index["play_ids_since"] == "2024-01-02"
+    assert sorted(plays_index["play_ids"]) == ["2", "3", "4", "5"]
+
+    # A play logged late, dated before the latest play, is still counted
+    plays_index = update_plays_index(
+        plays_index,
+        make_plays(
+            [
+                ["5", "2024-02-01", 1, 30, "Welcome to the Dungeon"],
+                ["6", "2024-01-20", 1, 10, "Azul"],
+                ["4", "2024-01-03", 1, 10, "Azul"],
+            ]
+        ),
+    )
+    assert plays_index["games"]["10"]["play_count"] == 4
+    assert plays_index["games"]["10"]["last_played"] == "2024-01-20"
+    assert plays_index["latest_date"] == "2024-02-01"
+
+
+def test_load_plays_index_before_overlap_window(tmp_path):
+    path = tmp_path / "plays_index.json"
+    path.write_text(
+        '{"games": {}, "latest_date": "2024-01-03", "latest_play_ids": ["2", "3"]}'
+    )
+    plays_index = load_plays_index(path)
+    assert plays_index["play_ids"] == {"2": "2024-01-03", "3": "2024-01-03"}
+    assert plays_index["play_ids_since"] == "2024-01-03"
+
+
+def test_add_logged_plays_joins_on_id():
+    plays_index = {
+        "games": {
+            "10": {"name": "Azul (old name)", "last_played": "2024-01-03"},
+            "20": {"name": "Welcome Back to the Dungeon", "last_played": "2024-03-01"},
+            "30": {"name": "Welcome to the Dungeon", "last_played": "2024-02-01"},
+        },
+        "latest_date": "2024-03-01",
+        "play_ids": {},
+        "play_ids_since": "2024-01-31",
+    }
+    games = pd.DataFrame(
+        {"id": [10, 30, 40], "name": ["Azul", "Welcome to the Dungeon", "Unplayed"]}
+    )
+    games = add_logged_plays(games, plays_index)
+
+    assert games.last_played.dt.strftime("%Y-%m-%d").tolist()[:2] == [
+        "2024-01-03",
+        "2024-03-01",
+    ]
+    assert games.last_played.isna().tolist() == [False, False, True]
+
+
+def random_plays(count, seed=0):
+    rng = random.Random(seed)
+    rows = [
+        [
+            str(play_id),
+            f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            rng.randint(1, 3),
+            (game_id := rng.randint(1, 40)),
+            f"Game {game_id} ({rng.randint(1, 3)})",
+        ]
+        for play_id in range(count)
+    ]
+    # BGG lists the newest plays first
+    return make_plays(sorted(rows, key=lambda row: row[1], reverse=True))
+
+
+def chunks(plays, size):
+    return (plays.iloc[i : i + size] for i in range(0, len(plays), size))
+
+
+@pytest.mark.parametrize("size", [1, 7, 5000])
+def test_chunked_update_matches_whole_frame(size):
+    plays = random_plays(200)
+    old, new = plays.iloc[80:], plays.iloc[:100]
+    expected = update_plays_index(load_plays_index("missing.json"), old)
+    expected = update_plays_index(expected, new)
+
+    plays_index = update_plays_index(load_plays_index("missing.json"), chunks(old, size))
+    plays_index = update_plays_index(plays_index, chunks(new, size))
+    assert plays_index == expected
+
+
+PLAY = '<play id="{id}" date="2024-01-{day:02d}" quantity="1"><item name="Azul" objectid="10"/></play>'
+
+
+def plays_page(ids):
+    plays = "".join(PLAY.format(id=i, day=28 - i // 10) for i in ids)
+    return SimpleNamespace(status_code=200, content=f"<plays>{plays}</plays>".encode())
+
+
+def test_iter_logged_plays_yields_bounded_chunks(monkeypatch):
+    pages = {f"page={n + 1}": range(n * 100, min(n * 100 + 100, 250)) for n in range(3)}
+
+    def fake_get(family, url, headers):
+        page = url.rsplit("&", 1)[-1]
+        return plays_page(pages.get(page, []))
+
+    monkeypatch.setenv("BGG_API_KEY", "key")
+    monkeypatch.setattr(logged_plays, "cached_get", fake_get)
+    plays = list(iter_logged_plays("nraw", chunk_size=60))
+    assert [len(chunk) for chunk in plays] == [60, 60, 60, 60, 10]
+    assert pd.concat(plays).play_id.tolist() == [str(i) for i in range(250)]
+
+
+def test_transient_page_errors_are_retried(tmp_path, monkeypatch):
+    responses = [requests.exceptions.HTTPError("502 Bad Gateway"), plays_page(range(3))]
+
+    def fake_get(family, url, headers):
+        if "page=1" not in url:
+            return plays_page([])
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setenv("BGG_API_KEY", "key")
+    monkeypatch.setattr(logged_plays, "cached_get", fake_get)
+    monkeypatch.setattr(resilience.Deadline, "sleep", lambda self, seconds: None)
+    plays_index = get_plays_index(tmp_path / "plays_index.json", "nraw")
+    assert plays_index["games"]["10"]["play_count"] == 3
+
+
+def test_failed_page_is_not_saved(tmp_path, monkeypatch):
+    pages = [plays_page(range(100)), SimpleNamespace(status_code=401, content=b"")]
+
+    monkeypatch.setenv("BGG_API_KEY", "key")
+    monkeypatch.setattr(logged_plays, "cached_get", lambda family, url, headers: pages.pop(0))
+    with pytest.raises(BGGApiError):
+        get_plays_index(tmp_path / "plays_index.json", "nraw")
+    assert not (tmp_path / "plays_index.json").exists()
+
+
+def test_failing_page_leaves_index_untouched(tmp_path, monkeypatch):
+    def fail_on_second_chunk(user_name, mindate):
+        yield make_plays([["1", "2024-01-01", 1, 10, "Azul"]])
+        raise CacheMissError("plays")
+
+    monkeypatch.setattr(logged_plays, "iter_logged_plays", fail_on_second_chunk)
+    plays_index = get_plays_index(tmp_path / "plays_index.json", "nraw")
+    assert plays_index == load_plays_index(tmp_path / "missing.json")
+    assert not (tmp_path / "plays_index.json").exists()
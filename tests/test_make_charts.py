@@ -1,4 +1,7 @@
-from my_board_games.make_charts import *
+from my_board_games.charts.average_rating_chart import make_average_rating_chart
+from my_board_games.charts.time_since_last_played_chart import (
+    make_time_since_last_played_chart,
+)
 
 
 def test_average_rating_chart():
@@ -0,0 +1,45 @@
+"""Offline tests for name to BGG id resolution."""
+
+from my_board_games.bgg_api import BGGApiError
+from my_board_games.name_resolver import NameResolver
+
+
+class FakeBGG:
+    def __init__(self, exact, fuzzy, failing=()):
+        self.exact = exact
+        self.fuzzy = fuzzy
+        self.failing = failing
+        self.searches = []
+
+    def search(self, query, exact=False):
+        self.searches.append((query, exact))
+        if query in self.failing:
+            raise BGGApiError("BGG is down")
+        results = self.exact if exact else self.fuzzy
+        if query in results:
+            return [{"id": results[query], "name": query, "year": None}]
+        return []
+
+
+def test_resolve_many_caches_hits_and_misses(tmp_path):
+    bgg = FakeBGG(exact={"Azul": 230802}, fuzzy={"Brass": 224517}, failing=["Down"])
+    resolver = NameResolver(bgg, tmp_path / "ids.json")
+
+    ids = resolver.resolve_many(["Azul", "Brass", "Nope", "Azul", "Down"])
+    assert ids == {"Azul": 230802, "Brass": 224517, "Nope": None, "Down": None}
+    assert ("Azul", False) not in bgg.searches
+
+    bgg = FakeBGG(exact={}, fuzzy={})
+    resolver = NameResolver(bgg, tmp_path / "ids.json")
+    ids = resolver.resolve_many(["Azul", "Brass", "Nope", "Down"])
+    assert ids == {"Azul": 230802, "Brass": 224517, "Nope": None, "Down": None}
+    # Only the failed search is retried
+    assert bgg.searches == [("Down", True), ("Down", False)]
+
+
+def test_negative_entries_expire(tmp_path):
+    bgg = FakeBGG(exact={}, fuzzy={})
+    resolver = NameResolver(bgg, None, negative_max_age=-1)
+    resolver.resolve("Nope")
+    resolver.resolve("Nope")
+    assert len(bgg.searches) == 4
@@ -0,0 +1,115 @@
+"""Offline tests for parsing BGG responses in worker processes."""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from my_board_games.bgg_api import BGGItemNotFoundError, parse_collection, parse_things
+from my_board_games.get_games import get_games_in_batches
+from my_board_games.parse_pool import ParsePool
+
+THING = """
+<item type="boardgame" id="{id}">
+    <name type="primary" value="Game {id}"/>
+    <minplayers value="2"/>
+    <maxplayers value="4"/>
+    <playingtime value="30"/>
+    <poll name="suggested_numplayers" totalvotes="3">
+        <results numplayers="2"><result value="Best" numvotes="3"/></results>
+    </poll>
+    <statistics><ratings><average value="7.5"/></ratings></statistics>
+</item>
+"""
+
+COLLECTION = """
+<item objecttype="thing" objectid="{id}" subtype="boardgame">
+    <name sortindex="1">Game {id}</name>
+    <stats minplayers="2" maxplayers="4"><rating value="8"><average value="7.5"/></rating></stats>
+    <status own="1" wishlistpriority="2"/>
+    <numplays>3</numplays>
+</item>
+"""
+
+
+def things(ids):
+    return ("<items>" + "".join(THING.format(id=i) for i in ids) + "</items>").encode()
+
+
+def collection(ids):
+    return ("<items>" + "".join(COLLECTION.format(id=i) for i in ids) + "</items>").encode()
+
+
+def slow_len(content):
+    time.sleep(0.3)
+    return len(content)
+
+
+def test_pool_parses_like_inline():
+    content = things(range(50))
+    with ParsePool(max_workers=2, min_size=0) as pool:
+        assert pool.submit(parse_things, content).result() == parse_things(content)
+        content = collection(range(50))
+        items = pool.submit(parse_collection, content, True).result()
+        assert items == parse_collection(content, True)
+        assert items[0]._data["wishlistpriority"] == 2
+        with pytest.raises(BGGItemNotFoundError):
+            pool.submit(parse_things, b"<error><message>Nope</message></error>").result()
+        # Workers are not forked from the multi-threaded fetch process
+        assert pool._executor._mp_context.get_start_method() != "fork"
+
+
+def test_small_payloads_parse_inline():
+    pool = ParsePool(max_workers=2)
+    future = pool.submit(parse_things, things([1]))
+    assert future.done() and future.result()[0].name == "Game 1"
+    assert pool._executor is None
+    future = pool.submit(parse_things, b"<error/>")
+    assert isinstance(future.exception(), BGGItemNotFoundError)
+
+
+def test_backpressure():
+    with ParsePool(max_workers=1, max_pending=1, min_size=0) as pool:
+        first = pool.submit(slow_len, b"a")
+        start = time.perf_counter()
+        second = pool.submit(slow_len, b"bb")
+        assert time.perf_counter() - start > 0.1
+        assert first.done()
+        assert second.result() == 2
+
+
+def test_pooled_batches():
+    ids = list(range(45))
+    with ParsePool(max_workers=2, min_size=0) as pool:
+        bgg = SimpleNamespace(
+            store=None,
+            parse_pool=pool,
+            game_list_content=lambda batch, item_type="boardgame": things(batch),
+        )
+        games = get_games_in_batches(ids, bgg)
+    assert [game.id for game in games] == ids
+    assert games[0].data()["suggested_players"]["results"]["2"]["best_rating"] == 3
+
+
+def test_failed_parse_is_fetched_again():
+    ids = list(range(30))
+    contents = {0: [b"<items><item", things(range(20))]}
+    game_list_calls = []
+
+    def game_list_content(batch, item_type="boardgame"):
+        pending = contents.get(batch[0])
+        return pending.pop(0) if pending else things(batch)
+
+    def game_list(batch):
+        game_list_calls.append(batch)
+        return parse_things(game_list_content(batch))
+
+    bgg = SimpleNamespace(
+        store=None,
+        parse_pool=ParsePool(max_workers=0),
+        game_list_content=game_list_content,
+        game_list=game_list,
+    )
+    games = get_games_in_batches(ids, bgg)
+    assert [game.id for game in games] == ids
+    assert game_list_calls == [list(range(20))]
@@ -0,0 +1,96 @@
+"""Offline tests for the game night planner."""
+
+import itertools
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from my_board_games.planner import Planner
+from my_board_games.query_api import SuggestedPlayersIndex
+from my_board_games.recommend import Recommender
+
+
+def make_planner(n, seed=0):
+    rng = np.random.default_rng(seed)
+    suggested_players = pd.DataFrame(
+        {
+            "id": range(n),
+            "name": [f"Game {i}" for i in range(n)],
+            "players": rng.integers(3, 5, n),
+            "is_best_player": rng.random(n) < 0.3,
+            "playingtime": rng.choice([15, 20, 30, 45, 60, 90, 120, 180], n),
+            "average_rating": rng.uniform(5, 9, n).round(1),
+            "rating": rng.integers(1, 11, n).astype(str),
+            "days_since_last_played": rng.integers(0, 800, n),
+            "stats": [{"averageweight": w} for w in rng.uniform(1, 5, n).round(2)],
+        }
+    )
+    return Planner(Recommender(SuggestedPlayersIndex(suggested_players)))
+
+
+def brute_force(planner, players, budget, max_per_weight):
+    recommender = planner.recommender
+    positions = recommender.positions[players]
+    best = 0
+    for size in range(1, len(positions) + 1):
+        for plan in itertools.combinations(positions, size):
+            plan = list(plan)
+            if planner.playingtime[plan].sum() > budget:
+                continue
+            if np.bincount(planner.bucket[plan], minlength=3).max() > max_per_weight:
+                continue
+            best = max(best, recommender.base_scores[plan].sum())
+    return best
+
+
+def test_plan_is_optimal():
+    planner = make_planner(24, seed=1)
+    for budget, max_per_weight in [(240, 2), (90, 1), (10, 2)]:
+        plan = planner.plan(4, budget=budget, max_per_weight=max_per_weight)
+        assert plan["total_time"] <= budget
+        # One row per game, so ids are row positions
+        planned = [g["id"] for g in plan["games"]]
+        assert all(np.bincount(planner.bucket[planned]) <= max_per_weight)
+        expected = brute_force(planner, 4, budget, max_per_weight)
+        assert np.isclose(plan["total_score"], expected, atol=1e-3)
+        assert np.isclose(sum(g["score"] for g in plan["games"]), expected, atol=1e-3)
+    assert planner.plan(4, budget=10)["games"] == []
+    assert planner.plan(9)["games"] == []
+
+
+def test_candidates_are_pruned():
+    planner = make_planner(5000)
+    candidates = planner.get_candidates(3, 2)
+    # At most max_per_weight games per bucket and playing time can be planned
+    assert len(candidates) <= 3 * 8 * 2
+    scores = planner.recommender.base_scores
+    positions = planner.recommender.positions[3]
+    positions = positions[(scores[positions] > 0) & (planner.playingtime[positions] > 0)]
+    games = pd.DataFrame(
+        {
+            "position": positions,
+            "bucket": planner.bucket[positions],
+            "playingtime": planner.playingtime[positions],
+            "score": scores[positions],
+        }
+    )
+    best = games.sort_values("score", ascending=False, kind="mergesort")
+    best = best.groupby(["bucket", "playingtime"]).head(2)
+    assert sorted(candidates) == sorted(best.position)
+    assert planner.get_candidates(3, 2) is candidates
+
+    plan = planner.plan(3, budget=240)
+    assert 0 < plan["total_time"] <= 240
+    assert {g["id"] for g in plan["games"]} <= set(candidates)
+
+
+@pytest.mark.benchmark
+def test_plan_latency():
+    planner = make_planner(5000)
+    planner.plan(4)
+    start = time.perf_counter()
+    plan = planner.plan(3, budget=240)
+    assert time.perf_counter() - start < 0.1
+    assert 0 < plan["total_time"] <= 240
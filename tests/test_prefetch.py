@@ -0,0 +1,144 @@
+"""Offline tests for background prefetching of BGG requests."""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from my_board_games import prefetch, resilience
+from my_board_games.prefetch import Prefetcher, prefetch_after_collection
+from my_board_games.response_cache import cached_get, get_prefetcher, response_mode
+
+URL = "https://boardgamegeek.com/xmlapi2/thing"
+
+
+class FakeSession:
+    def __init__(self, delay=0, release=None):
+        self.delay = delay
+        self.release = release
+        self.calls = []
+        self.started = threading.Event()
+
+    def get(self, url, timeout, params=None, **kwargs):
+        self.calls.append(params)
+        self.started.set()
+        if self.release is not None:
+            self.release.wait(5)
+        time.sleep(self.delay)
+        return SimpleNamespace(status_code=200, content=repr(params).encode())
+
+
+def get(session, game_id):
+    return cached_get("thing", URL, session=session, params={"id": game_id})
+
+
+def wait_for(condition):
+    for _ in range(500):
+        if condition():
+            return
+        time.sleep(0.01)
+    raise AssertionError("timed out")
+
+
+def test_prefetched_response_is_used_once():
+    session = FakeSession()
+    with Prefetcher(min_interval=0) as prefetcher:
+        prefetcher.schedule(0, get, session, 1)
+        wait_for(lambda: len(session.calls) == 1)
+        assert get(session, 1).content == b"{'id': 1}"
+        assert len(session.calls) == 1 and prefetcher.hits == 1
+        get(session, 1)
+        assert len(session.calls) == 2
+    assert get_prefetcher() is None
+
+
+def test_waits_for_request_in_flight():
+    session = FakeSession(delay=0.3)
+    with Prefetcher(min_interval=0) as prefetcher:
+        prefetcher.schedule(0, get, session, 1)
+        # The request is running in the background when the stage asks
+        session.started.wait(5)
+        assert get(session, 1).content == b"{'id': 1}"
+        assert len(session.calls) == 1 and prefetcher.hits == 1
+
+
+def test_on_demand_requests_go_first():
+    release = threading.Event()
+    on_demand_session = FakeSession(release=release)
+    prefetch_session = FakeSession()
+    with Prefetcher(max_in_flight=1, min_interval=0) as prefetcher:
+        stage = threading.Thread(target=get, args=(on_demand_session, 1))
+        stage.start()
+        on_demand_session.started.wait(5)
+        prefetcher.schedule(0, get, prefetch_session, 2)
+        time.sleep(0.1)
+        assert prefetch_session.calls == []
+        release.set()
+        stage.join()
+        wait_for(lambda: prefetch_session.calls == [{"id": 2}])
+
+
+def test_requested_on_demand_is_not_prefetched():
+    session = FakeSession()
+    with Prefetcher(min_interval=0) as prefetcher:
+        get(session, 1)
+        prefetcher.schedule(0, get, session, 1)
+        prefetcher.schedule(1, get, session, 2)
+        wait_for(lambda: len(session.calls) == 2)
+        time.sleep(0.05)
+    assert session.calls == [{"id": 1}, {"id": 2}]
+
+
+def test_prefetch_after_collection(monkeypatch):
+    scheduled = []
+    bgg = SimpleNamespace(
+        game_list_content=lambda batch: scheduled.append(("thing", batch)),
+        get_user_id=lambda user_name: scheduled.append(("user", user_name)),
+    )
+    monkeypatch.setattr(
+        prefetch,
+        "request_plays_page",
+        lambda user_name, mindate, page_num: scheduled.append(("plays", mindate)),
+    )
+    game_ids = list(range(45))
+    assert prefetch_after_collection(bgg, game_ids, "nraw") == 0
+
+    with Prefetcher(min_interval=0):
+        with response_mode("cached"):
+            assert prefetch_after_collection(bgg, game_ids, "nraw") == 0
+        assert prefetch_after_collection(bgg, game_ids, "nraw", plays_index_path="none") == 5
+        wait_for(lambda: len(scheduled) == 5)
+    # Thing batches first, the same as get_games requests them
+    assert scheduled == [
+        ("thing", list(range(20))),
+        ("thing", list(range(20, 40))),
+        ("thing", list(range(40, 45))),
+        ("plays", None),
+        ("user", "nraw"),
+    ]
+
+
+class ThrottledSession(FakeSession):
+    def get(self, url, timeout, params=None, **kwargs):
+        self.calls.append(params)
+        response = requests.Response()
+        response.status_code = 429
+        return response
+
+
+def test_prefetching_stops_when_throttled():
+    session = ThrottledSession()
+    with Prefetcher(min_interval=0) as prefetcher:
+        prefetcher.schedule(0, get, session, 1)
+        prefetcher.schedule(1, get, session, 2)
+        wait_for(lambda: len(session.calls) == 1)
+        time.sleep(0.05)
+        assert session.calls == [{"id": 1}]
+        # Prefetched failures leave the breaker to the stages
+        assert resilience.get_breaker("thing").failures == 0
+        with pytest.raises(requests.exceptions.HTTPError):
+            get(session, 1)
+        assert resilience.get_breaker("thing").failures == 1
+    resilience.reset()
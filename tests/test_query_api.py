@@ -0,0 +1,85 @@
+"""Offline tests for the suggested players query service."""
+
+import json
+import threading
+from urllib.request import urlopen
+
+import pandas as pd
+import pytest
+
+from my_board_games.query_api import (
+    QueryError,
+    SuggestedPlayersIndex,
+    make_server,
+    parse_query,
+)
+
+
+@pytest.fixture
+def index():
+    suggested_players = pd.DataFrame(
+        [
+            [1, "Quick", 5, True, 15, 1.2, 6.5, None],
+            [1, "Quick", 4, False, 15, 1.2, 6.5, None],
+            [2, "Medium", 5, False, 45, 1.8, 7.8, 25.0],
+            [3, "Heavy", 5, True, 120, 3.5, 8.2, None],
+            [4, "Unrated", 5, True, 60, None, 7.0, None],
+        ],
+        columns=[
+            "id",
+            "name",
+            "players",
+            "is_best_player",
+            "playingtime",
+            "averageweight",
+            "average_rating",
+            "marketplace_price",
+        ],
+    )
+    suggested_players["stats"] = [
+        {"averageweight": w} for w in suggested_players.pop("averageweight")
+    ]
+    return SuggestedPlayersIndex(suggested_players)
+
+
+def names(games):
+    return [g["name"] for g in games]
+
+
+def test_query_filters(index):
+    assert names(index.query(players=5, max_time=60)) == ["Medium", "Unrated", "Quick"]
+    assert names(index.query(players=5, time="short")) == ["Quick"]
+    assert names(index.query(weight="heavy")) == ["Heavy"]
+    assert names(index.query(players=5, best=True, limit=2)) == ["Heavy", "Unrated"]
+    assert names(index.query(for_sale=True)) == ["Medium"]
+    assert names(index.query(players=7)) == []
+
+
+def test_query_sort(index):
+    games = index.query(players=5, sort="playingtime", descending=False)
+    assert names(games) == ["Quick", "Medium", "Unrated", "Heavy"]
+    games = index.query(players=5, sort="averageweight")
+    assert names(games) == ["Heavy", "Medium", "Quick", "Unrated"]
+
+
+def test_query_errors(index):
+    with pytest.raises(QueryError):
+        index.query(weight="extreme")
+    with pytest.raises(QueryError):
+        parse_query("players=five")
+    with pytest.raises(QueryError):
+        parse_query("colour=red")
+
+
+def test_server(index):
+    server = make_server(index, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address
+        with urlopen(f"http://{host}:{port}/games?players=5&max_time=60&best=true") as r:
+            payload = json.load(r)
+    finally:
+        server.shutdown()
+    assert payload["count"] == 2
+    assert names(payload["games"]) == ["Unrated", "Quick"]
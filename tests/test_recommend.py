@@ -0,0 +1,104 @@
+"""Offline tests for the what to play tonight recommender."""
+
+import json
+import threading
+import time
+from urllib.request import urlopen
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from my_board_games.query_api import QueryError, SuggestedPlayersIndex, make_server
+from my_board_games.recommend import Recommender
+
+COLUMNS = [
+    "id",
+    "name",
+    "players",
+    "is_best_player",
+    "playingtime",
+    "averageweight",
+    "average_rating",
+    "rating",
+    "days_since_last_played",
+]
+
+
+def make_index(rows):
+    suggested_players = pd.DataFrame(rows, columns=COLUMNS)
+    suggested_players["stats"] = [
+        {"averageweight": w} for w in suggested_players.pop("averageweight")
+    ]
+    return SuggestedPlayersIndex(suggested_players)
+
+
+@pytest.fixture
+def recommender():
+    index = make_index(
+        [
+            [1, "Played yesterday", 4, True, 30, 2.0, 8.0, "9", 1],
+            [2, "Forgotten", 4, True, 30, 2.0, 7.0, "N/A", 400],
+            [3, "Never played", 4, False, 45, 3.0, 7.0, None, None],
+            [4, "Long", 4, True, 180, 4.0, 8.5, "10", 400],
+            [4, "Long", 2, False, 180, 4.0, 8.5, "10", 400],
+        ]
+    )
+    weights = {"best": 1.0, "average_rating": 0, "rating": 0, "unplayed": 1.0, "weight_match": 0}
+    return Recommender(index, weights)
+
+
+def names(games):
+    return [g["name"] for g in games]
+
+
+def test_recommend(recommender):
+    assert names(recommender.recommend(4, k=2)) == ["Forgotten", "Long"]
+    assert names(recommender.recommend(4, max_time=60)) == [
+        "Forgotten",
+        "Played yesterday",
+        "Never played",
+    ]
+    assert names(recommender.recommend(2)) == ["Long"]
+    assert recommender.recommend(7) == []
+
+    games = recommender.recommend(4, max_time=60, weight=3.0, weights={"weight_match": 8})
+    assert names(games)[0] == "Never played"
+    assert games[0]["score"] == 9.0
+    with pytest.raises(QueryError):
+        recommender.recommend(4, weights={"colour": 1})
+
+
+def test_recommend_endpoint(recommender):
+    server = make_server(recommender.index, port=0, recommender=recommender)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address
+        with urlopen(f"http://{host}:{port}/recommend?players=4&max_time=60&k=1") as r:
+            payload = json.load(r)
+    finally:
+        server.shutdown()
+    assert names(payload["games"]) == ["Forgotten"]
+
+
+@pytest.mark.benchmark
+def test_recommend_is_fast():
+    rng = np.random.default_rng(0)
+    n = 10_000
+    rows = zip(
+        range(n),
+        map(str, range(n)),
+        rng.integers(1, 7, n),
+        rng.random(n) < 0.2,
+        rng.integers(10, 240, n),
+        rng.uniform(1, 5, n),
+        rng.uniform(5, 9, n),
+        rng.integers(1, 11, n).astype(str),
+        rng.integers(0, 1000, n),
+    )
+    recommender = Recommender(make_index(list(rows)))
+    start = time.perf_counter()
+    for _ in range(100):
+        recommender.recommend(4, max_time=90, weight=2.5, k=10)
+    assert (time.perf_counter() - start) / 100 < 0.001
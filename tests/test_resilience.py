@@ -0,0 +1,154 @@
+"""Offline tests for circuit breakers, the run deadline and stale fallback."""
+
+import json
+import threading
+import time
+
+import pytest
+import requests
+
+from my_board_games import pipeline, resilience
+from my_board_games.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    Deadline,
+    DeadlineExceededError,
+    RateLimiter,
+    guarded_get,
+    retry,
+    set_rate_limit,
+    speculative,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_resilience():
+    resilience.reset()
+    yield
+    resilience.reset()
+
+
+class FailingSession:
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, timeout, **kwargs):
+        self.calls += 1
+        raise requests.exceptions.ConnectionError("BGG is down")
+
+
+def test_breaker_opens_and_half_opens():
+    breaker = CircuitBreaker("thing", failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.reset_timeout = 0
+    breaker.before_call()
+    breaker.record_success()
+    breaker.reset_timeout = 60
+    breaker.before_call()
+
+
+def test_guarded_get_fails_fast_once_open():
+    session = FailingSession()
+    for _ in range(resilience.FAILURE_THRESHOLD):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            guarded_get("plays", "https://example.com", session=session)
+    with pytest.raises(CircuitOpenError):
+        guarded_get("plays", "https://example.com", session=session)
+    assert session.calls == resilience.FAILURE_THRESHOLD
+    # Other endpoint families are not affected
+    with pytest.raises(requests.exceptions.ConnectionError):
+        guarded_get("thing", "https://example.com", session=session)
+
+
+def test_speculative_failures_do_not_open_the_breaker():
+    session = FailingSession()
+    with speculative():
+        for _ in range(resilience.FAILURE_THRESHOLD + 1):
+            with pytest.raises(requests.exceptions.ConnectionError):
+                guarded_get("thing", "https://example.com", session=session)
+    assert session.calls == resilience.FAILURE_THRESHOLD + 1
+    assert resilience.get_breaker("thing").failures == 0
+
+
+def test_rate_limit_is_shared_by_threads():
+    limiter = RateLimiter(0.05)
+    calls = []
+
+    def call():
+        limiter.wait()
+        calls.append(time.monotonic())
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    calls.sort()
+    assert all(b - a >= 0.04 for a, b in zip(calls, calls[1:]))
+
+    # guarded_get waits its turn, unless the deadline comes first
+    set_rate_limit(10)
+    resilience.set_deadline(1)
+    session = FailingSession()
+    with pytest.raises(requests.exceptions.ConnectionError):
+        guarded_get("thing", "https://example.com", session=session)
+    with pytest.raises(DeadlineExceededError):
+        guarded_get("plays", "https://example.com", session=session)
+    assert session.calls == 1
+
+
+def test_deadline():
+    assert Deadline().timeout(15) == 15
+    assert Deadline(5).timeout(15) <= 5
+    with pytest.raises(DeadlineExceededError):
+        Deadline(0).check()
+    with pytest.raises(DeadlineExceededError):
+        Deadline(1).sleep(10)
+
+
+def test_retry_does_not_retry_unavailable():
+    calls = []
+
+    @retry(tries=5, delay=0, backoff=1, logger=None)
+    def flaky(error):
+        calls.append(error)
+        raise error
+
+    with pytest.raises(CircuitOpenError):
+        flaky(CircuitOpenError("open"))
+    assert len(calls) == 1
+    with pytest.raises(ValueError):
+        flaky(ValueError("flaky"))
+    assert len(calls) == 6
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        CircuitOpenError("Circuit for BGG thing is open"),
+        requests.exceptions.HTTPError("502 Bad Gateway"),
+    ],
+)
+def test_fallback_marks_metrics_stale(tmp_path, monkeypatch, error):
+    def run_pipeline(bgg, output_dir, **kwargs):
+        raise error
+
+    monkeypatch.setattr(pipeline, "run_pipeline", run_pipeline)
+    with pytest.raises(type(error)):
+        pipeline.run_pipeline_with_fallback(None, output_dir=tmp_path)
+
+    suggested_players = [
+        {"name": "Azul", "is_best_player": True, "last_played": 1, "days_since_last_played": 3}
+    ]
+    (tmp_path / "suggested_players.json").write_text(json.dumps(suggested_players))
+    pipeline.run_pipeline_with_fallback(None, output_dir=tmp_path)
+
+    metrics = json.loads((tmp_path / "metrics.json").read_text())
+    assert metrics["stale"] is True
+    assert metrics["stale_reason"] == str(error)
+    assert metrics["num_games"] == 1
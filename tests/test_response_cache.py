@@ -0,0 +1,123 @@
+"""Offline tests for the response cache and stale-while-revalidate runs."""
+
+import json
+import os
+
+import pytest
+
+from my_board_games import pipeline, resilience
+from my_board_games.response_cache import (
+    CacheMissError,
+    ResponseCache,
+    cached_get,
+    format_freshness,
+    get_mode,
+    response_mode,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_resilience():
+    resilience.reset()
+    yield
+    resilience.reset()
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.status_code = 200
+        self.content = content
+
+
+class FakeSession:
+    def __init__(self, content=b"<items/>"):
+        self.content = content
+        self.calls = 0
+
+    def get(self, url, timeout, **kwargs):
+        self.calls += 1
+        return FakeResponse(self.content)
+
+
+def test_store_then_serve_from_cache(tmp_path):
+    cache = ResponseCache(tmp_path)
+    session = FakeSession()
+    params = {"id": "1,2", "stats": 1}
+
+    with response_mode("store", cache) as freshness:
+        cached_get("thing", "https://bgg/thing", session=session, params=params)
+    assert freshness["thing"]["from_cache"] is False
+
+    with response_mode("cached", cache) as freshness:
+        response = cached_get("thing", "https://bgg/thing", session=session, params=params)
+        with pytest.raises(CacheMissError):
+            cached_get("thing", "https://bgg/thing", session=session, params={"id": "3"})
+    assert response.content == b"<items/>"
+    assert freshness["thing"]["from_cache"] is True
+    assert session.calls == 1
+    assert get_mode() == "direct"
+
+
+def test_direct_mode_does_not_store(tmp_path):
+    cache = ResponseCache(tmp_path)
+    cached_get("plays", "https://bgg/plays", session=FakeSession())
+    assert cache.load("https://bgg/plays") is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_format_freshness():
+    freshness = {"plays": {"fetched_at": 0, "from_cache": True}}
+    assert format_freshness(freshness) == {
+        "plays": {"fetched_at": "1970-01-01T00:00:00+00:00", "from_cache": True}
+    }
+
+
+def test_stale_while_revalidate(tmp_path, monkeypatch):
+    modes = []
+
+    def run_pipeline(bgg, output_dir, **kwargs):
+        modes.append(get_mode())
+        (tmp_path / "suggested_players.json").write_text(json.dumps(modes))
+
+    monkeypatch.setattr(pipeline, "run_pipeline", run_pipeline)
+    pipeline.run_stale_while_revalidate(None, output_dir=tmp_path).join()
+    assert modes == ["cached", "store"]
+    assert json.loads((tmp_path / "freshness.json").read_text()) == {}
+
+
+def test_stale_while_revalidate_without_cache(tmp_path, monkeypatch):
+    modes = []
+
+    def run_pipeline(bgg, output_dir, **kwargs):
+        modes.append(get_mode())
+        if get_mode() == "cached":
+            raise CacheMissError("No cached BGG collection response")
+
+    monkeypatch.setattr(pipeline, "run_pipeline", run_pipeline)
+    pipeline.run_stale_while_revalidate(None, output_dir=tmp_path).join()
+    assert modes == ["cached", "store"]
+
+
+def test_newer_responses_supersede_older_ones(tmp_path):
+    cache = ResponseCache(tmp_path)
+    plays = "https://bgg/plays?username=nraw&mindate={}&page=1"
+    cache.store(plays.format("2024-01-01"), None, b"old")
+    cache.store(plays.format("2024-02-01"), None, b"new")
+    cache.store("https://bgg/plays?username=other&mindate=2024-01-01&page=1", None, b"other")
+    cache.store(plays.format("2024-02-01").replace("page=1", "page=2"), None, b"page 2")
+
+    assert cache.load(plays.format("2024-01-01")) is None
+    assert cache.load(plays.format("2024-02-01"))[1] == b"new"
+    assert len(list(tmp_path.iterdir())) == 3
+
+
+def test_prune_removes_expired_responses(tmp_path):
+    cache = ResponseCache(tmp_path, max_age=60)
+    cache.store("https://bgg/thing", {"id": "1"}, b"old")
+    cache.store("https://bgg/thing", {"id": "2"}, b"new")
+    os.utime(cache._file("https://bgg/thing", {"id": "1"}), (0, 0))
+
+    with response_mode("store", cache):
+        pass
+    assert cache.load("https://bgg/thing", {"id": "1"}) is None
+    assert cache.load("https://bgg/thing", {"id": "2"})[1] == b"new"
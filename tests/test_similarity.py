@@ -0,0 +1,93 @@
+"""Offline tests for link parsing and the similarity index."""
+
+import time
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pandas as pd
+
+from my_board_games.bgg_api import BGGClient
+from my_board_games.similarity import SimilarityIndex
+
+THING = """
+<item type="boardgame" id="13">
+    <name type="primary" value="CATAN"/>
+    <link type="boardgamecategory" id="1026" value="Negotiation"/>
+    <link type="boardgamemechanic" id="2072" value="Dice Rolling"/>
+    <link type="boardgamemechanic" id="2008" value="Trading"/>
+    <link type="boardgamefamily" id="3" value="Series: Catan"/>
+    <link type="boardgamedesigner" id="11" value="Klaus Teuber"/>
+    <link type="boardgameexpansion" id="926" value="Catan: Seafarers"/>
+</item>
+"""
+
+
+def test_parse_links():
+    # Parsing does not need a session
+    bgg = BGGClient.__new__(BGGClient)
+    data = bgg._parse_game_data(ET.fromstring(THING)).data()
+    assert data["mechanics"] == ["Dice Rolling", "Trading"]
+    assert data["categories"] == ["Negotiation"]
+    assert data["designers"] == ["Klaus Teuber"]
+    assert data["families"] == ["Series: Catan"]
+    assert data["expansions"] == [{"id": 926, "name": "Catan: Seafarers"}]
+
+
+def make_games():
+    return pd.DataFrame(
+        {
+            "id": [13, 14, 15, 16, 17],
+            "name": ["Catan", "Catan Junior", "Trading Card", "Azul", "Unparsed"],
+            "mechanics": [
+                ["Dice Rolling", "Trading"],
+                ["Dice Rolling", "Trading"],
+                ["Trading"],
+                ["Pattern Building"],
+                [],
+            ],
+            "categories": [["Negotiation"], ["Negotiation"], [], ["Abstract"], []],
+            "designers": [["Klaus Teuber"], ["Klaus Teuber"], [], ["Michael Kiesling"], []],
+            "families": [["Series: Catan"], ["Series: Catan"], [], [], []],
+        }
+    )
+
+
+def test_similar_games():
+    index = SimilarityIndex(make_games(), k=3)
+    similar = index.similar(13)
+    assert [game_id for game_id, _, _ in similar] == [14, 15]
+    assert similar[0][2] == 1.0
+    assert index.similar(16) == []
+    assert [game_id for game_id, _, _ in index.similar(15, within=[16, 14])] == [14]
+    assert index.duplicates() == [(13, 14)]
+    assert index.to_dict()["13"][0] == [14, "Catan Junior", 1.0]
+
+    # A collection of one game has no neighbors
+    assert SimilarityIndex(make_games().head(1)).to_dict() == {"13": []}
+
+
+def test_matches_dense_cosine():
+    rng = np.random.default_rng(0)
+    n = 300
+    mechanics = [list(rng.choice(40, rng.integers(1, 6), replace=False)) for _ in range(n)]
+    games = pd.DataFrame(
+        {"id": range(n), "name": map(str, range(n)), "mechanics": mechanics}
+    )
+    index = SimilarityIndex(games, k=5, chunk_size=64)
+
+    dense = index.features.toarray()
+    similarity = dense @ dense.T
+    np.fill_diagonal(similarity, -1)
+    expected = -np.sort(-similarity, axis=1)[:, :5]
+    assert np.allclose(index.scores, expected, atol=1e-5)
+
+
+def test_scales_to_many_games():
+    rng = np.random.default_rng(1)
+    n = 20_000
+    mechanics = [list(rng.choice(200, 5, replace=False)) for _ in range(n)]
+    games = pd.DataFrame({"id": range(n), "name": map(str, range(n)), "mechanics": mechanics})
+    start = time.perf_counter()
+    index = SimilarityIndex(games, k=10, chunk_size=1024)
+    assert time.perf_counter() - start < 60
+    assert index.neighbors.shape == (n, 10)
@@ -0,0 +1,114 @@
+"""Offline tests for the SQLite store."""
+
+import json
+
+import pandas as pd
+
+from my_board_games.bgg_api import CollectionItem, GameData
+from my_board_games.get_metrics import get_metrics
+from my_board_games.get_suggested_players import get_player_rows
+from my_board_games.store import Store
+
+
+def make_game(game_id, results):
+    data_dict = {
+        "id": game_id,
+        "name": f"Game {game_id}",
+        "thumbnail": None,
+        "minplayers": 1,
+        "maxplayers": 5,
+        "stats": {"average": 7.0, "averageweight": 2.0},
+        "expansions": [],
+        "suggested_players": {"results": results, "totalvotes": 10},
+        "playingtime": 30,
+    }
+    return GameData.from_data(data_dict)
+
+
+def make_item(game_id):
+    item_data = {
+        "id": game_id,
+        "name": f"Game {game_id}",
+        "thumbnail": None,
+        "minplayers": 1,
+        "maxplayers": 5,
+        "rating": None,
+        "wishlistpriority": None,
+        "numplays": 0,
+        "invlocation": None,
+    }
+    return CollectionItem(id=game_id, _data=item_data)
+
+
+def ratings(best, recommended, not_recommended):
+    return {
+        "best_rating": best,
+        "recommended_rating": recommended,
+        "not_recommended_rating": not_recommended,
+    }
+
+
+GAMES = [
+    make_game(
+        1,
+        {
+            "1": ratings(0, 1, 5),
+            "2": ratings(4, 3, 0),
+            "3": ratings(4, 5, 1),
+            "3+": ratings(0, 0, 9),
+        },
+    ),
+    make_game(2, {"1": ratings(0, 2, 1), "2": ratings(1, 0, 0), "4+": ratings(7, 0, 0)}),
+]
+
+
+def test_player_rows_match_pandas():
+    store = Store(":memory:")
+    store.upsert_games(GAMES)
+    store.upsert_games(GAMES[:1])
+    games = pd.DataFrame([game.data() for game in GAMES])
+
+    expected = get_player_rows(games.iloc[::-1])
+    assert store.get_player_rows([2, 1]) == expected
+    assert store.execute("PRAGMA journal_mode")[0][0] == "memory"
+
+
+def test_marketplace_metrics(tmp_path):
+    store = Store(tmp_path / "store.sqlite")
+    assert store.execute("PRAGMA journal_mode")[0][0] == "wal"
+    store.replace_collection("nraw", [make_item(1), make_item(2)])
+    listings = [
+        {"id": 1, "price": "20.0", "currency": "EUR", "condition": "new", "product_id": 10, "link": ""},
+        {"id": 1, "price": "15.0", "currency": "EUR", "condition": "used", "product_id": 11, "link": ""},
+        {"id": 3, "price": "99.0", "currency": "EUR", "condition": "new", "product_id": 12, "link": ""},
+    ]
+    store.replace_listings("nraw", listings[:1])
+    store.replace_listings("nraw", listings[1:])
+    rows = store.execute("SELECT product_id, price FROM listings ORDER BY product_id")
+    assert [tuple(row) for row in rows] == [(11, 15.0), (12, 99.0)]
+
+    # Metrics come from the built games, which carry the same cheapest price
+    suggested_players = [
+        {"name": "Game 1", "is_best_player": True, "last_played": None, "days_since_last_played": None, "marketplace_price": 15.0},
+        {"name": "Game 2", "is_best_player": True, "last_played": 1, "days_since_last_played": 4, "marketplace_price": None},
+    ]
+    (tmp_path / "suggested_players.json").write_text(json.dumps(suggested_players))
+    metrics = get_metrics(tmp_path)
+    assert metrics["num_games_for_sale"] == 1
+    assert metrics["total_marketplace_value"] == 15.0
+    assert metrics["most_expensive_game"] == "Game 1"
+
+
+def test_upsert_plays():
+    store = Store(":memory:")
+    plays = [
+        {"play_id": "5", "date": "2024-01-01", "quantity": 1, "game_id": 1, "game_name": "Game 1"},
+        {"play_id": "6", "date": "2024-01-02", "quantity": 2, "game_id": 1, "game_name": "Game 1"},
+    ]
+    store.upsert_plays("nraw", plays)
+    store.upsert_plays("nraw", plays[1:])
+    rows = store.execute(
+        "SELECT game_id, SUM(quantity), MAX(date) FROM plays WHERE user_name = ? GROUP BY game_id",
+        ("nraw",),
+    )
+    assert [tuple(row) for row in rows] == [(1, 3, "2024-01-02")]
@@ -0,0 +1,87 @@
+"""Offline tests for the local title index."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from my_board_games.bgg_api import CollectionItem, GameData
+from my_board_games.name_resolver import NameResolver
+from my_board_games.title_index import TitleIndex, normalize
+
+
+def make_game(game_id, name, alternate_names):
+    return GameData(
+        id=game_id,
+        name=name,
+        thumbnail=None,
+        min_players=1,
+        max_players=4,
+        rating_average=7.0,
+        expansions=[],
+        data_dict={},
+        alternate_names=alternate_names,
+    )
+
+
+def test_normalize():
+    assert normalize("  Pokémon: Trading-Card  Game ") == "pokemon trading card game"
+    assert normalize("Tigris & Euphrates") == "tigris and euphrates"
+
+
+def test_query(tmp_path):
+    title_index = TitleIndex(tmp_path / "titles.json")
+    title_index.add_games(
+        [
+            make_game(174430, "Gloomhaven", ["Gloomhaven: Edycja Polska"]),
+            make_game(42, "Tigris & Euphrates", ["Euphrat & Tigris"]),
+        ]
+    )
+    title_index.add_collection([CollectionItem(id=230802, _data={"name": "Azul"})])
+
+    assert title_index.match("azul") == 230802
+    assert title_index.match("Catan") is None
+    assert title_index.match("Euphrat and Tigris") == 42
+    assert title_index.match("Gloomhaven Edycja Polska") == 174430
+    assert title_index.query("Tigris Euphrates", min_score=0.5)[0][:2] == (
+        42,
+        "Tigris & Euphrates",
+    )
+
+    title_index.save()
+    assert len(TitleIndex(tmp_path / "titles.json")) == 5
+
+
+class FakeBGG:
+    def __init__(self):
+        self.searches = []
+
+    def search(self, query, exact=False):
+        self.searches.append(query)
+        return [{"id": 167791, "name": "Terraforming Mars", "year": "2016"}]
+
+
+def test_resolver_matches_locally_first():
+    title_index = TitleIndex(None)
+    title_index.add("Azul", 230802)
+    bgg = FakeBGG()
+    resolver = NameResolver(bgg, None, title_index=title_index)
+
+    assert resolver.resolve_many(["Azul", "Terraforming Mars"]) == {
+        "Azul": 230802,
+        "Terraforming Mars": 167791,
+    }
+    assert bgg.searches == ["Terraforming Mars"]
+    assert title_index.match("Terraforming  Mars!") == 167791
+
+
+def test_concurrent_saves_keep_every_title(tmp_path):
+    path = tmp_path / "titles.json"
+    title_index = TitleIndex(path)
+
+    def add_and_save(user):
+        for i in range(50):
+            title_index.add(f"Game {user} {i}", user * 100 + i)
+            title_index.save()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(add_and_save, range(4)))
+    assert len(TitleIndex(path)) == 200
+    assert [p.name for p in tmp_path.iterdir()] == ["titles.json"]
@@ -0,0 +1,129 @@
+"""Offline tests for watch mode."""
+
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from my_board_games import logged_plays, watch
+from my_board_games.bgg_api import GameData
+from my_board_games.game_cache import GameMetadataCache
+from my_board_games.title_index import TitleIndex
+
+
+def make_game(game_id):
+    data_dict = {
+        "id": game_id,
+        "name": f"Game {game_id}",
+        "thumbnail": None,
+        "minplayers": 1,
+        "maxplayers": 4,
+        "stats": {"average": 7.0 + game_id / 10},
+        "expansions": [],
+        "suggested_players": {
+            "results": {
+                "2": {"best_rating": 5, "recommended_rating": 1, "not_recommended_rating": 0},
+                "3": {"best_rating": 1, "recommended_rating": 4, "not_recommended_rating": 0},
+            },
+            "totalvotes": 11,
+        },
+        "playingtime": 30,
+    }
+    return GameData.from_data(data_dict)
+
+
+def make_plays(rows):
+    return pd.DataFrame(
+        rows, columns=["play_id", "date", "quantity", "game_id", "game_name"]
+    )
+
+
+def test_poll_rebuilds_only_on_changes(tmp_path, monkeypatch):
+    my_games = pd.DataFrame({"id": [1, 2], "name": ["Game 1", "Game 2"], "numplays": [0, 3]})
+    new_plays = [[make_plays([["1", "2024-01-01", 1, 2, "Game 2"]])]]
+    monkeypatch.setattr(watch, "get_my_games", lambda bgg, user_name: my_games.copy())
+    monkeypatch.setattr(
+        logged_plays,
+        "iter_logged_plays",
+        lambda user_name, mindate: iter(new_plays.pop() if new_plays else []),
+    )
+    monkeypatch.setattr(watch, "get_personal_ratings", lambda user_name: [{"id": 1, "rating": "8"}])
+    monkeypatch.setattr(
+        watch,
+        "get_marketplace_listings",
+        lambda user_name, bgg: pd.DataFrame(
+            columns=["id", "name", "price", "currency", "condition", "product_id", "link"]
+        ),
+    )
+    games_cache = GameMetadataCache(path=None)
+    games_cache.add([make_game(1), make_game(2)])
+    watcher = watch.Watcher(
+        bgg=SimpleNamespace(store=None, parse_pool=None),
+        output_dir=tmp_path,
+        slow_every=1,
+        games_cache=games_cache,
+        title_index=TitleIndex(path=None),
+    )
+
+    assert watcher.poll()
+    suggested_players = pd.read_json(tmp_path / "suggested_players.json")
+    assert sorted(suggested_players.id.unique()) == [1, 2]
+    # The same outputs as a pipeline run
+    for name in ["site_payload.json", "similar_games.json", "history.npz", "metrics.json"]:
+        assert (tmp_path / name).exists()
+    assert len(watcher.title_index) == 2
+    assert watcher.plays_index["games"]["2"]["play_count"] == 1
+
+    assert not watcher.poll()
+
+
+def test_failed_polls_and_builds_are_retried(tmp_path, monkeypatch):
+    my_games = pd.DataFrame({"id": [1], "name": ["Game 1"], "numplays": [0]})
+    ratings = [RuntimeError("ratings unavailable"), [{"id": 1, "rating": "8"}]]
+
+    def get_personal_ratings(user_name):
+        result = ratings.pop(0) if len(ratings) > 1 else ratings[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    monkeypatch.setattr(watch, "get_my_games", lambda bgg, user_name: my_games.copy())
+    plays = make_plays([["1", "2024-01-01", 1, 1, "Game 1"]])
+    monkeypatch.setattr(
+        logged_plays, "iter_logged_plays", lambda user_name, mindate: iter([plays])
+    )
+    monkeypatch.setattr(watch, "get_personal_ratings", get_personal_ratings)
+    monkeypatch.setattr(
+        watch,
+        "get_marketplace_listings",
+        lambda user_name, bgg: pd.DataFrame(
+            columns=["id", "name", "price", "currency", "condition", "product_id", "link"]
+        ),
+    )
+    games_cache = GameMetadataCache(path=None)
+    games_cache.add([make_game(1)])
+    watcher = watch.Watcher(
+        bgg=SimpleNamespace(store=None, parse_pool=None),
+        output_dir=tmp_path,
+        slow_every=100,
+        games_cache=games_cache,
+        title_index=TitleIndex(path=None),
+    )
+
+    # The first slow poll fails, ratings are polled again on the next poll
+    with pytest.raises(RuntimeError):
+        watcher.poll()
+    build = watcher._build
+
+    def failing_build():
+        raise OSError("disk full")
+
+    monkeypatch.setattr(watcher, "_build", failing_build)
+    with pytest.raises(OSError):
+        watcher.poll()
+    assert watcher.ratings is not None and watcher.dirty
+
+    # The collection change seen before the failed build still rebuilds
+    monkeypatch.setattr(watcher, "_build", build)
+    assert watcher.poll()
+    assert not watcher.dirty and not watcher.poll()